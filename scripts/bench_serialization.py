@@ -0,0 +1,81 @@
+"""Per-request CPU of serializing a 60-item /planets envelope.
+
+Compares the response_model path FastAPI takes for a returned dict (validate into
+ItemsEnvelope, dump to JSON-compatible data, render with the stdlib json module) with
+FastJSONResponse, which writes the trusted payload with orjson directly.
+
+    PYTHONPATH=src python scripts/bench_serialization.py
+"""
+
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from holonet.responses import FastJSONResponse
+from holonet.schemas.common import ItemsEnvelope
+from holonet.utils.frozen import freeze
+from holonet.utils.pagination import build_pagination
+
+ITEMS = 60
+REQUESTS = 2_000
+
+
+def planet(n: int) -> dict:
+    return {
+        "name": f"Planet {n}",
+        "rotation_period": "23",
+        "orbital_period": "304",
+        "diameter": "10465",
+        "climate": "arid",
+        "gravity": "1 standard",
+        "terrain": "desert",
+        "surface_water": "1",
+        "population": "200000",
+        "residents": [f"https://swapi.dev/api/people/{n + i}/" for i in range(5)],
+        "films": [f"https://swapi.dev/api/films/{i}/" for i in range(1, 4)],
+        "created": "2014-12-09T13:50:49.641000Z",
+        "edited": "2014-12-20T20:58:18.411000Z",
+        "url": f"https://swapi.dev/api/planets/{n}/",
+        "id": n,
+    }
+
+
+def payload() -> dict:
+    return {
+        "items": [freeze(planet(n)) for n in range(1, ITEMS + 1)],
+        "pagination": build_pagination(1, ITEMS, ITEMS),
+        "source": {"name": "swapi", "url": "https://swapi.dev/api"},
+        "cache": {"hit": True, "ttl": 180, "stale": False},
+        "correlation_id": "bench",
+    }
+
+
+def response_model_path(content: dict) -> bytes:
+    validated = ItemsEnvelope.model_validate(content)
+    return JSONResponse(jsonable_encoder(validated.model_dump(mode="json"))).body
+
+
+def fast_path(content: dict) -> bytes:
+    return FastJSONResponse(content).body
+
+
+def bench(render) -> float:
+    content = payload()
+    started = time.process_time()
+    for _ in range(REQUESTS):
+        render(content)
+    return (time.process_time() - started) / REQUESTS * 1e6
+
+
+def main() -> None:
+    before = bench(response_model_path)
+    after = bench(fast_path)
+    print(f"{'path':>16} {'cpu us/request':>15}")
+    print(f"{'response_model':>16} {before:>15.0f}")
+    print(f"{'orjson direct':>16} {after:>15.0f}")
+    print(f"{'speedup':>16} {before / after:>14.1f}x")
+
+
+if __name__ == "__main__":
+    main()
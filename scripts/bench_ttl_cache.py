@@ -0,0 +1,46 @@
+"""Microbenchmark for the in-memory TTLCache.
+
+Fills the cache to each size, then times a mixed workload of hits, misses and inserts that
+force eviction. Per-operation latency should stay flat as the cache grows.
+
+    PYTHONPATH=src python scripts/bench_ttl_cache.py
+"""
+
+import random
+import time
+
+from holonet.utils.cache import TTLCache
+
+SIZES = [2_000, 20_000, 200_000, 1_000_000]
+OPERATIONS = 200_000
+
+
+def bench(size: int) -> tuple[float, float]:
+    cache = TTLCache(ttl_seconds=3600, max_entries=size)
+    for i in range(size):
+        cache.set(f"key-{i}", i)
+
+    rng = random.Random(size)  # nosec B311 - benchmark data
+    keys = [f"key-{rng.randrange(size * 2)}" for _ in range(OPERATIONS)]
+
+    started = time.perf_counter()
+    for key in keys:
+        cache.get(key)
+    get_ns = (time.perf_counter() - started) / OPERATIONS * 1e9
+
+    started = time.perf_counter()
+    for i, key in enumerate(keys):
+        cache.set(f"{key}-{i}", i)
+    set_ns = (time.perf_counter() - started) / OPERATIONS * 1e9
+    return get_ns, set_ns
+
+
+def main() -> None:
+    print(f"{'entries':>10} {'get ns/op':>10} {'set ns/op':>10}")
+    for size in SIZES:
+        get_ns, set_ns = bench(size)
+        print(f"{size:>10} {get_ns:>10.0f} {set_ns:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
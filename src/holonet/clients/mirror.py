@@ -0,0 +1,136 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlencode
+
+import orjson
+
+from holonet.config import settings
+from holonet.utils.etag import combine, digest
+from holonet.utils.frozen import freeze
+from holonet.utils.refs import url_id, url_ref
+from holonet.utils.sorting import SortIndex, SortSpec
+
+RESOURCES = ("films", "people", "planets", "species", "starships", "vehicles")
+# The fields SWAPI's own `?search=` matches, case-insensitively.
+SEARCH_FIELDS = {
+    "films": ("title",),
+    "people": ("name",),
+    "planets": ("name",),
+    "species": ("name",),
+    "starships": ("name", "model"),
+    "vehicles": ("name", "model"),
+}
+UPSTREAM_PAGE_SIZE = 10
+
+
+@dataclass(frozen=True, slots=True)
+class _ResourceIndex:
+    items: tuple[dict[str, Any], ...]
+    by_id: dict[int, dict[str, Any]]
+    sort_index: SortIndex
+    loaded_at: float
+    etag: str
+
+
+# In-memory copy of whole SWAPI resources, answering lookups and search pages in the same
+# shapes as upstream. A resource's index is built off to the side and swapped in with one
+# assignment, so readers never see a partial load and take no lock. Anything not loaded
+# returns None and callers go upstream.
+class SwapiMirror:
+    def __init__(self) -> None:
+        self._indexes: dict[str, _ResourceIndex] = {}
+
+    def load(self, resource: str, items: list[dict[str, Any]]) -> None:
+        frozen = tuple(freeze(item) for item in items)
+        by_id = {}
+        for item in frozen:
+            resource_id = url_id(item.get("url"))
+            if resource_id is not None:
+                by_id[resource_id] = item
+        etag = digest(orjson.dumps(items))
+        index = _ResourceIndex(frozen, by_id, SortIndex(frozen), time.time(), etag)
+        self._indexes = {**self._indexes, resource: index}
+
+    # Validator for everything the mirror can answer, from the digests taken at load time.
+    @property
+    def etag(self) -> str:
+        indexes = self._indexes
+        return combine(*(f"{resource}:{indexes[resource].etag}" for resource in sorted(indexes)))
+
+    # When the oldest loaded resource is due for its next reload; None if nothing is loaded.
+    @property
+    def fresh_until(self) -> float | None:
+        indexes = self._indexes
+        if not indexes:
+            return None
+        oldest = min(index.loaded_at for index in indexes.values())
+        return oldest + settings.mirror_refresh_seconds
+
+    def get(self, resource: str, resource_id: int) -> dict[str, Any] | None:
+        index = self._indexes.get(resource)
+        if index is None:
+            return None
+        return index.by_id.get(resource_id)
+
+    def get_by_url(self, url: str) -> dict[str, Any] | None:
+        ref = url_ref(url)
+        return self.get(*ref) if ref is not None else None
+
+    def search(self, resource: str, query: str | None, page: int) -> dict[str, Any] | None:
+        index = self._indexes.get(resource)
+        if index is None or page < 1:
+            return None
+        items = _matching(resource, index.items, query)
+        start = (page - 1) * UPSTREAM_PAGE_SIZE
+        end = start + UPSTREAM_PAGE_SIZE
+        if page > 1 and start >= len(items):
+            return None
+        return {
+            "count": len(items),
+            "next": _page_url(resource, query, page + 1) if end < len(items) else None,
+            "previous": _page_url(resource, query, page - 1) if page > 1 else None,
+            "results": list(items[start:end]),
+        }
+
+    # Every item matching `query`, in `spec` order, straight from the resource's sort index.
+    def ordered(
+        self, resource: str, query: str | None, spec: SortSpec
+    ) -> list[dict[str, Any]] | None:
+        index = self._indexes.get(resource)
+        if index is None:
+            return None
+        if not spec:
+            return list(_matching(resource, index.items, query))
+        order = index.sort_index.order(spec)
+        if not query:
+            return [index.items[i] for i in order]
+        matches = {id(item) for item in _matching(resource, index.items, query)}
+        return [index.items[i] for i in order if id(index.items[i]) in matches]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            resource: {"items": len(index.items), "loaded_at": index.loaded_at}
+            for resource, index in self._indexes.items()
+        }
+
+
+def _matching(
+    resource: str, items: tuple[dict[str, Any], ...], query: str | None
+) -> tuple[dict[str, Any], ...] | list[dict[str, Any]]:
+    if not query:
+        return items
+    needle = query.casefold()
+    fields = SEARCH_FIELDS.get(resource, ("name",))
+    return [
+        item
+        for item in items
+        if any(needle in str(item.get(field) or "").casefold() for field in fields)
+    ]
+
+
+def _page_url(resource: str, query: str | None, page: int) -> str:
+    params: dict[str, Any] = {"page": page}
+    if query:
+        params["search"] = query
+    return f"{settings.swapi_base_url.rstrip('/')}/{resource}/?{urlencode(params)}"
@@ -1,88 +1,400 @@
+import asyncio
 import logging
+import math
 import random
+import threading
 import time
 from typing import Any
 
 import httpx
 
+from holonet.clients.mirror import SwapiMirror
+from holonet.clients.transport import build_async_http_client
 from holonet.config import settings
 from holonet.errors import AppError
 from holonet.logging import log_json
-from holonet.utils.cache import CacheBackend
+from holonet.utils.cache import CacheBackend, CacheEntry
+from holonet.utils.etag import combine, digest, payload_etag
+from holonet.utils.frozen import freeze
+from holonet.utils.pagination import PageSizeHint
+from holonet.utils.refs import url_ref
+from holonet.utils.singleflight import AsyncSingleFlight
 
 
-class SwapiClient:
+class AsyncSwapiClient:
     def __init__(
-        self, cache: CacheBackend | None = None, correlation_id: str | None = None
+        self,
+        cache: CacheBackend | None = None,
+        correlation_id: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        flights: AsyncSingleFlight | None = None,
+        mirror: SwapiMirror | None = None,
+        page_sizes: PageSizeHint | None = None,
     ) -> None:
+        self._client = http_client if http_client is not None else build_async_http_client()
+        self._flights = (
+            flights
+            if flights is not None
+            else AsyncSingleFlight(settings.singleflight_timeout_seconds)
+        )
         self._cache = cache
         self._correlation_id = correlation_id
-        self._client = httpx.Client(timeout=settings.http_timeout_seconds)
+        self._mirror = mirror if mirror is not None else SwapiMirror()
+        self._page_sizes = page_sizes if page_sizes is not None else PageSizeHint()
+        # Cached payloads are shared and read-only, so cache metadata for the response is
+        # tracked here, per request, instead of being written into them.
+        self._meta_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale = False
+        self._validators: set[str] = set()
+        self._surrogate_keys: set[str] = set()
+        self._fresh_until = math.inf
+        self._expires_at = math.inf
+
+    @property
+    def mirror(self) -> SwapiMirror:
+        return self._mirror
+
+    @property
+    def page_sizes(self) -> PageSizeHint:
+        return self._page_sizes
+
+    def cache_meta(self) -> dict[str, Any]:
+        with self._meta_lock:
+            return {
+                "hit": self._hits > 0 and self._misses == 0,
+                "ttl": settings.cache_ttl_seconds,
+                "stale": self._stale,
+            }
+
+    # Validator of every payload this client served, i.e. of the data behind the current
+    # response, combined from digests stored with the cache entries and the mirror.
+    def validator(self) -> str:
+        with self._meta_lock:
+            validators = sorted(self._validators)
+        return combine(self._mirror.etag, *validators)
+
+    # max-age and stale-while-revalidate for the current response: how long until the first
+    # payload behind it goes stale in the cache (or the mirror is due for a reload), and how long
+    # after that the stalest one may still be served while it is refreshed.
+    def freshness(self) -> tuple[int, int]:
+        now = time.time()
+        with self._meta_lock:
+            fresh_until, expires_at = self._fresh_until, self._expires_at
+        if fresh_until == math.inf:
+            fresh_until = now + settings.cache_ttl_seconds
+            expires_at = fresh_until + settings.cache_stale_ttl_seconds
+        mirror_until = self._mirror.fresh_until
+        if mirror_until is not None:
+            fresh_until = min(fresh_until, mirror_until)
+            expires_at = min(expires_at, mirror_until + settings.cache_stale_ttl_seconds)
+        max_age = max(0, int(fresh_until - now))
+        return max_age, max(0, int(expires_at - max(fresh_until, now)))
+
+    # resource:id of every entity served, plus its resource name, for edge cache purges.
+    def surrogate_keys(self) -> list[str]:
+        with self._meta_lock:
+            return sorted(self._surrogate_keys)
+
+    def _served(
+        self, payload: dict[str, Any], etag: str, fresh_until: float, expires_at: float
+    ) -> None:
+        keys = _entity_keys(payload)
+        with self._meta_lock:
+            self._validators.add(etag)
+            self._surrogate_keys.update(keys)
+            self._fresh_until = min(self._fresh_until, fresh_until)
+            self._expires_at = min(self._expires_at, expires_at)
+
+    def _tag(self, *keys: str) -> None:
+        with self._meta_lock:
+            self._surrogate_keys.update(keys)
+
+    # A payload that just came from upstream (or a concurrent flight) is as fresh as the cache
+    # entry written for it.
+    def _downloaded(self, payload: dict[str, Any], etag: str) -> None:
+        fresh_until = time.time() + settings.cache_ttl_seconds
+        self._served(payload, etag, fresh_until, fresh_until + settings.cache_stale_ttl_seconds)
+
+    # Upstream downloads made through this client, i.e. during the current request.
+    @property
+    def upstream_calls(self) -> int:
+        with self._meta_lock:
+            return self._misses
+
+    def _record(self, hit: bool, stale: bool = False) -> None:
+        with self._meta_lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+            self._stale = self._stale or stale
 
-    def get_resource(self, resource: str, resource_id: int) -> dict[str, Any]:
-        url = f"{settings.swapi_base_url.rstrip('/')}/{resource}/{resource_id}/"
-        return self._request(url)
+    def _mirrored(self, found: dict[str, Any] | None) -> dict[str, Any] | None:
+        if found is not None:
+            self._record(True)
+            self._tag(*_entity_keys(found))
+        return found
 
-    def get_by_url(self, url: str) -> dict[str, Any]:
-        return self._request(url)
+    # Mirror and fresh cache hits for many resources at once, read from the cache in one bulk
+    # lookup. Whatever is missing or stale is left out, for get_resource to fetch or refresh.
+    async def cached_resources(
+        self, refs: list[tuple[str, int]]
+    ) -> dict[tuple[str, int], dict[str, Any]]:
+        found: dict[tuple[str, int], dict[str, Any]] = {}
+        pending: dict[str, tuple[str, int]] = {}
+        for resource, resource_id in refs:
+            mirrored = self._mirror.get(resource, resource_id)
+            if mirrored is not None:
+                found[(resource, resource_id)] = mirrored
+                self._tag(resource, f"{resource}:{resource_id}")
+            else:
+                pending[self._resource_url(resource, resource_id)] = (resource, resource_id)
+        if self._cache is not None and pending:
+            now = time.time()
+            for url, entry in (await self._cache.get_entries_async(list(pending))).items():
+                if not entry.is_stale(now):
+                    found[pending[url]] = entry.value
+                    self._served(
+                        entry.value, _entry_etag(entry), entry.fresh_until, entry.expires_at
+                    )
+        for _ in found:
+            self._record(True)
+        return found
 
-    def search(self, resource: str, query: str | None, page: int) -> dict[str, Any]:
+    def _resource_url(self, resource: str, resource_id: int) -> str:
+        return f"{settings.swapi_base_url.rstrip('/')}/{resource}/{resource_id}/"
+
+    def _search_request(
+        self, resource: str, query: str | None, page: int
+    ) -> tuple[str, dict[str, Any]]:
         base = f"{settings.swapi_base_url.rstrip('/')}/{resource}/"
         params: dict[str, Any] = {"page": page}
         if query:
             params["search"] = query
-        return self._request(base, params=params)
-
-    def _request(self, url: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
-        cache_key = None
-        if self._cache is not None:
-            cache_key = f"{url}?{params}" if params else url
-            cached = self._cache.get(cache_key)
-            if cached is not None:
-                cached["_cache"] = {"hit": True, "ttl": settings.cache_ttl_seconds}
-                log_json(
-                    "swapi_cache_hit",
-                    url=url,
-                    correlation_id=self._correlation_id or "unknown",
+        return base, params
+
+    def _request_key(self, url: str, params: dict[str, Any] | None) -> str:
+        return f"{url}?{params}" if params else url
+
+    def _cache_key(self, url: str, params: dict[str, Any] | None) -> str | None:
+        if self._cache is None:
+            return None
+        return self._request_key(url, params)
+
+    async def _lookup(self, cache_key: str | None) -> CacheEntry | None:
+        if cache_key is None or self._cache is None:
+            return None
+        return await self._cache.get_entry_async(cache_key)
+
+    def _serve(self, url: str, entry: CacheEntry, stale: bool) -> dict[str, Any]:
+        self._record(True, stale)
+        log_json(
+            "swapi_cache_hit",
+            url=url,
+            stale=stale,
+            correlation_id=self._correlation_id or "unknown",
+        )
+        return entry.value
+
+    def _log_refresh_failed(self, url: str, exc: AppError) -> None:
+        log_json(
+            "swapi_refresh_failed",
+            url=url,
+            status=exc.status_code,
+            correlation_id=self._correlation_id or "unknown",
+        )
+
+    # Returns the payload with its validator, digested once from the raw body and cached with it,
+    # alongside the origin's own validators. A 304 to a conditional refresh keeps the cached
+    # payload as is: no body to parse, only its TTLs restarted. Background refreshes pass
+    # record=False: they are not part of the request that happened to spawn them.
+    async def _handle_response(
+        self,
+        url: str,
+        response: httpx.Response,
+        cache_key: str | None,
+        started: float,
+        entry: CacheEntry | None = None,
+        record: bool = True,
+    ) -> tuple[dict[str, Any], str]:
+        if response.status_code == 304 and entry is not None:
+            return await self._not_modified(url, entry, cache_key, started, record)
+        if response.status_code == 404:
+            raise AppError("Resource not found", status_code=404)
+        if response.status_code >= 400:
+            raise AppError("SWAPI error", status_code=502, details={"status": response.status_code})
+        payload = freeze(response.json())
+        etag = digest(response.content)
+        if record:
+            self._record(False)
+        if self._cache is not None and cache_key is not None:
+            await self._cache.set_async(cache_key, payload, etag, _upstream_validators(response))
+        elapsed_ms = int((time.time() - started) * 1000)
+        log_json(
+            "swapi_request",
+            url=url,
+            status=response.status_code,
+            elapsed_ms=elapsed_ms,
+            background=not record,
+            correlation_id=self._correlation_id or "unknown",
+        )
+        return payload, etag
+
+    async def _not_modified(
+        self,
+        url: str,
+        entry: CacheEntry,
+        cache_key: str | None,
+        started: float,
+        record: bool = True,
+    ) -> tuple[dict[str, Any], str]:
+        if record:
+            self._record(False)
+        if self._cache is not None and cache_key is not None:
+            await self._cache.touch_async(cache_key)
+        log_json(
+            "swapi_not_modified",
+            url=url,
+            elapsed_ms=int((time.time() - started) * 1000),
+            background=not record,
+            correlation_id=self._correlation_id or "unknown",
+        )
+        return entry.value, _entry_etag(entry)
+
+    def _backoff(self, attempt: int) -> float:
+        base = settings.http_backoff_factor * (2**attempt)
+        jitter = random.uniform(0, 0.1)  # nosec B311 - non-cryptographic jitter
+        return base + jitter
+
+    def _unavailable(self, last_exc: Exception | None) -> AppError:
+        return AppError(
+            "SWAPI unavailable",
+            status_code=502,
+            details={"error": str(last_exc) if last_exc else "unknown"},
+        )
+
+    async def get_resource(self, resource: str, resource_id: int) -> dict[str, Any]:
+        mirrored = self._mirrored(self._mirror.get(resource, resource_id))
+        if mirrored is not None:
+            return mirrored
+        return await self._request(self._resource_url(resource, resource_id))
+
+    async def get_by_url(self, url: str) -> dict[str, Any]:
+        mirrored = self._mirrored(self._mirror.get_by_url(url))
+        if mirrored is not None:
+            return mirrored
+        return await self._request(url)
+
+    async def search(self, resource: str, query: str | None, page: int) -> dict[str, Any]:
+        self._tag(resource)
+        mirrored = self._mirrored(self._mirror.search(resource, query, page))
+        if mirrored is not None:
+            return mirrored
+        base, params = self._search_request(resource, query, page)
+        return await self._request(base, params=params)
+
+    async def _request(self, url: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        cache_key = self._cache_key(url, params)
+        request_key = self._request_key(url, params)
+        entry = await self._lookup(cache_key)
+        if entry is not None:
+            stale = entry.is_stale(time.time())
+            if stale:
+                self._flights.spawn(
+                    request_key, lambda: self._refresh(url, params, cache_key, entry)
                 )
-                return cached
+            self._served(entry.value, _entry_etag(entry), entry.fresh_until, entry.expires_at)
+            return self._serve(url, entry, stale)
+        # Validators travel with the flight's result, so followers record them too.
+        payload, etag = await self._flights.do(
+            request_key, lambda: self._fetch(url, params, cache_key)
+        )
+        self._downloaded(payload, etag)
+        return payload
+
+    async def _fetch(
+        self, url: str, params: dict[str, Any] | None, cache_key: str | None
+    ) -> tuple[dict[str, Any], str]:
+        # A leader that started just after the previous flight for this key landed can find
+        # the result already cached.
+        entry = await self._lookup(cache_key)
+        if entry is not None and not entry.is_stale(time.time()):
+            return self._serve(url, entry, False), _entry_etag(entry)
+        return await self._download(url, params, cache_key, entry)
+
+    async def _refresh(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        cache_key: str | None,
+        entry: CacheEntry | None = None,
+    ) -> None:
+        try:
+            await self._download(url, params, cache_key, entry, record=False)
+        except AppError as exc:
+            self._log_refresh_failed(url, exc)
 
+    # With a cached (stale) entry at hand the request is conditional on its upstream validators.
+    async def _download(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        cache_key: str | None,
+        entry: CacheEntry | None = None,
+        record: bool = True,
+    ) -> tuple[dict[str, Any], str]:
+        conditional = _conditional_headers(entry)
         last_exc: Exception | None = None
         for attempt in range(settings.http_retries + 1):
             started = time.time()
             try:
-                response = self._client.get(url, params=params)
+                response = await self._client.get(url, params=params, **conditional)
             except httpx.RequestError as exc:
                 logging.getLogger().exception("swapi_request_failed")
                 last_exc = exc
             else:
-                if response.status_code == 404:
-                    raise AppError("Resource not found", status_code=404)
-                if response.status_code >= 400:
-                    raise AppError(
-                        "SWAPI error", status_code=502, details={"status": response.status_code}
-                    )
-                payload = response.json()
-                payload["_cache"] = {"hit": False, "ttl": settings.cache_ttl_seconds}
-                if self._cache is not None and cache_key is not None:
-                    self._cache.set(cache_key, payload)
-                elapsed_ms = int((time.time() - started) * 1000)
-                log_json(
-                    "swapi_request",
-                    url=url,
-                    status=response.status_code,
-                    elapsed_ms=elapsed_ms,
-                    correlation_id=self._correlation_id or "unknown",
-                )
-                return payload
+                return await self._handle_response(url, response, cache_key, started, entry, record)
 
             if attempt < settings.http_retries:
-                base = settings.http_backoff_factor * (2**attempt)
-                jitter = random.uniform(0, 0.1)  # nosec B311 - non-cryptographic jitter
-                time.sleep(base + jitter)
+                await asyncio.sleep(self._backoff(attempt))
 
-        raise AppError(
-            "SWAPI unavailable",
-            status_code=502,
-            details={"error": str(last_exc) if last_exc else "unknown"},
-        )
+        raise self._unavailable(last_exc)
+
+
+def _upstream_validators(response: httpx.Response) -> dict[str, str] | None:
+    upstream = {
+        name: response.headers[header]
+        for name, header in (("etag", "etag"), ("last_modified", "last-modified"))
+        if header in response.headers
+    }
+    return upstream or None
+
+
+# get() keyword arguments: none at all for an unconditional request.
+def _conditional_headers(entry: CacheEntry | None) -> dict[str, Any]:
+    upstream = entry.upstream if entry is not None else None
+    if not upstream:
+        return {}
+    headers = {}
+    if "etag" in upstream:
+        headers["If-None-Match"] = upstream["etag"]
+    if "last_modified" in upstream:
+        headers["If-Modified-Since"] = upstream["last_modified"]
+    return {"headers": headers}
+
+
+def _entry_etag(entry: CacheEntry) -> str:
+    return entry.etag if entry.etag is not None else payload_etag(entry.value)
+
+
+# A resource payload's own entity, or every entity on a search page.
+def _entity_keys(payload: dict[str, Any]) -> list[str]:
+    results = payload.get("results")
+    urls = [item.get("url") for item in results] if results is not None else [payload.get("url")]
+    keys = []
+    for ref in map(url_ref, urls):
+        if ref is not None:
+            keys += [ref[0], f"{ref[0]}:{ref[1]}"]
+    return keys
@@ -0,0 +1,205 @@
+import socket
+import threading
+import time
+
+import anyio
+import httpcore
+import httpx
+
+from holonet.config import settings
+from holonet.logging import log_json
+
+
+# Keeps every address getaddrinfo returned, in its order, so that a connect can fall through to
+# the next one when the first is unreachable (e.g. an IPv6 route that is down).
+class DNSCache:
+    def __init__(self, ttl_seconds: float) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        cached = self._lookup(host, port)
+        if cached is not None:
+            return cached
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            return [host]
+        return self._store(host, port, infos)
+
+    async def resolve_async(self, host: str, port: int) -> list[str]:
+        cached = self._lookup(host, port)
+        if cached is not None:
+            return cached
+        try:
+            infos = await anyio.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            return [host]
+        return self._store(host, port, infos)
+
+    def _lookup(self, host: str, port: int) -> list[str] | None:
+        with self._lock:
+            entry = self._entries.get((host, port))
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _store(self, host: str, port: int, infos: list) -> list[str]:
+        addresses = list(dict.fromkeys(str(info[4][0]) for info in infos)) or [host]
+        with self._lock:
+            self._entries[(host, port)] = (time.monotonic() + self._ttl_seconds, addresses)
+        return addresses
+
+
+class CachingSyncBackend(httpcore.SyncBackend):
+    def __init__(self, dns_cache: DNSCache) -> None:
+        self._dns_cache = dns_cache
+
+    def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options=None,
+    ) -> httpcore.NetworkStream:
+        # TLS SNI and the Host header still use the original hostname; only the TCP
+        # connect target is swapped for the cached addresses, tried in order.
+        addresses = self._dns_cache.resolve(host, port)
+        for address in addresses[:-1]:
+            try:
+                return super().connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                continue
+        return super().connect_tcp(
+            addresses[-1],
+            port,
+            timeout=timeout,
+            local_address=local_address,
+            socket_options=socket_options,
+        )
+
+
+class CachingAsyncBackend(httpcore.AnyIOBackend):
+    def __init__(self, dns_cache: DNSCache) -> None:
+        self._dns_cache = dns_cache
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options=None,
+    ) -> httpcore.AsyncNetworkStream:
+        addresses = await self._dns_cache.resolve_async(host, port)
+        for address in addresses[:-1]:
+            try:
+                return await super().connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                continue
+        return await super().connect_tcp(
+            addresses[-1],
+            port,
+            timeout=timeout,
+            local_address=local_address,
+            socket_options=socket_options,
+        )
+
+
+# Serves an httpx.AsyncClient from the pooled sync client on worker threads. Used when the app
+# runs without its lifespan (the Cloud Functions entrypoint starts a new event loop per
+# invocation), where a native async pool would be bound to a dead loop.
+class SyncBridgeTransport(httpx.AsyncBaseTransport):
+    def __init__(self, client: httpx.Client) -> None:
+        self._client = client
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        sync_request = httpx.Request(
+            request.method,
+            request.url,
+            headers=request.headers,
+            content=body,
+            extensions=request.extensions,
+        )
+
+        response = await anyio.to_thread.run_sync(self._client.send, sync_request)
+        # The body is already decoded, so drop the headers describing the wire encoding.
+        headers = [
+            (key, value)
+            for key, value in response.headers.multi_items()
+            if key.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=response.content,
+            extensions=response.extensions,
+        )
+
+
+def build_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+
+
+def build_http_client() -> httpx.Client:
+    _require_h2()
+    transport = httpx.HTTPTransport(limits=build_limits(), http2=settings.http2_enabled)
+    if settings.http_dns_cache_ttl_seconds > 0:
+        _use_backend(transport, CachingSyncBackend(DNSCache(settings.http_dns_cache_ttl_seconds)))
+    return httpx.Client(timeout=settings.http_timeout_seconds, transport=transport)
+
+
+def build_async_http_client() -> httpx.AsyncClient:
+    _require_h2()
+    transport = httpx.AsyncHTTPTransport(limits=build_limits(), http2=settings.http2_enabled)
+    if settings.http_dns_cache_ttl_seconds > 0:
+        _use_backend(transport, CachingAsyncBackend(DNSCache(settings.http_dns_cache_ttl_seconds)))
+    return httpx.AsyncClient(timeout=settings.http_timeout_seconds, transport=transport)
+
+
+def build_bridged_async_client(client: httpx.Client) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=settings.http_timeout_seconds, transport=SyncBridgeTransport(client)
+    )
+
+
+# httpx does not expose httpcore's network backend, so it is swapped on the pool httpx built
+# (httpx 0.27 / httpcore 1.x). Should a release lay the transport out differently, the
+# transport keeps its default backend and DNS is resolved per connection as usual.
+def _use_backend(
+    transport: httpx.HTTPTransport | httpx.AsyncHTTPTransport,
+    backend: httpcore.NetworkBackend | httpcore.AsyncNetworkBackend,
+) -> None:
+    pool = getattr(transport, "_pool", None)
+    if pool is None or not hasattr(pool, "_network_backend"):
+        log_json("dns_cache_unavailable", transport=type(transport).__name__)
+        return
+    pool._network_backend = backend
+
+
+def _require_h2() -> None:
+    if not settings.http2_enabled:
+        return
+    try:
+        import h2  # type: ignore # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError("h2 package not installed") from exc
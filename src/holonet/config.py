@@ -7,23 +7,51 @@ class Settings(BaseSettings):
 
     swapi_base_url: str = Field(default="https://swapi.dev/api", alias="SWAPI_BASE_URL")
     cache_ttl_seconds: int = Field(default=180, alias="CACHE_TTL_SECONDS")
+    # Extra window after CACHE_TTL_SECONDS during which an expired entry is still served (marked
+    # stale) while a single background request refreshes it. 0 disables stale serving.
+    cache_stale_ttl_seconds: int = Field(default=600, alias="CACHE_STALE_TTL_SECONDS")
     cache_max_entries: int = Field(default=2048, alias="CACHE_MAX_ENTRIES")
     cache_backend: str = Field(default="inmemory", alias="CACHE_BACKEND")
     redis_url: str | None = Field(default=None, alias="REDIS_URL")
+    # With CACHE_BACKEND=redis, a short-lived in-process L1 sits in front of Redis. 0 disables it.
+    cache_l1_ttl_seconds: int = Field(default=5, alias="CACHE_L1_TTL_SECONDS")
+    cache_l1_max_entries: int = Field(default=512, alias="CACHE_L1_MAX_ENTRIES")
 
     http_timeout_seconds: float = Field(default=6.0, alias="HTTP_TIMEOUT_SECONDS")
     http_retries: int = Field(default=2, alias="HTTP_RETRIES")
     http_backoff_factor: float = Field(default=0.3, alias="HTTP_BACKOFF_FACTOR")
+    http_max_connections: int = Field(default=100, alias="HTTP_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=20, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry_seconds: float = Field(
+        default=30.0, alias="HTTP_KEEPALIVE_EXPIRY_SECONDS"
+    )
+    http2_enabled: bool = Field(default=False, alias="HTTP2_ENABLED")
+    # 0 disables the resolver cache and leaves DNS lookups to the OS on every new connection.
+    http_dns_cache_ttl_seconds: float = Field(default=300.0, alias="HTTP_DNS_CACHE_TTL_SECONDS")
+    # How long a request waits on an identical in-flight SWAPI call before fetching on its own.
+    singleflight_timeout_seconds: float = Field(default=15.0, alias="SINGLEFLIGHT_TIMEOUT_SECONDS")
 
     api_page_size_default: int = Field(default=10, alias="API_PAGE_SIZE_DEFAULT")
     max_page_size: int = Field(default=50, alias="MAX_PAGE_SIZE")
     # SWAPI's "people" resource currently spans 9 pages; this cap prevents unbounded fan-out when `all=true`.
     max_upstream_pages: int = Field(default=9, alias="MAX_UPSTREAM_PAGES")
     max_expand_concurrency: int = Field(default=8, alias="MAX_EXPAND_CONCURRENCY")
+    # Pages after the first are fetched in parallel once `count` tells us how many there are.
+    max_upstream_concurrency: int = Field(default=6, alias="MAX_UPSTREAM_CONCURRENCY")
+
+    # Bulk-loads every SWAPI resource into memory at startup and answers from it, going upstream
+    # only for what the mirror does not hold. Reloaded every MIRROR_REFRESH_SECONDS.
+    mirror_enabled: bool = Field(default=False, alias="MIRROR_ENABLED")
+    mirror_refresh_seconds: int = Field(default=3600, alias="MIRROR_REFRESH_SECONDS")
+    mirror_max_pages: int = Field(default=20, alias="MIRROR_MAX_PAGES")
 
     graph_max_nodes: int = Field(default=250, alias="GRAPH_MAX_NODES")
     graph_max_depth: int = Field(default=1, alias="GRAPH_MAX_DEPTH")
+    # Depth cap when the graph is answered from the mirror's relation index instead of live calls.
+    graph_indexed_max_depth: int = Field(default=3, alias="GRAPH_INDEXED_MAX_DEPTH")
+    graph_cache_max_entries: int = Field(default=512, alias="GRAPH_CACHE_MAX_ENTRIES")
     map_max_pages: int = Field(default=4, alias="MAP_MAX_PAGES")
+    batch_max_refs: int = Field(default=50, alias="BATCH_MAX_REFS")
 
     require_api_key: bool = Field(default=False, alias="REQUIRE_API_KEY")
     api_key: str = Field(default="", alias="API_KEY")
@@ -1,6 +1,6 @@
 from fastapi import Header, HTTPException, Request
 
-from holonet.clients.swapi_client import SwapiClient
+from holonet.clients.swapi_client import AsyncSwapiClient
 
 
 def require_api_key(
@@ -20,7 +20,14 @@ def correlation_id_dependency(request: Request) -> str:
     return request.state.correlation_id
 
 
-def get_swapi_client(request: Request) -> SwapiClient:
-    cache = request.app.state.cache
+def get_async_swapi_client(request: Request) -> AsyncSwapiClient:
+    state = request.app.state
     correlation_id = getattr(request.state, "correlation_id", None)
-    return SwapiClient(cache, correlation_id=correlation_id)
+    return AsyncSwapiClient(
+        state.cache,
+        correlation_id=correlation_id,
+        http_client=state.async_http_client,
+        flights=state.async_flights,
+        mirror=state.mirror,
+        page_sizes=state.page_sizes,
+    )
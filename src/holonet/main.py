@@ -1,25 +1,79 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from holonet.clients.mirror import SwapiMirror
+from holonet.clients.swapi_client import AsyncSwapiClient
+from holonet.clients.transport import (
+    build_async_http_client,
+    build_bridged_async_client,
+    build_http_client,
+)
 from holonet.config import settings
 from holonet.errors import AppError
 from holonet.logging import build_request_logger, get_correlation_id, setup_logging
-from holonet.routes import graph, health, planets_map, public, resources, search
+from holonet.routes import batch, graph, health, planets_map, public, resources, search
+from holonet.services.graph_cache import GraphCache
+from holonet.services.graph_service import RELATIONS
+from holonet.services.mirror_service import MirrorService
+from holonet.services.relation_index import RelationIndex
 from holonet.utils.cache import build_cache
+from holonet.utils.concurrency import shared_executor
+from holonet.utils.pagination import PageSizeHint
+from holonet.utils.singleflight import AsyncSingleFlight
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if app.state.http_client.is_closed:
+        app.state.http_client = build_http_client()
+    app.state.async_http_client = build_async_http_client()
+    mirror_task = None
+    if settings.mirror_enabled:
+        # The initial load runs in the background too: requests go upstream until it lands.
+        loader = AsyncSwapiClient(http_client=app.state.async_http_client)
+        mirror_task = asyncio.create_task(
+            MirrorService(loader, app.state.mirror, app.state.relation_index).run()
+        )
+    yield
+    if mirror_task is not None:
+        mirror_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await mirror_task
+    await app.state.async_http_client.aclose()
+    app.state.http_client.close()
+    app.state.async_http_client = build_bridged_async_client(app.state.http_client)
 
 
 def create_app() -> FastAPI:
     setup_logging()
-    app = FastAPI(title="Holonet Galactic Console API", version="1.0.0")
+    app = FastAPI(title="Holonet Galactic Console API", version="1.0.0", lifespan=lifespan)
 
     app.state.cache = build_cache(
         ttl_seconds=settings.cache_ttl_seconds,
         max_entries=settings.cache_max_entries,
         backend=settings.cache_backend,
         redis_url=settings.redis_url,
+        stale_ttl_seconds=settings.cache_stale_ttl_seconds,
+        l1_ttl_seconds=settings.cache_l1_ttl_seconds,
+        l1_max_entries=settings.cache_l1_max_entries,
     )
+    # Built eagerly so entrypoints that never run the lifespan (Cloud Functions) still share
+    # one pool; async handlers reach it through a thread bridge until the lifespan swaps in a
+    # native async pool, and the lifespan owns closing both.
+    app.state.http_client = build_http_client()
+    app.state.async_http_client = build_bridged_async_client(app.state.http_client)
+    app.state.async_flights = AsyncSingleFlight(settings.singleflight_timeout_seconds)
+    app.state.mirror = SwapiMirror()
+    app.state.relation_index = RelationIndex(RELATIONS)
+    app.state.graph_cache = GraphCache(settings.cache_ttl_seconds, settings.graph_cache_max_entries)
+    app.state.page_sizes = PageSizeHint()
+    app.state.expand_executor = shared_executor(settings.max_expand_concurrency)
+    app.state.upstream_executor = shared_executor(settings.max_upstream_concurrency, "upstream")
 
     @app.middleware("http")
     async def correlation_id_middleware(request: Request, call_next):
@@ -83,6 +137,7 @@ def create_app() -> FastAPI:
     app.include_router(planets_map.router, prefix="/v1")
     app.include_router(resources.router, prefix="/v1")
     app.include_router(graph.router, prefix="/v1")
+    app.include_router(batch.router, prefix="/v1")
 
     return app
 
@@ -0,0 +1,78 @@
+from collections.abc import Iterable
+from typing import Any, Protocol
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from holonet.utils.etag import combine, etag_matches
+
+MAX_SURROGATE_KEYS = 256
+
+
+# Envelope payloads are assembled by the routes from service output that already has the
+# ItemsEnvelope/ItemEnvelope shape, so they are written straight to bytes with orjson instead of
+# being re-validated by response_model. The routes keep response_model for the OpenAPI schema;
+# returning a Response instance is what makes FastAPI skip it at runtime.
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+# The data behind an envelope, as tracked by the client (or graph service) that produced it.
+class ResponseSource(Protocol):
+    def validator(self) -> str: ...
+
+    def freshness(self) -> tuple[int, int]: ...
+
+    def surrogate_keys(self) -> list[str]: ...
+
+
+# Envelope with caching headers derived from the data behind it:
+# - ETag: weak, over the app version, the request URL and the source's validator. The body also
+#   carries per-request metadata (correlation id, cache hit/stale) that the tag leaves out, so
+#   equal tags mean equivalent, not byte-identical, envelopes. A request whose If-None-Match already holds
+#   it gets an empty 304 and the envelope is never serialized.
+# - Cache-Control: max-age and stale-while-revalidate from the remaining cache lifetime. Only
+#   the public routes are marked public, and they vary on Accept (the same URL streams NDJSON
+#   when asked to); API-key routes vary on the key.
+# - Surrogate-Key / Cache-Tag: the entities included, so an edge cache can purge precisely.
+#   `keys` adds any the source did not see, e.g. list items answered from the mirror.
+def conditional_response(
+    request: Request,
+    content: dict[str, Any],
+    source: ResponseSource,
+    public: bool = False,
+    keys: Iterable[str] = (),
+) -> Response:
+    validator = combine(
+        request.app.version, request.url.path, request.url.query, source.validator()
+    )
+    etag = f'W/"{validator}"'
+    max_age, stale = source.freshness()
+    cache_control = f"max-age={max_age}, stale-while-revalidate={stale}"
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, {cache_control}" if public else cache_control,
+    }
+    headers["Vary"] = "Accept" if public else "X-API-Key"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    surrogate_keys = _surrogate_keys(sorted({*source.surrogate_keys(), *keys}))
+    if surrogate_keys:
+        headers["Surrogate-Key"] = " ".join(surrogate_keys)
+        headers["Cache-Tag"] = ",".join(surrogate_keys)
+    return FastJSONResponse(content, headers=headers)
+
+
+# Past the cap (header size limits at the edge), only the resource-level keys are sent.
+def _surrogate_keys(keys: list[str]) -> list[str]:
+    if len(keys) <= MAX_SURROGATE_KEYS:
+        return keys
+    return [key for key in keys if ":" not in key]
+
+
+# Surrogate keys for a list of `resource` items carrying their ids.
+def item_keys(resource: str, items: list[dict[str, Any]]) -> list[str]:
+    keys = [f"{resource}:{item['id']}" for item in items if item.get("id") is not None]
+    return [resource, *keys]
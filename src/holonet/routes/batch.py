@@ -0,0 +1,46 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query, Request
+
+from holonet.config import settings
+from holonet.deps import correlation_id_dependency, get_async_swapi_client, require_api_key
+from holonet.responses import FastJSONResponse, conditional_response
+from holonet.schemas.batch import BatchEnvelope, BatchRequest
+from holonet.services.batch_service import AsyncBatchService
+from holonet.utils.fields import parse_fields
+
+router = APIRouter(tags=["batch"], dependencies=[Depends(require_api_key)])
+
+
+@router.get("/batch", response_model=BatchEnvelope)
+async def batch(
+    request: Request,
+    refs: str = Query(..., description="Comma-separated resource:id refs, e.g. people:1,planets:2"),
+    fields: str | None = Query(default=None),
+    client=Depends(get_async_swapi_client),
+    correlation_id: str = Depends(correlation_id_dependency),
+):
+    content = await _batch(refs.split(","), parse_fields(fields), client, correlation_id)
+    return conditional_response(request, content, client)
+
+
+@router.post("/batch", response_model=BatchEnvelope)
+async def batch_post(
+    body: BatchRequest,
+    client=Depends(get_async_swapi_client),
+    correlation_id: str = Depends(correlation_id_dependency),
+):
+    return FastJSONResponse(await _batch(body.refs, body.fields, client, correlation_id))
+
+
+# Only the GET form is conditional; If-None-Match on a POST means something else.
+async def _batch(
+    refs: list[str], fields: list[str] | None, client, correlation_id: str
+) -> dict[str, Any]:
+    results = await AsyncBatchService(client).lookup(refs, fields)
+    return {
+        "results": results,
+        "source": {"name": "swapi", "url": settings.swapi_base_url},
+        "cache": client.cache_meta(),
+        "correlation_id": correlation_id,
+    }
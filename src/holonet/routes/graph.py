@@ -1,26 +1,34 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 
 from holonet.config import settings
-from holonet.deps import correlation_id_dependency, get_swapi_client, require_api_key
+from holonet.deps import correlation_id_dependency, get_async_swapi_client, require_api_key
+from holonet.responses import conditional_response
 from holonet.schemas.graph import GraphQuery
-from holonet.services.graph_service import GraphService
+from holonet.services.graph_service import AsyncGraphService
 
 router = APIRouter(tags=["graph"], dependencies=[Depends(require_api_key)])
 
 
 @router.get("/graph")
-def graph(
+async def graph(
+    request: Request,
     start_resource: str = Query(...),
     start_id: int = Query(..., ge=1),
     depth: int = Query(default=1, ge=1, le=3),
-    client=Depends(get_swapi_client),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
     query = GraphQuery(start_resource=start_resource, start_id=start_id, depth=depth)
-    graph_data = GraphService(client).build_graph(query.start_resource, query.start_id, query.depth)
-    return {
-        "graph": graph_data,
-        "source": {"name": "swapi", "url": settings.swapi_base_url},
-        "cache": {"hit": False, "ttl": settings.cache_ttl_seconds},
-        "correlation_id": correlation_id,
-    }
+    state = request.app.state
+    service = AsyncGraphService(client, state.relation_index, state.graph_cache)
+    graph_data = await service.build_graph(query.start_resource, query.start_id, query.depth)
+    return conditional_response(
+        request,
+        {
+            "graph": graph_data,
+            "source": {"name": "swapi", "url": settings.swapi_base_url},
+            "cache": service.cache_meta(),
+            "correlation_id": correlation_id,
+        },
+        service,
+    )
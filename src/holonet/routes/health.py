@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 
-from holonet.deps import correlation_id_dependency
+from holonet.deps import correlation_id_dependency, require_api_key
 
 router = APIRouter(tags=["health"])
 
@@ -35,3 +35,20 @@ def meta(correlation_id: str = Depends(correlation_id_dependency)):
         "cache": {"hit": False, "ttl": 0},
         "correlation_id": correlation_id,
     }
+
+
+@router.get("/v1/stats", dependencies=[Depends(require_api_key)])
+def stats(request: Request, correlation_id: str = Depends(correlation_id_dependency)):
+    state = request.app.state
+    return {
+        "singleflight": state.async_flights.stats(),
+        "cache_backend": state.cache.stats(),
+        "mirror": state.mirror.stats(),
+        "relation_index": state.relation_index.stats(),
+        "graph_cache": state.graph_cache.stats(),
+        "expand": state.expand_executor.stats(),
+        "upstream": state.upstream_executor.stats(),
+        "source": {"name": "holonet", "url": "internal"},
+        "cache": {"hit": False, "ttl": 0},
+        "correlation_id": correlation_id,
+    }
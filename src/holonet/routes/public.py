@@ -1,17 +1,28 @@
-from fastapi import APIRouter, Depends, Query
+from collections.abc import AsyncIterator
+from typing import Any
+
+import orjson
+from fastapi import APIRouter, Depends, Header, Query, Request
+from fastapi.responses import StreamingResponse
 
 from holonet.config import settings
-from holonet.deps import correlation_id_dependency, get_swapi_client
+from holonet.deps import correlation_id_dependency, get_async_swapi_client
 from holonet.errors import AppError
-from holonet.schemas.common import ItemsEnvelope
+from holonet.responses import conditional_response, item_keys
+from holonet.schemas.common import SearchEnvelope
 from holonet.schemas.search import SearchQuery
-from holonet.services.search_service import SearchService
+from holonet.services.expand_service import AsyncExpandService, parse_expand, with_relations
+from holonet.services.search_service import AsyncSearchService
 from holonet.utils.fields import parse_fields
+from holonet.utils.pagination import build_pagination
+
+NDJSON = "application/x-ndjson"
 
 router = APIRouter(tags=["public"])
 
 
-def _public_search(
+async def _public_search(
+    request: Request,
     resource: str,
     q: str | None,
     search: str | None,
@@ -22,7 +33,11 @@ def _public_search(
     order: str,
     reverse: bool,
     fields: str | None,
+    cursor: str | None,
     all_results: bool,
+    stream: bool,
+    accept: str | None,
+    expand: str | None,
     client,
     correlation_id: str,
 ):
@@ -46,23 +61,78 @@ def _public_search(
         sort=sort,
         order=order,
         fields=parse_fields(fields),
+        cursor=cursor,
     )
-    service = SearchService(client)
+    relations = parse_expand(query.resource, expand)
+    query = query.model_copy(update={"fields": with_relations(query.fields, relations)})
+    service = AsyncSearchService(client, client.mirror, client.page_sizes)
+    if all_results and (stream or NDJSON in (accept or "")):
+        batches = await service.stream_all(query)
+        return StreamingResponse(
+            _ndjson(batches, relations, client, correlation_id),
+            media_type=NDJSON,
+            headers={"Vary": "Accept"},
+        )
     if all_results:
-        items, pagination, cache_meta = service.search_all(query)
+        items, pagination = await service.search_all(query)
     else:
-        items, pagination, cache_meta = service.search(query)
-    return {
-        "items": items,
-        "pagination": pagination,
+        items, pagination = await service.search(query)
+    joined = None
+    if relations:
+        items, joined = await AsyncExpandService(client).join(items, relations)
+        joined["upstream_calls"] = client.upstream_calls
+    return conditional_response(
+        request,
+        {
+            "items": items,
+            "pagination": pagination,
+            "source": {"name": "swapi", "url": settings.swapi_base_url},
+            "cache": client.cache_meta(),
+            "correlation_id": correlation_id,
+            "expand": joined,
+        },
+        client,
+        public=True,
+        keys=item_keys(query.resource, items),
+    )
+
+
+# One JSON item per line, written as each batch arrives, then a trailing line carrying what the
+# JSON envelope would: pagination, source, cache and correlation id. Expanded relations are
+# joined batch by batch; refs already resolved by an earlier batch come back from the cache.
+async def _ndjson(
+    batches: AsyncIterator[list[dict[str, Any]]],
+    relations: list[str],
+    client,
+    correlation_id: str,
+) -> AsyncIterator[bytes]:
+    expander = AsyncExpandService(client)
+    total = 0
+    refs = 0
+    async for batch in batches:
+        if relations:
+            batch, joined = await expander.join(batch, relations)
+            refs += joined["refs"]
+        total += len(batch)
+        yield b"".join(orjson.dumps(item) + b"\n" for item in batch)
+    meta = {
+        "pagination": build_pagination(1, max(total, 1), total),
         "source": {"name": "swapi", "url": settings.swapi_base_url},
-        "cache": cache_meta,
+        "cache": client.cache_meta(),
         "correlation_id": correlation_id,
     }
+    if relations:
+        meta["expand"] = {
+            "relations": relations,
+            "refs": refs,
+            "upstream_calls": client.upstream_calls,
+        }
+    yield orjson.dumps({"meta": meta}) + b"\n"
 
 
-@router.get("/films", response_model=ItemsEnvelope)
-def public_films(
+@router.get("/films", response_model=SearchEnvelope)
+async def public_films(
+    request: Request,
     q: str | None = Query(default=None),
     search: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
@@ -73,10 +143,15 @@ def public_films(
     order: str = Query(default="asc"),
     reverse: bool = Query(default=False),
     fields: str | None = Query(default=None),
-    client=Depends(get_swapi_client),
+    cursor: str | None = Query(default=None, description="Continue from a previous next_cursor"),
+    stream: bool = Query(default=False, description="Stream all=true results as NDJSON"),
+    accept: str | None = Header(default=None),
+    expand: str | None = Query(default=None, description="Inline related records, e.g. homeworld"),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    return _public_search(
+    return await _public_search(
+        request,
         "films",
         q,
         search,
@@ -87,14 +162,19 @@ def public_films(
         order,
         reverse,
         fields,
+        cursor,
         all,
+        stream,
+        accept,
+        expand,
         client,
         correlation_id,
     )
 
 
-@router.get("/characters", response_model=ItemsEnvelope)
-def public_characters(
+@router.get("/characters", response_model=SearchEnvelope)
+async def public_characters(
+    request: Request,
     q: str | None = Query(default=None),
     search: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
@@ -105,10 +185,15 @@ def public_characters(
     order: str = Query(default="asc"),
     reverse: bool = Query(default=False),
     fields: str | None = Query(default=None),
-    client=Depends(get_swapi_client),
+    cursor: str | None = Query(default=None, description="Continue from a previous next_cursor"),
+    stream: bool = Query(default=False, description="Stream all=true results as NDJSON"),
+    accept: str | None = Header(default=None),
+    expand: str | None = Query(default=None, description="Inline related records, e.g. homeworld"),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    return _public_search(
+    return await _public_search(
+        request,
         "people",
         q,
         search,
@@ -119,14 +204,19 @@ def public_characters(
         order,
         reverse,
         fields,
+        cursor,
         all,
+        stream,
+        accept,
+        expand,
         client,
         correlation_id,
     )
 
 
-@router.get("/planets", response_model=ItemsEnvelope)
-def public_planets(
+@router.get("/planets", response_model=SearchEnvelope)
+async def public_planets(
+    request: Request,
     q: str | None = Query(default=None),
     search: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
@@ -137,10 +227,15 @@ def public_planets(
     order: str = Query(default="asc"),
     reverse: bool = Query(default=False),
     fields: str | None = Query(default=None),
-    client=Depends(get_swapi_client),
+    cursor: str | None = Query(default=None, description="Continue from a previous next_cursor"),
+    stream: bool = Query(default=False, description="Stream all=true results as NDJSON"),
+    accept: str | None = Header(default=None),
+    expand: str | None = Query(default=None, description="Inline related records, e.g. homeworld"),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    return _public_search(
+    return await _public_search(
+        request,
         "planets",
         q,
         search,
@@ -151,14 +246,19 @@ def public_planets(
         order,
         reverse,
         fields,
+        cursor,
         all,
+        stream,
+        accept,
+        expand,
         client,
         correlation_id,
     )
 
 
-@router.get("/starships", response_model=ItemsEnvelope)
-def public_starships(
+@router.get("/starships", response_model=SearchEnvelope)
+async def public_starships(
+    request: Request,
     q: str | None = Query(default=None),
     search: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
@@ -169,10 +269,15 @@ def public_starships(
     order: str = Query(default="asc"),
     reverse: bool = Query(default=False),
     fields: str | None = Query(default=None),
-    client=Depends(get_swapi_client),
+    cursor: str | None = Query(default=None, description="Continue from a previous next_cursor"),
+    stream: bool = Query(default=False, description="Stream all=true results as NDJSON"),
+    accept: str | None = Header(default=None),
+    expand: str | None = Query(default=None, description="Inline related records, e.g. homeworld"),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    return _public_search(
+    return await _public_search(
+        request,
         "starships",
         q,
         search,
@@ -183,14 +288,19 @@ def public_starships(
         order,
         reverse,
         fields,
+        cursor,
         all,
+        stream,
+        accept,
+        expand,
         client,
         correlation_id,
     )
 
 
-@router.get("/vehicles", response_model=ItemsEnvelope)
-def public_vehicles(
+@router.get("/vehicles", response_model=SearchEnvelope)
+async def public_vehicles(
+    request: Request,
     q: str | None = Query(default=None),
     search: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
@@ -201,10 +311,15 @@ def public_vehicles(
     order: str = Query(default="asc"),
     reverse: bool = Query(default=False),
     fields: str | None = Query(default=None),
-    client=Depends(get_swapi_client),
+    cursor: str | None = Query(default=None, description="Continue from a previous next_cursor"),
+    stream: bool = Query(default=False, description="Stream all=true results as NDJSON"),
+    accept: str | None = Header(default=None),
+    expand: str | None = Query(default=None, description="Inline related records, e.g. homeworld"),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    return _public_search(
+    return await _public_search(
+        request,
         "vehicles",
         q,
         search,
@@ -215,14 +330,19 @@ def public_vehicles(
         order,
         reverse,
         fields,
+        cursor,
         all,
+        stream,
+        accept,
+        expand,
         client,
         correlation_id,
     )
 
 
-@router.get("/species", response_model=ItemsEnvelope)
-def public_species(
+@router.get("/species", response_model=SearchEnvelope)
+async def public_species(
+    request: Request,
     q: str | None = Query(default=None),
     search: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
@@ -233,10 +353,15 @@ def public_species(
     order: str = Query(default="asc"),
     reverse: bool = Query(default=False),
     fields: str | None = Query(default=None),
-    client=Depends(get_swapi_client),
+    cursor: str | None = Query(default=None, description="Continue from a previous next_cursor"),
+    stream: bool = Query(default=False, description="Stream all=true results as NDJSON"),
+    accept: str | None = Header(default=None),
+    expand: str | None = Query(default=None, description="Inline related records, e.g. homeworld"),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    return _public_search(
+    return await _public_search(
+        request,
         "species",
         q,
         search,
@@ -247,7 +372,11 @@ def public_species(
         order,
         reverse,
         fields,
+        cursor,
         all,
+        stream,
+        accept,
+        expand,
         client,
         correlation_id,
     )
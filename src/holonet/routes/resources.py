@@ -1,97 +1,207 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.responses import Response
 
 from holonet.config import settings
-from holonet.deps import correlation_id_dependency, get_swapi_client, require_api_key
+from holonet.deps import correlation_id_dependency, get_async_swapi_client, require_api_key
+from holonet.errors import AppError
+from holonet.responses import conditional_response
 from holonet.schemas.common import ItemEnvelope
+from holonet.schemas.resources import RelationEnvelope, RelationQuery
+from holonet.schemas.search import ResourceName
+from holonet.services.relation_service import AsyncRelationService
+from holonet.utils.fields import compile_projector, parse_fields
 
 router = APIRouter(tags=["resources"], dependencies=[Depends(require_api_key)])
 
 
 @router.get("/films/{resource_id}", response_model=ItemEnvelope)
-def get_film(
+async def get_film(
+    request: Request,
     resource_id: int,
-    client=Depends(get_swapi_client),
+    fields: str | None = Query(default=None),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    return _get_resource("films", resource_id, client, correlation_id)
+    return await _get_resource(request, "films", resource_id, fields, client, correlation_id)
 
 
 @router.get("/people/{resource_id}", response_model=ItemEnvelope)
-def get_person(
+async def get_person(
+    request: Request,
     resource_id: int,
-    client=Depends(get_swapi_client),
+    fields: str | None = Query(default=None),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    return _get_resource("people", resource_id, client, correlation_id)
+    return await _get_resource(request, "people", resource_id, fields, client, correlation_id)
 
 
 @router.get("/planets/{resource_id}", response_model=ItemEnvelope)
-def get_planet(
+async def get_planet(
+    request: Request,
     resource_id: int,
-    client=Depends(get_swapi_client),
+    fields: str | None = Query(default=None),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    return _get_resource("planets", resource_id, client, correlation_id)
+    return await _get_resource(request, "planets", resource_id, fields, client, correlation_id)
 
 
 @router.get("/starships/{resource_id}", response_model=ItemEnvelope)
-def get_starship(
+async def get_starship(
+    request: Request,
     resource_id: int,
-    client=Depends(get_swapi_client),
+    fields: str | None = Query(default=None),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    return _get_resource("starships", resource_id, client, correlation_id)
+    return await _get_resource(request, "starships", resource_id, fields, client, correlation_id)
 
 
 @router.get("/films/{resource_id}/characters", response_model=dict)
-def get_film_characters(
-    resource_id: int,
-    client=Depends(get_swapi_client),
+async def get_film_characters(
+    request: Request,
+    resource_id: int = Path(..., ge=1),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=settings.api_page_size_default, ge=1),
+    sort: str | None = Query(default=None),
+    order: str = Query(default="asc", pattern="^(asc|desc)$"),
+    fields: str | None = Query(default=None),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    film = client.get_resource("films", resource_id)
-    cache_meta = film.pop("_cache", {"hit": False, "ttl": settings.cache_ttl_seconds})
-    characters = film.get("characters", [])
-    from holonet.services.expand_service import ExpandService
-
-    expanded = ExpandService(client).expand_urls(characters)
-    return {
-        "items": expanded,
-        "film": {"id": resource_id, "title": film.get("title")},
-        "source": {"name": "swapi", "url": settings.swapi_base_url},
-        "cache": cache_meta,
-        "correlation_id": correlation_id,
-    }
+    query = _relation_query(
+        "films", resource_id, "characters", page, page_size, sort, order, fields
+    )
+    parent, items, pagination = await AsyncRelationService(client).related(query)
+    return _related_response(
+        request,
+        items,
+        pagination,
+        parent,
+        client,
+        correlation_id,
+        film={"id": resource_id, "title": parent["label"]},
+    )
 
 
 @router.get("/people/{resource_id}/films", response_model=dict)
-def get_person_films(
-    resource_id: int,
-    client=Depends(get_swapi_client),
+async def get_person_films(
+    request: Request,
+    resource_id: int = Path(..., ge=1),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=settings.api_page_size_default, ge=1),
+    sort: str | None = Query(default=None),
+    order: str = Query(default="asc", pattern="^(asc|desc)$"),
+    fields: str | None = Query(default=None),
+    client=Depends(get_async_swapi_client),
+    correlation_id: str = Depends(correlation_id_dependency),
+):
+    query = _relation_query("people", resource_id, "films", page, page_size, sort, order, fields)
+    parent, items, pagination = await AsyncRelationService(client).related(query)
+    return _related_response(
+        request,
+        items,
+        pagination,
+        parent,
+        client,
+        correlation_id,
+        person={"id": resource_id, "name": parent["label"]},
+    )
+
+
+# Registered after the fixed relation routes above, which page and sort the same way but keep
+# their own parent key ("film" / "person") next to "parent".
+@router.get("/{resource}/{resource_id}/{relation}", response_model=RelationEnvelope)
+async def get_related(
+    request: Request,
+    resource: ResourceName,
+    relation: str,
+    resource_id: int = Path(..., ge=1),
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=settings.api_page_size_default, ge=1),
+    sort: str | None = Query(default=None),
+    order: str = Query(default="asc", pattern="^(asc|desc)$"),
+    fields: str | None = Query(default=None),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
-    person = client.get_resource("people", resource_id)
-    cache_meta = person.pop("_cache", {"hit": False, "ttl": settings.cache_ttl_seconds})
-    films = person.get("films", [])
-    from holonet.services.expand_service import ExpandService
-
-    expanded = ExpandService(client).expand_urls(films)
-    return {
-        "items": expanded,
-        "person": {"id": resource_id, "name": person.get("name")},
-        "source": {"name": "swapi", "url": settings.swapi_base_url},
-        "cache": cache_meta,
-        "correlation_id": correlation_id,
-    }
-
-
-def _get_resource(resource: str, resource_id: int, client, correlation_id: str) -> dict:
-    item = client.get_resource(resource, resource_id)
-    cache_meta = item.pop("_cache", {"hit": False, "ttl": settings.cache_ttl_seconds})
+    query = _relation_query(resource, resource_id, relation, page, page_size, sort, order, fields)
+    parent, items, pagination = await AsyncRelationService(client).related(query)
+    return _related_response(request, items, pagination, parent, client, correlation_id)
+
+
+def _relation_query(
+    resource: str,
+    resource_id: int,
+    relation: str,
+    page: int,
+    page_size: int,
+    sort: str | None,
+    order: str,
+    fields: str | None,
+) -> RelationQuery:
+    if page_size > settings.max_page_size:
+        raise AppError(
+            "page_size exceeds maximum",
+            status_code=400,
+            details={"max_page_size": settings.max_page_size},
+        )
+    return RelationQuery(
+        resource=resource,
+        resource_id=resource_id,
+        relation=relation,
+        page=page,
+        page_size=page_size,
+        sort=sort,
+        order=order,
+        fields=parse_fields(fields),
+    )
+
+
+def _related_response(
+    request: Request,
+    items: list,
+    pagination: dict,
+    parent: dict,
+    client,
+    correlation_id: str,
+    **extra,
+) -> Response:
+    return conditional_response(
+        request,
+        {
+            "items": items,
+            "pagination": pagination,
+            "parent": parent,
+            **extra,
+            "source": {"name": "swapi", "url": settings.swapi_base_url},
+            "cache": client.cache_meta(),
+            "correlation_id": correlation_id,
+        },
+        client,
+    )
+
+
+async def _get_resource(
+    request: Request,
+    resource: str,
+    resource_id: int,
+    fields: str | None,
+    client,
+    correlation_id: str,
+) -> Response:
+    data = await client.get_resource(resource, resource_id)
+    project = compile_projector(parse_fields(fields))
+    item = {**data} if project is None else project(data)
     item["id"] = resource_id
-    return {
-        "item": item,
-        "source": {"name": "swapi", "url": settings.swapi_base_url},
-        "cache": cache_meta,
-        "correlation_id": correlation_id,
-    }
+    return conditional_response(
+        request,
+        {
+            "item": item,
+            "source": {"name": "swapi", "url": settings.swapi_base_url},
+            "cache": client.cache_meta(),
+            "correlation_id": correlation_id,
+        },
+        client,
+    )
@@ -1,18 +1,21 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 
 from holonet.config import settings
-from holonet.deps import correlation_id_dependency, get_swapi_client, require_api_key
+from holonet.deps import correlation_id_dependency, get_async_swapi_client, require_api_key
 from holonet.errors import AppError
-from holonet.schemas.common import ItemsEnvelope
+from holonet.responses import conditional_response, item_keys
+from holonet.schemas.common import SearchEnvelope
 from holonet.schemas.search import SearchQuery
-from holonet.services.search_service import SearchService
+from holonet.services.expand_service import AsyncExpandService, parse_expand, with_relations
+from holonet.services.search_service import AsyncSearchService
 from holonet.utils.fields import parse_fields
 
 router = APIRouter(tags=["search"], dependencies=[Depends(require_api_key)])
 
 
-@router.get("/search", response_model=ItemsEnvelope)
-def search(
+@router.get("/search", response_model=SearchEnvelope)
+async def search(
+    request: Request,
     resource: str = Query(...),
     q: str | None = Query(default=None),
     search: str | None = Query(default=None),
@@ -23,7 +26,9 @@ def search(
     order: str = Query(default="asc"),
     reverse: bool = Query(default=False),
     fields: str | None = Query(default=None),
-    client=Depends(get_swapi_client),
+    cursor: str | None = Query(default=None, description="Continue from a previous next_cursor"),
+    expand: str | None = Query(default=None, description="Inline related records, e.g. homeworld"),
+    client=Depends(get_async_swapi_client),
     correlation_id: str = Depends(correlation_id_dependency),
 ):
     if page_size > settings.max_page_size:
@@ -46,13 +51,26 @@ def search(
         sort=sort,
         order=order,
         fields=parse_fields(fields),
+        cursor=cursor,
+    )
+    relations = parse_expand(query.resource, expand)
+    query = query.model_copy(update={"fields": with_relations(query.fields, relations)})
+    service = AsyncSearchService(client, client.mirror, client.page_sizes)
+    items, pagination = await service.search(query)
+    joined = None
+    if relations:
+        items, joined = await AsyncExpandService(client).join(items, relations)
+        joined["upstream_calls"] = client.upstream_calls
+    return conditional_response(
+        request,
+        {
+            "items": items,
+            "pagination": pagination,
+            "source": {"name": "swapi", "url": settings.swapi_base_url},
+            "cache": client.cache_meta(),
+            "correlation_id": correlation_id,
+            "expand": joined,
+        },
+        client,
+        keys=item_keys(query.resource, items),
     )
-    service = SearchService(client)
-    items, pagination, cache_meta = service.search(query)
-    return {
-        "items": items,
-        "pagination": pagination,
-        "source": {"name": "swapi", "url": settings.swapi_base_url},
-        "cache": cache_meta,
-        "correlation_id": correlation_id,
-    }
@@ -0,0 +1,14 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from holonet.schemas.common import Envelope
+
+
+class BatchRequest(BaseModel):
+    refs: list[str] = Field(min_length=1)
+    fields: list[str] | None = None
+
+
+class BatchEnvelope(Envelope):
+    results: dict[str, dict[str, Any]]
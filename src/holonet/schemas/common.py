@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field
 class CacheMeta(BaseModel):
     hit: bool = False
     ttl: int = 0
+    stale: bool = False
 
 
 class SourceMeta(BaseModel):
@@ -20,6 +21,13 @@ class Pagination(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+    next_cursor: str | None = None
+
+
+class ExpandMeta(BaseModel):
+    relations: list[str]
+    refs: int
+    upstream_calls: int
 
 
 class ErrorBody(BaseModel):
@@ -43,5 +51,10 @@ class ItemsEnvelope(Envelope):
     pagination: Pagination | None = None
 
 
+# List envelope of the search endpoints, which can inline related records with expand=.
+class SearchEnvelope(ItemsEnvelope):
+    expand: ExpandMeta | None = None
+
+
 class ItemEnvelope(Envelope):
     item: dict[str, Any]
@@ -1,5 +1,25 @@
+from typing import Any, Literal
+
 from pydantic import BaseModel, Field
 
+from holonet.schemas.common import ItemsEnvelope
+from holonet.schemas.search import ResourceName
+
 
 class ResourcePath(BaseModel):
     resource_id: int = Field(ge=1)
+
+
+class RelationQuery(BaseModel):
+    resource: ResourceName
+    resource_id: int = Field(ge=1)
+    relation: str
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=10, ge=1, le=100)
+    sort: str | None = None
+    order: Literal["asc", "desc"] = "asc"
+    fields: list[str] | None = None
+
+
+class RelationEnvelope(ItemsEnvelope):
+    parent: dict[str, Any]
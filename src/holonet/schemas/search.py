@@ -13,3 +13,4 @@ class SearchQuery(BaseModel):
     sort: str | None = None
     order: Literal["asc", "desc"] = "asc"
     fields: list[str] | None = None
+    cursor: str | None = Field(default=None, max_length=512)
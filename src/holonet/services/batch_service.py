@@ -0,0 +1,103 @@
+from collections.abc import Awaitable
+from typing import Any, get_args
+
+from holonet.clients.swapi_client import AsyncSwapiClient
+from holonet.config import settings
+from holonet.errors import AppError
+from holonet.schemas.search import ResourceName
+from holonet.utils.concurrency import BoundedExecutor, shared_executor
+from holonet.utils.fields import Projector, compile_projector
+from holonet.utils.refs import Ref
+
+RESOURCES = frozenset(get_args(ResourceName))
+
+
+class AsyncBatchService:
+    def __init__(self, client: AsyncSwapiClient) -> None:
+        self._client = client
+
+    async def lookup(
+        self, refs: list[str], fields: list[str] | None = None
+    ) -> dict[str, dict[str, Any]]:
+        parsed = _parse(refs)
+        resolved = await resolve_async(self._client, [ref for ref in parsed.values() if ref])
+        return _results(parsed, resolved, fields)
+
+
+# Fetches each distinct ref once: mirror and cache hits in one bulk read, then the misses
+# concurrently, on the process-wide expand executor unless one is given. A failed fetch maps
+# to its AppError instead of failing the others.
+async def resolve_async(
+    client: AsyncSwapiClient, refs: list[Ref], executor: BoundedExecutor | None = None
+) -> dict[Ref, dict[str, Any] | AppError]:
+    unique = list(dict.fromkeys(refs))
+    resolved: dict[Ref, dict[str, Any] | AppError] = dict(await client.cached_resources(unique))
+    missing = [ref for ref in unique if ref not in resolved]
+    executor = (
+        executor if executor is not None else shared_executor(settings.max_expand_concurrency)
+    )
+    fetched = await executor.gather(lambda ref: _outcome_async(client.get_resource(*ref)), missing)
+    resolved.update(zip(missing, fetched, strict=True))
+    return resolved
+
+
+# Refs are deduplicated as given ("people:01" and "people:1" still share one lookup); a
+# malformed ref maps to None and gets its own error instead of failing the batch.
+def _parse(refs: list[str]) -> dict[str, Ref | None]:
+    unique = list(dict.fromkeys(ref.strip() for ref in refs if ref.strip()))
+    if not unique:
+        raise AppError("refs is required", status_code=400)
+    if len(unique) > settings.batch_max_refs:
+        raise AppError(
+            "Too many refs",
+            status_code=400,
+            details={"max_refs": settings.batch_max_refs, "refs": len(unique)},
+        )
+    return {ref: _parse_ref(ref) for ref in unique}
+
+
+def _parse_ref(ref: str) -> Ref | None:
+    resource, _, resource_id = ref.partition(":")
+    if (
+        resource not in RESOURCES
+        or not (resource_id.isascii() and resource_id.isdecimal())
+        or int(resource_id) < 1
+    ):
+        return None
+    return resource, int(resource_id)
+
+
+async def _outcome_async(fetch: Awaitable[dict[str, Any]]) -> dict[str, Any] | AppError:
+    try:
+        return await fetch
+    except AppError as exc:
+        return exc
+
+
+def _results(
+    parsed: dict[str, Ref | None],
+    resolved: dict[Ref, dict[str, Any] | AppError],
+    fields: list[str] | None,
+) -> dict[str, dict[str, Any]]:
+    project = compile_projector(fields)
+    results = {}
+    for ref, key in parsed.items():
+        if key is None:
+            results[ref] = _error(AppError("Invalid ref", status_code=400))
+            continue
+        data = resolved[key]
+        if isinstance(data, AppError):
+            results[ref] = _error(data)
+        else:
+            results[ref] = {"item": _item(data, key[1], project)}
+    return results
+
+
+def _item(data: dict[str, Any], resource_id: int, project: Projector | None) -> dict[str, Any]:
+    item = {**data} if project is None else project(data)
+    item["id"] = resource_id
+    return item
+
+
+def _error(exc: AppError) -> dict[str, Any]:
+    return {"error": {"message": exc.message, "status": exc.status_code, "details": exc.details}}
@@ -1,40 +1,133 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 
-from holonet.clients.swapi_client import SwapiClient
+from holonet.clients.swapi_client import AsyncSwapiClient
 from holonet.config import settings
 from holonet.errors import AppError
 from holonet.logging import log_json
+from holonet.services.batch_service import resolve_async
+from holonet.services.graph_service import RELATIONS
+from holonet.utils.concurrency import BoundedExecutor, shared_executor
+from holonet.utils.fields import Projector, compile_projector
+from holonet.utils.refs import Ref, url_id, url_ref
 
 
-class ExpandService:
-    def __init__(self, client: SwapiClient) -> None:
+class AsyncExpandService:
+    def __init__(self, client: AsyncSwapiClient, executor: BoundedExecutor | None = None) -> None:
         self._client = client
+        self._executor = (
+            executor if executor is not None else shared_executor(settings.max_expand_concurrency)
+        )
 
-    def expand_urls(self, urls: list[str]) -> list[dict[str, Any]]:
-        results: list[dict[str, Any]] = []
-        if not urls:
-            return results
-        with ThreadPoolExecutor(max_workers=settings.max_expand_concurrency) as executor:
-            futures = {executor.submit(self._client.get_by_url, url): url for url in urls}
-            for future in as_completed(futures):
-                try:
-                    data = future.result()
-                    data.pop("_cache", None)
-                    data["id"] = _extract_id(data.get("url"))
-                    results.append(data)
-                except AppError:
-                    log_json("expand_failed", url=futures[future])
-        return results
-
-
-def _extract_id(url: str | None) -> int | None:
-    if not url:
-        return None
-    parts = [p for p in url.split("/") if p]
-    if not parts:
-        return None
-    try:
-        return int(parts[-1])
-    except ValueError:
-        return None
+    async def expand_urls(
+        self, urls: list[str], fields: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        project = compile_projector(fields)
+
+        async def _fetch(url: str) -> dict[str, Any] | None:
+            try:
+                return _expanded(await self._client.get_by_url(url), project)
+            except AppError:
+                log_json("expand_failed", url=url)
+                return None
+
+        fetched = await self._executor.gather(_fetch, urls)
+        return [data for data in fetched if data is not None]
+
+    async def join(
+        self, items: list[dict[str, Any]], relations: list[str]
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        refs = _join_refs(items, relations)
+        resolved = await resolve_async(self._client, refs, self._executor) if refs else {}
+        return _joined(items, relations, resolved), _join_meta(relations, refs)
+
+
+# expand=homeworld,species -> ["homeworld", "species"], checked against the resource's relations.
+def parse_expand(resource: str, expand: str | None) -> list[str]:
+    if not expand:
+        return []
+    relations = list(dict.fromkeys(part.strip() for part in expand.split(",") if part.strip()))
+    allowed = RELATIONS.get(resource, [])
+    invalid = [relation for relation in relations if relation not in allowed]
+    if invalid:
+        raise AppError(
+            "Invalid expand field",
+            status_code=400,
+            details={"expand": invalid, "allowed": allowed},
+        )
+    return relations
+
+
+# A projection has to keep the expanded relations, or there would be nothing left to join.
+def with_relations(fields: list[str] | None, relations: list[str]) -> list[str] | None:
+    if fields is None or not relations:
+        return fields
+    return list(dict.fromkeys([*fields, *relations]))
+
+
+# Every URL referenced by the page, deduplicated, so that items sharing a homeworld resolve it once.
+def _join_refs(items: list[dict[str, Any]], relations: list[str]) -> list[Ref]:
+    refs: dict[Ref, None] = {}
+    for item in items:
+        for relation in relations:
+            for url in _urls(item.get(relation)):
+                ref = url_ref(url)
+                if ref is not None:
+                    refs[ref] = None
+    return list(refs)
+
+
+def _joined(
+    items: list[dict[str, Any]],
+    relations: list[str],
+    resolved: dict[Ref, dict[str, Any] | AppError],
+) -> list[dict[str, Any]]:
+    thin: dict[Ref, dict[str, Any]] = {}
+    for ref, data in resolved.items():
+        if isinstance(data, AppError):
+            log_json("expand_failed", url=f"{ref[0]}:{ref[1]}", status=data.status_code)
+        else:
+            thin[ref] = _thin(data, ref[1])
+
+    # A ref that failed to resolve keeps its URL.
+    def _inline(url: Any) -> Any:
+        ref = url_ref(url)
+        return thin.get(ref, url) if ref is not None else url
+
+    joined = []
+    for item in items:
+        shaped = {**item}
+        for relation in relations:
+            value = item.get(relation)
+            if isinstance(value, list | tuple):
+                shaped[relation] = [_inline(url) for url in value]
+            elif value is not None:
+                shaped[relation] = _inline(value)
+        joined.append(shaped)
+    return joined
+
+
+def _thin(data: dict[str, Any], resource_id: int) -> dict[str, Any]:
+    thin: dict[str, Any] = {"id": resource_id}
+    for key in ("name", "title"):
+        if key in data:
+            thin[key] = data[key]
+    thin["url"] = data.get("url")
+    return thin
+
+
+def _urls(value: Any) -> list[Any]:
+    if isinstance(value, list | tuple):
+        return list(value)
+    return [value] if value is not None else []
+
+
+def _join_meta(relations: list[str], refs: list[Ref]) -> dict[str, Any]:
+    return {"relations": relations, "refs": len(refs)}
+
+
+def _expanded(data: dict[str, Any], project: Projector | None = None) -> dict[str, Any]:
+    if project is None:
+        return {**data, "id": url_id(data.get("url"))}
+    projected = project(data)
+    projected["id"] = url_id(data.get("url"))
+    return projected
@@ -0,0 +1,157 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from holonet.utils.cache import TTLCache
+from holonet.utils.etag import combine
+
+
+@dataclass(frozen=True, slots=True)
+class CachedGraph:
+    graph: dict[str, Any]
+    etag: str
+    fresh_until: float
+
+
+# Built graphs keyed by (start node, depth). A depth-N graph is also composable from the
+# depth-1 graph of its start node plus the depth-(N-1) graphs of that node's neighbours, so
+# when a graph is stored, the pieces a later composition needs are derived from it and stored
+# too. Only graphs that did not hit GRAPH_MAX_NODES are complete enough to compose from.
+# Each entry keeps a validator: derived and composed graphs take theirs from the graphs they
+# came from, so none is ever computed from graph content.
+class GraphCache:
+    def __init__(self, ttl_seconds: int, max_entries: int) -> None:
+        self._cache = TTLCache(ttl_seconds, max_entries)
+
+    def get(self, start_key: str, depth: int, max_nodes: int) -> dict[str, Any] | None:
+        found = self.get_cached(start_key, depth, max_nodes)
+        return found.graph if found is not None else None
+
+    # The graph together with its validator and the time its entry goes stale.
+    def get_cached(self, start_key: str, depth: int, max_nodes: int) -> CachedGraph | None:
+        key = _key(start_key, depth)
+        entry = self._cache.get_entry(key)
+        if entry is None or entry.is_stale(time.time()):
+            if depth < 2:
+                return None
+            composed = self._compose(start_key, depth, max_nodes)
+            if composed is None:
+                return None
+            graph, etag = composed
+            complete = len(graph["nodes"]) < max_nodes
+            self._cache.set(key, {"graph": graph, "complete": complete, "etag": etag})
+            entry = self._cache.get_entry(key)
+            if entry is None:
+                return None
+        return CachedGraph(entry.value["graph"], entry.value["etag"], entry.fresh_until)
+
+    def store(
+        self, start_key: str, depth: int, graph: dict[str, Any], max_nodes: int, etag: str = ""
+    ) -> None:
+        complete = len(graph["nodes"]) < max_nodes
+        self._cache.set(
+            _key(start_key, depth), {"graph": graph, "complete": complete, "etag": etag}
+        )
+        if not complete or depth < 2:
+            return
+        pieces = _Pieces()
+        pieces.add(start_key, depth, graph)
+        derived = [(start_key, d) for d in range(1, depth)]
+        derived += [(key, depth - 1) for key in pieces.neighbours(start_key)]
+        for key, sub_depth in derived:
+            subgraph = pieces.walk(key, sub_depth, max_nodes)
+            if subgraph is not None:
+                self._cache.set(
+                    _key(key, sub_depth),
+                    {
+                        "graph": subgraph,
+                        "complete": True,
+                        "etag": combine(etag, _key(key, sub_depth)),
+                    },
+                )
+
+    def stats(self) -> dict[str, Any]:
+        return self._cache.stats()
+
+    def _compose(
+        self, start_key: str, depth: int, max_nodes: int
+    ) -> tuple[dict[str, Any], str] | None:
+        head = self._cache.get(_key(start_key, 1))
+        if head is None or not head["complete"]:
+            return None
+        pieces = _Pieces()
+        pieces.add(start_key, 1, head["graph"])
+        etags = [head["etag"]]
+        for key in pieces.neighbours(start_key):
+            part = self._cache.get(_key(key, depth - 1))
+            if part is None or not part["complete"]:
+                return None
+            pieces.add(key, depth - 1, part["graph"])
+            etags.append(part["etag"])
+        graph = pieces.walk(start_key, depth, max_nodes)
+        if graph is None:
+            return None
+        return graph, combine(*etags)
+
+
+# Nodes and outgoing edges gathered from cached graphs. A node's edges are only known when
+# some graph expanded it, i.e. it sat closer to that graph's start than its depth.
+class _Pieces:
+    def __init__(self) -> None:
+        self.nodes: dict[str, dict[str, Any]] = {}
+        self.adjacency: dict[str, list[dict[str, Any]]] = {}
+
+    def add(self, start_key: str, depth: int, graph: dict[str, Any]) -> None:
+        for node in graph["nodes"]:
+            self.nodes.setdefault(node["id"], node)
+        outgoing: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for edge in graph["edges"]:
+            outgoing[edge["from"]].append(edge)
+        frontier = [start_key]
+        seen = {start_key}
+        for _ in range(depth):
+            next_frontier = []
+            for key in frontier:
+                self.adjacency.setdefault(key, outgoing.get(key, []))
+                for edge in outgoing.get(key, []):
+                    if edge["to"] not in seen:
+                        seen.add(edge["to"])
+                        next_frontier.append(edge["to"])
+            frontier = next_frontier
+
+    def neighbours(self, key: str) -> list[str]:
+        return list(dict.fromkeys(edge["to"] for edge in self.adjacency.get(key, [])))
+
+    # Mirrors the live walk exactly (level order, dedup on discovery, node cap), so a composed
+    # graph is identical to one built from scratch. None if a needed piece is missing.
+    def walk(self, start_key: str, depth: int, max_nodes: int) -> dict[str, Any] | None:
+        nodes: list[dict[str, Any]] = []
+        edges: list[dict[str, Any]] = []
+        seen = {start_key}
+        frontier = [start_key]
+        level = 0
+        while frontier:
+            batch = frontier[: max(0, max_nodes - len(nodes))]
+            frontier = []
+            for key in batch:
+                node = self.nodes.get(key)
+                if node is None:
+                    return None
+                nodes.append(node)
+                if level >= depth:
+                    continue
+                outgoing = self.adjacency.get(key)
+                if outgoing is None:
+                    return None
+                for edge in outgoing:
+                    edges.append(edge)
+                    if edge["to"] not in seen:
+                        seen.add(edge["to"])
+                        frontier.append(edge["to"])
+            level += 1
+        return {"nodes": nodes, "edges": edges}
+
+
+def _key(start_key: str, depth: int) -> str:
+    return f"graph:{start_key}:{depth}"
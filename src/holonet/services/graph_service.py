@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from collections import deque
+import time
 from typing import Any
 
-from holonet.clients.swapi_client import SwapiClient
+from holonet.clients.swapi_client import AsyncSwapiClient
 from holonet.config import settings
+from holonet.services.graph_cache import CachedGraph, GraphCache
+from holonet.services.relation_index import RelationIndex
+from holonet.utils.concurrency import BoundedExecutor, shared_executor
+from holonet.utils.refs import url_ref
 
 RELATIONS = {
     "people": ["films", "homeworld", "species", "starships", "vehicles"],
@@ -16,64 +20,199 @@ RELATIONS = {
 }
 
 
-class GraphService:
-    def __init__(self, client: SwapiClient) -> None:
+class AsyncGraphService:
+    def __init__(
+        self,
+        client: AsyncSwapiClient,
+        index: RelationIndex | None = None,
+        cache: GraphCache | None = None,
+        executor: BoundedExecutor | None = None,
+    ) -> None:
         self._client = client
+        self._index = index
+        self._cache = cache
+        self._executor = (
+            executor if executor is not None else shared_executor(settings.max_expand_concurrency)
+        )
+        self._cached: CachedGraph | None = None
+        self._keys: list[str] = []
+
+    async def build_graph(self, start_resource: str, start_id: int, depth: int) -> dict[str, Any]:
+        graph = await self._build(start_resource, start_id, depth)
+        self._keys = _surrogate_keys(graph)
+        return graph
+
+    async def _build(self, start_resource: str, start_id: int, depth: int) -> dict[str, Any]:
+        start_key = f"{start_resource}:{start_id}"
+        depth = _effective_depth(self._index, start_key, depth)
+        self._cached = _cached(self._cache, start_key, depth)
+        if self._cached is not None:
+            return self._cached.graph
+        planned = _plan_from_index(self._index, start_key, depth)
+        if planned is not None:
+            visited, edges = planned
+            missing = [key for key, data in visited if data is None]
+            labels = await self._executor.gather(
+                lambda key: self._client.get_resource(*_split_key(key)), missing
+            )
+            graph = _indexed_result(visited, edges, dict(zip(missing, labels, strict=True)))
+            return _store(self._cache, start_key, depth, graph, self._client)
+        walk = _Walk(min(depth, settings.graph_max_depth))
+        frontier = walk.start(start_resource, start_id)
+        while frontier:
+            batch = walk.admit(frontier)
+            fetched = await self._executor.gather(
+                lambda node: self._client.get_resource(*node), batch
+            )
+            frontier = walk.expand(batch, fetched)
+        return _store(self._cache, start_key, walk.max_depth, walk.result(), self._client)
+
+    def cache_meta(self) -> dict[str, Any]:
+        return _cache_meta(self._cached, self._client)
+
+    def validator(self) -> str:
+        return _validator(self._cached, self._client)
+
+    def freshness(self) -> tuple[int, int]:
+        return _freshness(self._cached, self._client)
+
+    def surrogate_keys(self) -> list[str]:
+        return self._keys
+
+
+# Breadth-first, one depth level at a time: each level's frontier is fetched concurrently.
+# Nodes are deduplicated when first discovered, so a frontier never repeats a node, and only as
+# many nodes as GRAPH_MAX_NODES still allows are ever fetched.
+class _Walk:
+    def __init__(self, max_depth: int) -> None:
+        self.max_depth = max_depth
+        self.depth = 0
+        self.nodes: dict[str, dict[str, Any]] = {}
+        self.edges: list[dict[str, Any]] = []
+        self.seen: set[str] = set()
+
+    def start(self, resource: str, resource_id: int) -> list[tuple[str, int]]:
+        self.seen.add(f"{resource}:{resource_id}")
+        return [(resource, resource_id)]
+
+    def admit(self, frontier: list[tuple[str, int]]) -> list[tuple[str, int]]:
+        return frontier[: max(0, settings.graph_max_nodes - len(self.nodes))]
+
+    def expand(
+        self, batch: list[tuple[str, int]], fetched: list[dict[str, Any]]
+    ) -> list[tuple[str, int]]:
+        frontier: list[tuple[str, int]] = []
+        for (resource, resource_id), data in zip(batch, fetched, strict=True):
+            node_key = f"{resource}:{resource_id}"
+            self.nodes[node_key] = _node(node_key, resource, data)
+            if self.depth < self.max_depth:
+                frontier.extend(self._link(node_key, resource, data))
+        self.depth += 1
+        return frontier
+
+    def result(self) -> dict[str, Any]:
+        return {"nodes": list(self.nodes.values()), "edges": self.edges}
+
+    def _link(self, node_key: str, resource: str, data: dict[str, Any]) -> list[tuple[str, int]]:
+        discovered = []
+        for key in RELATIONS.get(resource, []):
+            value = data.get(key)
+            if not value:
+                continue
+            urls = value if isinstance(value, list | tuple) else [value]
+            for url in urls:
+                ref = url_ref(url)
+                if ref is None:
+                    continue
+                rel_resource, rel_id = ref
+                rel_key = f"{rel_resource}:{rel_id}"
+                self.edges.append({"from": node_key, "to": rel_key, "type": key})
+                if rel_key not in self.seen:
+                    self.seen.add(rel_key)
+                    discovered.append((rel_resource, rel_id))
+        return discovered
 
-    def build_graph(self, start_resource: str, start_id: int, depth: int) -> dict[str, Any]:
-        max_depth = min(depth, settings.graph_max_depth)
-        nodes: dict[str, dict[str, Any]] = {}
-        edges: list[dict[str, Any]] = []
-        visited: set[str] = set()
 
-        queue: deque[tuple[str, int, int]] = deque()
-        queue.append((start_resource, start_id, 0))
+# With the relation index the whole neighbourhood is known in-process, so it may go deeper
+# than a live walk; only leaves the index has no record for are fetched, for their labels.
+def _effective_depth(index: RelationIndex | None, start_key: str, depth: int) -> int:
+    if index is not None and index.covers(start_key):
+        return min(depth, settings.graph_indexed_max_depth)
+    return min(depth, settings.graph_max_depth)
 
-        while queue and len(nodes) < settings.graph_max_nodes:
-            resource, resource_id, current_depth = queue.popleft()
-            node_key = f"{resource}:{resource_id}"
-            if node_key in visited:
-                continue
-            visited.add(node_key)
-
-            data = self._client.get_resource(resource, resource_id)
-            data["id"] = resource_id
-            nodes[node_key] = {
-                "id": node_key,
-                "resource": resource,
-                "label": data.get("name") or data.get("title") or node_key,
-                "raw": _thin(data),
-            }
-
-            if current_depth >= max_depth:
-                continue
 
-            for key in RELATIONS.get(resource, []):
-                value = data.get(key)
-                if not value:
-                    continue
-                urls = value if isinstance(value, list) else [value]
-                for url in urls:
-                    rel_resource, rel_id = _parse_url(url)
-                    if rel_resource and rel_id:
-                        edges.append(
-                            {"from": node_key, "to": f"{rel_resource}:{rel_id}", "type": key}
-                        )
-                        queue.append((rel_resource, rel_id, current_depth + 1))
-
-        return {"nodes": list(nodes.values()), "edges": edges}
-
-
-def _parse_url(url: str) -> tuple[str | None, int | None]:
-    parts = [p for p in url.split("/") if p]
-    if len(parts) < 2:
-        return None, None
-    resource = parts[-2]
-    try:
-        resource_id = int(parts[-1])
-    except ValueError:
-        return None, None
-    return resource, resource_id
+def _plan_from_index(
+    index: RelationIndex | None, start_key: str, depth: int
+) -> tuple[list[tuple[str, dict[str, Any] | None]], list[dict[str, Any]]] | None:
+    if index is None:
+        return None
+    return index.walk(start_key, depth, settings.graph_max_nodes)
+
+
+def _cached(cache: GraphCache | None, start_key: str, depth: int) -> CachedGraph | None:
+    if cache is None:
+        return None
+    return cache.get_cached(start_key, depth, settings.graph_max_nodes)
+
+
+# Stored under the depth actually walked: an index miss falls back to the shallower live walk.
+def _store(
+    cache: GraphCache | None, start_key: str, depth: int, graph: dict[str, Any], client: Any
+) -> dict[str, Any]:
+    if cache is not None:
+        cache.store(start_key, depth, graph, settings.graph_max_nodes, client.validator())
+    return graph
+
+
+# A graph served from the graph cache made no upstream lookups at all.
+def _cache_meta(cached: CachedGraph | None, client: Any) -> dict[str, Any]:
+    if cached is not None:
+        return {"hit": True, "ttl": settings.cache_ttl_seconds, "stale": False}
+    return client.cache_meta()
+
+
+def _validator(cached: CachedGraph | None, client: Any) -> str:
+    return cached.etag if cached is not None else client.validator()
+
+
+# Graph cache entries have no stale window: once stale they are rebuilt.
+def _freshness(cached: CachedGraph | None, client: Any) -> tuple[int, int]:
+    if cached is None:
+        return client.freshness()
+    return max(0, int(cached.fresh_until - time.time())), 0
+
+
+# Every node is an entity the graph includes, and node ids are already resource:id.
+def _surrogate_keys(graph: dict[str, Any]) -> list[str]:
+    keys = {node["id"] for node in graph["nodes"]}
+    keys |= {key.split(":", 1)[0] for key in keys}
+    return sorted(keys)
+
+
+def _indexed_result(
+    visited: list[tuple[str, dict[str, Any] | None]],
+    edges: list[dict[str, Any]],
+    fetched: dict[str, dict[str, Any]],
+) -> dict[str, Any]:
+    nodes = [
+        _node(key, _split_key(key)[0], data if data is not None else fetched[key])
+        for key, data in visited
+    ]
+    return {"nodes": nodes, "edges": edges}
+
+
+def _node(node_key: str, resource: str, data: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": node_key,
+        "resource": resource,
+        "label": data.get("name") or data.get("title") or node_key,
+        "raw": _thin(data),
+    }
+
+
+def _split_key(node_key: str) -> tuple[str, int]:
+    resource, _, resource_id = node_key.partition(":")
+    return resource, int(resource_id)
 
 
 def _thin(data: dict[str, Any]) -> dict[str, Any]:
@@ -0,0 +1,46 @@
+import asyncio
+
+from holonet.clients.mirror import RESOURCES, SwapiMirror
+from holonet.clients.swapi_client import AsyncSwapiClient
+from holonet.config import settings
+from holonet.errors import AppError
+from holonet.logging import log_json
+from holonet.services.paging import fetch_pages_async
+from holonet.services.relation_index import RelationIndex
+
+
+class MirrorService:
+    def __init__(
+        self,
+        client: AsyncSwapiClient,
+        mirror: SwapiMirror,
+        relations: RelationIndex | None = None,
+    ) -> None:
+        self._client = client
+        self._mirror = mirror
+        self._relations = relations
+
+    async def refresh(self) -> None:
+        for resource in RESOURCES:
+            try:
+                payloads = await fetch_pages_async(
+                    self._client, resource, None, settings.mirror_max_pages
+                )
+            except AppError as exc:
+                log_json("mirror_refresh_failed", resource=resource, status=exc.status_code)
+                continue
+            items = [item for payload in payloads for item in payload.get("results", [])]
+            count = payloads[0].get("count")
+            if isinstance(count, int) and count != len(items):
+                # A partial copy would answer searches wrongly; keep the previous one (or none).
+                log_json("mirror_incomplete", resource=resource, count=count, loaded=len(items))
+                continue
+            self._mirror.load(resource, items)
+            if self._relations is not None:
+                self._relations.update(resource, items)
+            log_json("mirror_loaded", resource=resource, items=len(items))
+
+    async def run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(settings.mirror_refresh_seconds)
@@ -0,0 +1,138 @@
+import asyncio
+import math
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable
+from typing import Any
+
+from holonet.clients.swapi_client import AsyncSwapiClient
+from holonet.config import settings
+from holonet.errors import AppError
+from holonet.utils.concurrency import BoundedExecutor, shared_executor
+from holonet.utils.pagination import PageSizeHint
+
+
+async def fetch_pages_async(
+    client: AsyncSwapiClient,
+    resource: str,
+    query: str | None,
+    max_pages: int,
+    wanted_items: int | None = None,
+) -> list[dict[str, Any]]:
+    payloads = [await client.search(resource, query, 1)]
+    last_page = plan_last_page(payloads[0], max_pages, wanted_items)
+    payloads.extend(
+        await _upstream().gather(
+            lambda page: client.search(resource, query, page), range(2, last_page + 1)
+        )
+    )
+    while _needs_more(payloads, max_pages, wanted_items):
+        payloads.append(await client.search(resource, query, len(payloads) + 1))
+    return payloads
+
+
+# Yields upstream pages in page order as they arrive, with at most MAX_UPSTREAM_CONCURRENCY
+# pages in flight, so memory stays bounded by that window however many pages there are. The
+# fetches themselves still queue on the process-wide upstream cap.
+async def iter_pages_async(
+    client: AsyncSwapiClient, resource: str, query: str | None, max_pages: int
+) -> AsyncIterator[dict[str, Any]]:
+    payload = await client.search(resource, query, 1)
+    yield payload
+    last_page = plan_last_page(payload, max_pages, None)
+    window = max(1, settings.max_upstream_concurrency)
+    upstream = _upstream()
+    pending: deque[asyncio.Future[dict[str, Any]]] = deque()
+    next_page = 2
+    try:
+        while pending or next_page <= last_page:
+            while next_page <= last_page and len(pending) < window:
+                fetch = upstream.call(lambda page: client.search(resource, query, page), next_page)
+                pending.append(asyncio.ensure_future(fetch))
+                next_page += 1
+            payload = await pending.popleft()
+            yield payload
+    finally:
+        for task in pending:
+            task.cancel()
+    fetched = last_page
+    while payload.get("next") is not None and fetched < max_pages:
+        fetched += 1
+        payload = await client.search(resource, query, fetched)
+        yield payload
+
+
+# Fetches only the upstream pages covering items [start, end), concurrently. Returns the
+# offset of the first returned item together with the payloads.
+async def fetch_window_async(
+    client: AsyncSwapiClient,
+    resource: str,
+    query: str | None,
+    start: int,
+    end: int,
+    max_pages: int,
+    page_sizes: PageSizeHint,
+) -> tuple[int, list[dict[str, Any]]]:
+    head = None
+    per_page = page_sizes.get(resource)
+    if per_page is None:
+        head = await client.search(resource, query, 1)
+        per_page = page_sizes.learn(resource, head)
+        if per_page is None:
+            return 0, [head]
+    first, last = window_pages(start, end, per_page, max_pages, head)
+    pages = range(first + 1 if head is not None and first == 1 else first, last + 1)
+    payloads = await _upstream().gather(
+        lambda page: _page_or_empty_async(client.search(resource, query, page)), pages
+    )
+    if head is not None and first == 1:
+        payloads.insert(0, head)
+    if not any("count" in payload for payload in payloads):
+        # The whole window lies past the end; page 1 still says how many items exist.
+        return 0, [head if head is not None else await client.search(resource, query, 1)]
+    return (first - 1) * per_page, payloads
+
+
+def window_pages(
+    start: int, end: int, per_page: int, max_pages: int, head: dict[str, Any] | None = None
+) -> tuple[int, int]:
+    first = start // per_page + 1
+    last = min((end - 1) // per_page + 1, max_pages)
+    count = head.get("count") if head is not None else None
+    if isinstance(count, int):
+        last = min(last, max(1, math.ceil(count / per_page)))
+    return first, last
+
+
+# Every SWAPI list fan-out, across all requests, shares one MAX_UPSTREAM_CONCURRENCY cap.
+def _upstream() -> BoundedExecutor:
+    return shared_executor(settings.max_upstream_concurrency, "upstream")
+
+
+async def _page_or_empty_async(fetch: Awaitable[dict[str, Any]]) -> dict[str, Any]:
+    try:
+        return await fetch
+    except AppError as exc:
+        if exc.status_code != 404:
+            raise
+        return {"results": [], "next": None}
+
+
+def plan_last_page(first: dict[str, Any], max_pages: int, wanted_items: int | None) -> int:
+    per_page = len(first.get("results", []))
+    count = first.get("count")
+    if first.get("next") is None or not per_page or not isinstance(count, int):
+        return 1
+    last_page = math.ceil(count / per_page)
+    if wanted_items is not None:
+        last_page = min(last_page, math.ceil(wanted_items / per_page))
+    return max(1, min(last_page, max_pages))
+
+
+# Covers upstreams without `count` and counts that drift between pages: keep following `next`
+# one page at a time once the planned fan-out is exhausted.
+def _needs_more(payloads: list[dict[str, Any]], max_pages: int, wanted_items: int | None) -> bool:
+    if payloads[-1].get("next") is None or len(payloads) >= max_pages:
+        return False
+    if wanted_items is None:
+        return True
+    return sum(len(payload.get("results", [])) for payload in payloads) < wanted_items
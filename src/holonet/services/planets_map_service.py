@@ -1,39 +1,43 @@
 from typing import Any
 
-from holonet.clients.swapi_client import SwapiClient
+from holonet.clients.swapi_client import AsyncSwapiClient
 from holonet.config import settings
+from holonet.services.paging import fetch_pages_async
+from holonet.utils.fields import Projector, compile_projector
+from holonet.utils.refs import url_id
 
 
-class PlanetsMapService:
-    def __init__(self, client: SwapiClient) -> None:
+class AsyncPlanetsMapService:
+    def __init__(self, client: AsyncSwapiClient) -> None:
         self._client = client
 
-    def planets_map(self, page_size: int) -> list[dict[str, Any]]:
+    async def planets_map(
+        self, page_size: int, fields: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        project = compile_projector(fields)
         planets: list[dict[str, Any]] = []
-        page = 1
-        fetched = 0
-        while fetched < settings.map_max_pages:
-            payload = self._client.search("planets", None, page)
-            results = payload.get("results", [])
-            for item in results:
-                item["id"] = _extract_id(item.get("url"))
-                planets.append(_to_map_item(item))
-            fetched += 1
-            page += 1
-            if payload.get("next") is None:
-                break
-            if len(planets) >= page_size:
-                break
+        payloads = await fetch_pages_async(
+            self._client, "planets", None, settings.map_max_pages, wanted_items=page_size
+        )
+        for payload in payloads:
+            _absorb(payload, planets, project)
         return planets[:page_size]
 
 
+def _absorb(
+    payload: dict[str, Any], planets: list[dict[str, Any]], project: Projector | None = None
+) -> None:
+    items = (_to_map_item(item) for item in payload.get("results", []))
+    planets.extend(items if project is None else map(project, items))
+
+
 def _to_map_item(item: dict[str, Any]) -> dict[str, Any]:
     population = item.get("population")
     terrain = item.get("terrain") or "unknown"
     climate = item.get("climate") or "unknown"
     category = _categorize(population, climate, terrain)
     return {
-        "id": item.get("id"),
+        "id": url_id(item.get("url")),
         "name": item.get("name"),
         "terrain": terrain,
         "climate": climate,
@@ -62,15 +66,3 @@ def _categorize(population: Any, climate: str, terrain: str) -> str:
     if "arid" in climate or "desert" in terrain:
         return "arid"
     return "frontier"
-
-
-def _extract_id(url: str | None) -> int | None:
-    if not url:
-        return None
-    parts = [p for p in url.split("/") if p]
-    if not parts:
-        return None
-    try:
-        return int(parts[-1])
-    except ValueError:
-        return None
@@ -0,0 +1,144 @@
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Any
+
+from holonet.utils.refs import url_ref
+
+
+@dataclass(frozen=True, slots=True)
+class _Packed:
+    keys: tuple[str, ...]
+    ids: dict[str, int]
+    data: tuple[dict[str, Any] | None, ...]
+    offsets: array
+    targets: array
+    types: array
+
+
+# Adjacency over every relation edge of the mirrored dataset, in CSR form: node `i`'s edges are
+# targets[offsets[i]:offsets[i + 1]], with relation names interned in `types`. Rows are kept
+# per resource, so a mirror refresh of one resource only replaces that resource's rows before
+# the arrays are repacked and swapped in.
+class RelationIndex:
+    def __init__(self, relations: dict[str, list[str]]) -> None:
+        self._relations = relations
+        self._type_names = sorted({name for names in relations.values() for name in names})
+        self._type_codes = {name: code for code, name in enumerate(self._type_names)}
+        self._lock = threading.Lock()
+        self._rows: dict[str, dict[str, tuple[dict[str, Any], list[tuple[int, str]]]]] = {}
+        self._packed = _pack({})
+
+    def update(self, resource: str, items: list[dict[str, Any]]) -> None:
+        rows = {}
+        for item in items:
+            key = _node_key(item.get("url"))
+            if key is not None:
+                rows[key] = (item, self._edges(resource, item))
+        with self._lock:
+            self._rows[resource] = rows
+            self._packed = _pack(self._rows)
+
+    def covers(self, key: str) -> bool:
+        packed = self._packed
+        node = packed.ids.get(key)
+        return node is not None and packed.data[node] is not None
+
+    # Same traversal as the live graph walk: level by level, nodes deduplicated on discovery
+    # and capped at `max_nodes`. Returns the visited (key, data) pairs, with data None for
+    # leaves the index has no record for, plus the edges. Returns None when the start node or
+    # any node that still had to be expanded is missing, since its edges are unknown.
+    def walk(
+        self, start_key: str, max_depth: int, max_nodes: int
+    ) -> tuple[list[tuple[str, dict[str, Any] | None]], list[dict[str, Any]]] | None:
+        packed = self._packed
+        start = packed.ids.get(start_key)
+        if start is None or packed.data[start] is None:
+            return None
+        visited: list[int] = []
+        edges: list[dict[str, Any]] = []
+        seen = {start}
+        frontier = [start]
+        depth = 0
+        while frontier:
+            batch = frontier[: max(0, max_nodes - len(visited))]
+            frontier = []
+            for node in batch:
+                visited.append(node)
+                if depth >= max_depth:
+                    continue
+                if packed.data[node] is None:
+                    return None
+                for edge in range(packed.offsets[node], packed.offsets[node + 1]):
+                    target = packed.targets[edge]
+                    edges.append(
+                        {
+                            "from": packed.keys[node],
+                            "to": packed.keys[target],
+                            "type": self._type_names[packed.types[edge]],
+                        }
+                    )
+                    if target not in seen:
+                        seen.add(target)
+                        frontier.append(target)
+            depth += 1
+        return [(packed.keys[node], packed.data[node]) for node in visited], edges
+
+    def stats(self) -> dict[str, int]:
+        packed = self._packed
+        return {"nodes": len(packed.keys), "edges": len(packed.targets)}
+
+    def _edges(self, resource: str, item: dict[str, Any]) -> list[tuple[int, str]]:
+        edges = []
+        for name in self._relations.get(resource, []):
+            value = item.get(name)
+            if not value:
+                continue
+            urls = value if isinstance(value, list | tuple) else [value]
+            for url in urls:
+                target = _node_key(url)
+                if target is not None:
+                    edges.append((self._type_codes[name], target))
+        return edges
+
+
+def _pack(rows: dict[str, dict[str, tuple[dict[str, Any], list[tuple[int, str]]]]]) -> _Packed:
+    keys: list[str] = []
+    ids: dict[str, int] = {}
+
+    def intern(key: str) -> int:
+        node = ids.get(key)
+        if node is None:
+            node = ids[key] = len(keys)
+            keys.append(key)
+        return node
+
+    for resource_rows in rows.values():
+        for key in resource_rows:
+            intern(key)
+    for resource_rows in rows.values():
+        for _, edges in resource_rows.values():
+            for _, target in edges:
+                intern(target)
+
+    data: list[dict[str, Any] | None] = [None] * len(keys)
+    adjacency: list[list[tuple[int, str]]] = [[] for _ in keys]
+    for resource_rows in rows.values():
+        for key, (item, edges) in resource_rows.items():
+            data[ids[key]] = item
+            adjacency[ids[key]] = edges
+
+    offsets = array("I", [0])
+    targets = array("I")
+    types = array("B")
+    for edges in adjacency:
+        for code, target in edges:
+            targets.append(ids[target])
+            types.append(code)
+        offsets.append(len(targets))
+    return _Packed(tuple(keys), ids, tuple(data), offsets, targets, types)
+
+
+def _node_key(url: str | None) -> str | None:
+    ref = url_ref(url)
+    return f"{ref[0]}:{ref[1]}" if ref is not None else None
@@ -0,0 +1,91 @@
+from typing import Any
+
+from holonet.clients.swapi_client import AsyncSwapiClient
+from holonet.errors import AppError
+from holonet.logging import log_json
+from holonet.schemas.resources import RelationQuery
+from holonet.services.batch_service import resolve_async
+from holonet.services.graph_service import RELATIONS
+from holonet.services.search_service import ALLOWED_SORT_FIELDS
+from holonet.utils.fields import compile_projector
+from holonet.utils.pagination import build_pagination
+from holonet.utils.refs import Ref, url_id, url_ref
+from holonet.utils.sorting import SortSpec, parse_sort, top_items
+
+
+class AsyncRelationService:
+    def __init__(self, client: AsyncSwapiClient) -> None:
+        self._client = client
+
+    async def related(
+        self, query: RelationQuery
+    ) -> tuple[dict[str, Any], list[dict[str, Any]], dict[str, Any]]:
+        _check_relation(query)
+        parent = await self._client.get_resource(query.resource, query.resource_id)
+        refs, spec, start, end = _plan(query, parent)
+        wanted = refs if spec else refs[start:end]
+        resolved = await resolve_async(self._client, wanted)
+        return _result(query, parent, refs, wanted, resolved, spec, start, end)
+
+
+def _check_relation(query: RelationQuery) -> None:
+    allowed = RELATIONS.get(query.resource, [])
+    if query.relation not in allowed:
+        raise AppError(
+            "Unknown relation",
+            status_code=404,
+            details={"relation": query.relation, "allowed": allowed},
+        )
+
+
+# Only the refs on the requested page are resolved, unless a sort needs all of them.
+def _plan(query: RelationQuery, parent: dict[str, Any]) -> tuple[list[Ref], SortSpec, int, int]:
+    value = parent.get(query.relation) or []
+    urls = value if isinstance(value, list | tuple) else [value]
+    refs = [ref for ref in map(url_ref, urls) if ref is not None]
+    spec = parse_sort(query.sort, query.order)
+    allowed = ALLOWED_SORT_FIELDS.get(refs[0][0], set()) if refs else set()
+    if refs and any(field not in allowed for field, _ in spec):
+        raise AppError(
+            "Invalid sort field",
+            status_code=400,
+            details={"sort": query.sort, "allowed": sorted(allowed)},
+        )
+    start = (query.page - 1) * query.page_size
+    if start >= len(refs) and refs:
+        raise AppError("Page out of range", status_code=404, details={"page": query.page})
+    return refs, spec, start, start + query.page_size
+
+
+def _result(
+    query: RelationQuery,
+    parent: dict[str, Any],
+    refs: list[Ref],
+    wanted: list[Ref],
+    resolved: dict[Ref, dict[str, Any] | AppError],
+    spec: SortSpec,
+    start: int,
+    end: int,
+) -> tuple[dict[str, Any], list[dict[str, Any]], dict[str, Any]]:
+    items = []
+    for ref in wanted:
+        data = resolved[ref]
+        if isinstance(data, AppError):
+            log_json("expand_failed", url=f"{ref[0]}:{ref[1]}", status=data.status_code)
+        else:
+            items.append(data)
+    if spec:
+        items = top_items(items, spec, end)[start:]
+    project = compile_projector(query.fields)
+    page = []
+    for item in items:
+        shaped = {**item} if project is None else project(item)
+        shaped["id"] = url_id(item.get("url"))
+        page.append(shaped)
+    summary = {
+        "resource": query.resource,
+        "id": query.resource_id,
+        "label": parent.get("name") or parent.get("title"),
+        "relation": query.relation,
+    }
+    return summary, page, build_pagination(query.page, query.page_size, len(refs))
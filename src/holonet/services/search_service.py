@@ -1,11 +1,28 @@
+from collections.abc import AsyncIterator, Callable
 from typing import Any
 
-from holonet.clients.swapi_client import SwapiClient
+from holonet.clients.mirror import SwapiMirror
+from holonet.clients.swapi_client import AsyncSwapiClient
 from holonet.config import settings
 from holonet.errors import AppError
 from holonet.schemas.search import SearchQuery
-from holonet.utils.pagination import build_pagination
-from holonet.utils.sorting import project_fields, safe_sort
+from holonet.services.paging import (
+    fetch_pages_async,
+    fetch_window_async,
+    iter_pages_async,
+)
+from holonet.utils.fields import compile_projector
+from holonet.utils.pagination import (
+    PageSizeHint,
+    build_pagination,
+    decode_cursor,
+    encode_cursor,
+)
+from holonet.utils.refs import url_id
+from holonet.utils.sorting import SortSpec, parse_sort, sort_items, top_items
+
+# Items per chunk when streaming a result set that is already complete in memory.
+_STREAM_CHUNK = 100
 
 ALLOWED_SORT_FIELDS = {
     "people": {
@@ -75,108 +92,209 @@ ALLOWED_SORT_FIELDS = {
 }
 
 
-class SearchService:
-    def __init__(self, client: SwapiClient) -> None:
+class AsyncSearchService:
+    def __init__(
+        self,
+        client: AsyncSwapiClient,
+        mirror: SwapiMirror | None = None,
+        page_sizes: PageSizeHint | None = None,
+    ) -> None:
         self._client = client
+        self._mirror = mirror
+        self._page_sizes = page_sizes if page_sizes is not None else PageSizeHint()
+
+    async def search(self, query: SearchQuery) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        spec = _sort_spec(query)
+        start, end = _window(query)
+        state = _from_mirror(self._mirror, query, spec)
+        if state is not None:
+            return _page_result(query, state, spec, start, end)
+        state = _SearchState(_retention(query, spec))
+        if spec:
+            # A sorted page needs every match: its first item may sit on the last upstream page.
+            payloads = await fetch_pages_async(
+                self._client, query.resource, query.q, settings.max_upstream_pages
+            )
+        else:
+            state.offset, payloads = await fetch_window_async(
+                self._client,
+                query.resource,
+                query.q,
+                start,
+                end,
+                settings.max_upstream_pages,
+                self._page_sizes,
+            )
+        for payload in payloads:
+            state.absorb(payload)
+        return _page_result(query, state, spec, start, end)
+
+    async def search_all(
+        self, query: SearchQuery, max_pages: int = 20
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        spec = _sort_spec(query)
+        state = _from_mirror(self._mirror, query, spec)
+        if state is not None:
+            return _all_result(query, state, spec)
+        state = _SearchState(_retention(query, spec))
+        for payload in await fetch_pages_async(self._client, query.resource, query.q, max_pages):
+            state.absorb(payload)
+        return _all_result(query, state, spec)
 
-    def search(
-        self, query: SearchQuery
-    ) -> tuple[list[dict[str, Any]], dict[str, Any], dict[str, Any]]:
-        page = query.page
-        page_size = query.page_size
-
-        start = (page - 1) * page_size
-        end = start + page_size
-
-        aggregated: list[dict[str, Any]] = []
-        total_items = 0
-        swapi_page = 1
-        fetched_pages = 0
-        cache_meta: dict[str, Any] = {"hit": False, "ttl": settings.cache_ttl_seconds}
-
-        while fetched_pages < settings.max_upstream_pages:
-            payload = self._client.search(query.resource, query.q, swapi_page)
-            cache_meta = payload.get("_cache", cache_meta)
-            total_items = payload.get("count", total_items)
-            results = payload.get("results", [])
-            for item in results:
-                item["id"] = _extract_id(item.get("url"))
-                aggregated.append(item)
-            fetched_pages += 1
-            swapi_page += 1
-            if payload.get("next") is None:
-                break
-            if len(aggregated) >= end:
-                break
-
-        if start >= len(aggregated) and total_items > 0:
-            raise AppError("Page out of range", status_code=404, details={"page": page})
-
-        items = aggregated[start:end]
-
-        if query.sort:
-            allowed = ALLOWED_SORT_FIELDS.get(query.resource, set())
-            if query.sort not in allowed:
-                raise AppError(
-                    "Invalid sort field",
-                    status_code=400,
-                    details={"sort": query.sort, "allowed": sorted(allowed)},
-                )
-            items = safe_sort(items, query.sort, query.order)
-
-        items = project_fields(items, query.fields)
-
-        pagination = build_pagination(page, page_size, total_items)
-        return items, pagination, cache_meta
-
-    def search_all(
+    # Same result set as search_all, as batches of finished items. Unsorted upstream results
+    # are passed on page by page as they arrive; a sort needs every match first. Validation
+    # and the first upstream page happen before returning, so their errors are not streamed.
+    async def stream_all(
         self, query: SearchQuery, max_pages: int = 20
-    ) -> tuple[list[dict[str, Any]], dict[str, Any], dict[str, Any]]:
-        aggregated: list[dict[str, Any]] = []
-        total_items = 0
-        swapi_page = 1
-        fetched_pages = 0
-        cache_meta: dict[str, Any] = {"hit": False, "ttl": settings.cache_ttl_seconds}
-
-        while fetched_pages < max_pages:
-            payload = self._client.search(query.resource, query.q, swapi_page)
-            cache_meta = payload.get("_cache", cache_meta)
-            total_items = payload.get("count", total_items)
-            results = payload.get("results", [])
-            for item in results:
-                item["id"] = _extract_id(item.get("url"))
-                aggregated.append(item)
-            fetched_pages += 1
-            swapi_page += 1
-            if payload.get("next") is None:
-                break
-
-        items = aggregated
-
-        if query.sort:
-            allowed = ALLOWED_SORT_FIELDS.get(query.resource, set())
-            if query.sort not in allowed:
-                raise AppError(
-                    "Invalid sort field",
-                    status_code=400,
-                    details={"sort": query.sort, "allowed": sorted(allowed)},
-                )
-            items = safe_sort(items, query.sort, query.order)
-
-        items = project_fields(items, query.fields)
-
-        page_size = max(len(items), 1)
-        pagination = build_pagination(1, page_size, total_items or len(items))
-        return items, pagination, cache_meta
-
-
-def _extract_id(url: str | None) -> int | None:
-    if not url:
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        spec = _sort_spec(query)
+        state = _from_mirror(self._mirror, query, spec)
+        if state is not None:
+            return _in_chunks(query, state.aggregated)
+        if spec:
+            state = _SearchState(_retention(query, spec))
+            for payload in await fetch_pages_async(
+                self._client, query.resource, query.q, max_pages
+            ):
+                state.absorb(payload)
+            return _in_chunks(query, sort_items(state.aggregated, spec))
+        pages = iter_pages_async(self._client, query.resource, query.q, max_pages)
+        return _by_page(query, await anext(pages), pages)
+
+
+class _SearchState:
+    def __init__(self, retain: Callable[[dict[str, Any]], dict[str, Any]] | None = None) -> None:
+        self._retain = retain
+        self.aggregated: list[dict[str, Any]] = []
+        self.total_items = 0
+        # Position of aggregated[0] in the full result set.
+        self.offset = 0
+        # Set when `aggregated` already comes in the requested sort order.
+        self.ordered = False
+
+    def absorb(self, payload: dict[str, Any]) -> None:
+        self.total_items = payload.get("count", self.total_items)
+        results = payload.get("results", [])
+        if self._retain is not None:
+            results = [self._retain(item) for item in results]
+        self.aggregated.extend(results)
+
+
+def _from_mirror(
+    mirror: SwapiMirror | None, query: SearchQuery, spec: SortSpec
+) -> _SearchState | None:
+    if mirror is None:
         return None
-    parts = [p for p in url.split("/") if p]
-    if not parts:
+    items = mirror.ordered(query.resource, query.q, spec)
+    if items is None:
         return None
+    state = _SearchState()
+    state.aggregated = items
+    state.total_items = len(items)
+    state.ordered = True
+    return state
+
+
+def _page_result(
+    query: SearchQuery, state: _SearchState, spec: SortSpec, start: int, end: int
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    page = start // query.page_size + 1
+    if start >= state.offset + len(state.aggregated) and state.total_items > 0:
+        raise AppError("Page out of range", status_code=404, details={"page": page})
+
+    if state.ordered or not spec:
+        window = state.aggregated[start - state.offset : end - state.offset]
+    else:
+        # Only the first `end` positions of the global order matter for this page.
+        window = top_items(state.aggregated, spec, end)[start:]
+    items = _finalize(query, window)
+    pagination = build_pagination(page, query.page_size, state.total_items)
+    if end < state.total_items:
+        pagination["next_cursor"] = encode_cursor(end, _cursor_scope(query))
+    return items, pagination
+
+
+def _all_result(
+    query: SearchQuery, state: _SearchState, spec: SortSpec
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    items = state.aggregated
+    if spec and not state.ordered:
+        items = sort_items(items, spec)
+    items = _finalize(query, items)
+    page_size = max(len(items), 1)
+    pagination = build_pagination(1, page_size, state.total_items or len(items))
+    return items, pagination
+
+
+async def _in_chunks(
+    query: SearchQuery, items: list[dict[str, Any]]
+) -> AsyncIterator[list[dict[str, Any]]]:
+    for index in range(0, len(items), _STREAM_CHUNK):
+        yield _finalize(query, items[index : index + _STREAM_CHUNK])
+
+
+async def _by_page(
+    query: SearchQuery, first: dict[str, Any], pages: AsyncIterator[dict[str, Any]]
+) -> AsyncIterator[list[dict[str, Any]]]:
     try:
-        return int(parts[-1])
-    except ValueError:
+        yield _finalize(query, first.get("results", []))
+        async for payload in pages:
+            yield _finalize(query, payload.get("results", []))
+    finally:
+        await pages.aclose()
+
+
+def _window(query: SearchQuery) -> tuple[int, int]:
+    if query.cursor:
+        start = decode_cursor(query.cursor, _cursor_scope(query))
+    else:
+        start = (query.page - 1) * query.page_size
+    return start, start + query.page_size
+
+
+def _cursor_scope(query: SearchQuery) -> list[Any]:
+    return [query.resource, query.q or "", query.sort or "", query.order]
+
+
+def _sort_spec(query: SearchQuery) -> SortSpec:
+    spec = parse_sort(query.sort, query.order)
+    allowed = ALLOWED_SORT_FIELDS.get(query.resource, set())
+    if any(field not in allowed for field, _ in spec):
+        raise AppError(
+            "Invalid sort field",
+            status_code=400,
+            details={"sort": query.sort, "allowed": sorted(allowed)},
+        )
+    return spec
+
+
+# With `fields=`, aggregated upstream items are cut down as each page lands to the requested
+# fields, the sort keys and the id, so whole SWAPI records are never held for the full scan.
+def _retention(
+    query: SearchQuery, spec: SortSpec
+) -> Callable[[dict[str, Any]], dict[str, Any]] | None:
+    project = compile_projector(query.fields and [*query.fields, *(field for field, _ in spec)])
+    if project is None:
         return None
+
+    def retain(item: dict[str, Any]) -> dict[str, Any]:
+        retained = project(item)
+        retained["id"] = url_id(item.get("url"))
+        return retained
+
+    return retain
+
+
+def _finalize(query: SearchQuery, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    project = compile_projector(query.fields)
+    if project is None:
+        # Upstream items are shared, read-only cache entries; ids go on new dicts, and only for
+        # the items actually returned.
+        return [{**item, "id": url_id(item.get("url"))} for item in items]
+    finished = []
+    for item in items:
+        projected = project(item)
+        if "id" not in item:
+            projected["id"] = url_id(item.get("url"))
+        finished.append(projected)
+    return finished
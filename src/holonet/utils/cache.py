@@ -1,77 +1,471 @@
+import heapq
 import json
 import threading
 import time
-from typing import Any, Protocol
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any, Protocol, TypeVar
+
+import anyio.to_thread
+
+from holonet.utils.frozen import freeze
+
+R = TypeVar("R")
+
+
+# Entries are fresh until `fresh_until` (the soft TTL) and may still be served, marked stale,
+# until `expires_at` (the hard TTL) while a refresh runs in the background. `etag` is the
+# payload's validator, computed once when it was stored; `upstream` holds the validators the
+# origin sent with it (ETag, Last-Modified), for conditional refreshes.
+@dataclass(frozen=True, slots=True)
+class CacheEntry:
+    value: Any
+    fresh_until: float
+    expires_at: float
+    etag: str | None = None
+    upstream: dict[str, str] | None = None
+
+    def is_stale(self, now: float) -> bool:
+        return now >= self.fresh_until
 
 
 class CacheBackend(Protocol):
     def get(self, key: str) -> Any | None: ...
 
-    def set(self, key: str, value: Any) -> None: ...
+    def get_entry(self, key: str) -> CacheEntry | None: ...
+
+    def get_entries(self, keys: list[str]) -> dict[str, CacheEntry]: ...
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        etag: str | None = None,
+        upstream: dict[str, str] | None = None,
+    ) -> None: ...
+
+    # Restarts an entry's soft and hard TTLs in place, as if it had just been stored again.
+    def touch(self, key: str) -> tuple[float, float] | None: ...
 
     def clear(self) -> None: ...
 
+    def stats(self) -> dict[str, Any]: ...
+
+    # Counterparts for code running on the event loop, which must not wait on network I/O.
+    async def get_entry_async(self, key: str) -> CacheEntry | None: ...
+
+    async def get_entries_async(self, keys: list[str]) -> dict[str, CacheEntry]: ...
+
+    async def set_async(
+        self,
+        key: str,
+        value: Any,
+        etag: str | None = None,
+        upstream: dict[str, str] | None = None,
+    ) -> None: ...
+
+    async def touch_async(self, key: str) -> tuple[float, float] | None: ...
+
+
+class _HitCounter:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# The *_async methods run the sync ones through _call: inline for in-process backends, on a
+# worker thread for backends that block on the network.
+class _AsyncAccess:
+    async def get_entry_async(self, key: str) -> CacheEntry | None:
+        return await self._call(self.get_entry, key)
+
+    async def get_entries_async(self, keys: list[str]) -> dict[str, CacheEntry]:
+        return await self._call(self.get_entries, keys)
 
-class TTLCache:
-    def __init__(self, ttl_seconds: int, max_entries: int) -> None:
+    async def set_async(
+        self,
+        key: str,
+        value: Any,
+        etag: str | None = None,
+        upstream: dict[str, str] | None = None,
+    ) -> Any:
+        return await self._call(self.set, key, value, etag, upstream)
+
+    async def touch_async(self, key: str) -> tuple[float, float] | None:
+        return await self._call(self.touch, key)
+
+    async def _call(self, fn: Callable[..., R], *args: Any) -> R:
+        return fn(*args)
+
+
+class TTLCache(_HitCounter, _AsyncAccess):
+    # Entries live in an OrderedDict kept in LRU order, with a min-heap of expiry times on the
+    # side. Every operation is amortised O(1): lookups never scan, a full cache evicts the LRU
+    # head, and each write sweeps a bounded number of expired heap entries. An entry is evicted
+    # at its hard deadline, or earlier if it was stored with its own eviction time (an L1 copy).
+    _SWEEP_BUDGET = 16
+
+    def __init__(self, ttl_seconds: int, max_entries: int, stale_ttl_seconds: int = 0) -> None:
+        super().__init__()
         self._ttl_seconds = ttl_seconds
+        self._stale_ttl_seconds = stale_ttl_seconds
         self._max_entries = max_entries
         self._lock = threading.Lock()
-        self._data: dict[str, tuple[float, Any]] = {}
+        self._data: OrderedDict[str, tuple[CacheEntry, float]] = OrderedDict()
+        self._expiry: list[tuple[float, str]] = []
 
     def get(self, key: str) -> Any | None:
+        entry = self.get_entry(key)
+        if entry is None or entry.is_stale(time.time()):
+            return None
+        return entry.value
+
+    def get_entry(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            return self._get(key, time.time())
+
+    def get_entries(self, keys: list[str]) -> dict[str, CacheEntry]:
         now = time.time()
+        found = {}
         with self._lock:
-            if key not in self._data:
-                return None
-            expires_at, value = self._data[key]
-            if expires_at < now:
-                del self._data[key]
-                return None
-            return value
+            for key in keys:
+                entry = self._get(key, now)
+                if entry is not None:
+                    found[key] = entry
+        return found
 
-    def set(self, key: str, value: Any) -> None:
+    def set(
+        self,
+        key: str,
+        value: Any,
+        etag: str | None = None,
+        upstream: dict[str, str] | None = None,
+    ) -> None:
         now = time.time()
-        expires_at = now + self._ttl_seconds
+        self.set_entry(
+            key,
+            CacheEntry(
+                freeze(value),
+                now + self._ttl_seconds,
+                now + self._ttl_seconds + self._stale_ttl_seconds,
+                etag,
+                upstream,
+            ),
+        )
+
+    def touch(self, key: str) -> tuple[float, float] | None:
+        now = time.time()
+        fresh_until = now + self._ttl_seconds
+        expires_at = fresh_until + self._stale_ttl_seconds
+        if not self.restamp(key, fresh_until, expires_at):
+            return None
+        return fresh_until, expires_at
+
+    # Same value, new deadlines; False if the key is gone.
+    def restamp(
+        self, key: str, fresh_until: float, expires_at: float, evict_at: float | None = None
+    ) -> bool:
         with self._lock:
-            if len(self._data) >= self._max_entries:
-                oldest_key = min(self._data, key=lambda k: self._data[k][0])
-                del self._data[oldest_key]
-            self._data[key] = (expires_at, value)
+            item = self._data.get(key)
+            if item is None:
+                return False
+            entry = replace(item[0], fresh_until=fresh_until, expires_at=expires_at)
+            evict_at = expires_at if evict_at is None else min(evict_at, expires_at)
+            self._data[key] = (entry, evict_at)
+            heapq.heappush(self._expiry, (evict_at, key))
+            return True
+
+    def set_entry(self, key: str, entry: CacheEntry, evict_at: float | None = None) -> None:
+        now = time.time()
+        evict_at = entry.expires_at if evict_at is None else min(evict_at, entry.expires_at)
+        with self._lock:
+            self._sweep(now)
+            if key in self._data:
+                self._data.move_to_end(key)
+            elif len(self._data) >= self._max_entries:
+                self._data.popitem(last=False)
+            self._data[key] = (entry, evict_at)
+            heapq.heappush(self._expiry, (evict_at, key))
+            # Overwrites and LRU evictions leave dead heap entries behind; rebuild once they
+            # outnumber live ones so the heap stays proportional to the cache.
+            if len(self._expiry) > 2 * len(self._data) + self._SWEEP_BUDGET:
+                self._expiry = [(at, k) for k, (_entry, at) in self._data.items()]
+                heapq.heapify(self._expiry)
 
     def clear(self) -> None:
         with self._lock:
             self._data.clear()
+            self._expiry.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _get(self, key: str, now: float) -> CacheEntry | None:
+        item = self._data.get(key)
+        if item is not None and item[1] < now:
+            del self._data[key]
+            item = None
+        self.record(item is not None)
+        if item is None:
+            return None
+        self._data.move_to_end(key)
+        return item[0]
+
+    def _sweep(self, now: float) -> None:
+        for _ in range(self._SWEEP_BUDGET):
+            if not self._expiry or self._expiry[0][0] >= now:
+                return
+            evict_at, key = heapq.heappop(self._expiry)
+            item = self._data.get(key)
+            if item is not None and item[1] == evict_at:
+                del self._data[key]
+
+
+# Each entry's deadlines live under a companion key next to the payload: set() writes both in
+# one MULTI, reads fetch both in one MGET, and touch() restamps the deadlines and the payload's
+# TTL in one script without reading or rewriting the payload.
+# Keys carry a format version, so instances writing an older value format (plain JSON payloads)
+# and newer ones can share a Redis during a rolling deploy without reading each other's values.
+_KEY_VERSION = "v2"
+_TOUCH_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+    return 0
+end
+redis.call("SET", KEYS[2], ARGV[1], "EX", ARGV[2])
+redis.call("EXPIRE", KEYS[1], ARGV[2])
+return 1
+"""
 
 
-class RedisCache:
-    def __init__(self, redis_url: str, ttl_seconds: int) -> None:
+class RedisCache(_HitCounter, _AsyncAccess):
+    def __init__(self, redis_url: str, ttl_seconds: int, stale_ttl_seconds: int = 0) -> None:
         try:
             import redis  # type: ignore
         except ImportError as exc:
             raise RuntimeError("redis package not installed") from exc
+        super().__init__()
         self._ttl_seconds = ttl_seconds
+        self._stale_ttl_seconds = stale_ttl_seconds
         self._client = redis.Redis.from_url(redis_url, decode_responses=True)
+        self._touch = self._client.register_script(_TOUCH_SCRIPT)
 
     def get(self, key: str) -> Any | None:
-        raw = self._client.get(key)
-        if raw is None:
+        entry = self.get_entry(key)
+        if entry is None or entry.is_stale(time.time()):
             return None
-        return json.loads(raw)
+        return entry.value
 
-    def set(self, key: str, value: Any) -> None:
-        payload = json.dumps(value)
-        self._client.setex(key, self._ttl_seconds, payload)
+    def get_entry(self, key: str) -> CacheEntry | None:
+        return self.get_entries([key]).get(key)
+
+    # One MGET round trip for the whole batch, deadlines included.
+    def get_entries(self, keys: list[str]) -> dict[str, CacheEntry]:
+        if not keys:
+            return {}
+        raws = self._client.mget([*map(_value_key, keys), *map(_deadlines_key, keys)])
+        found = {}
+        for key, raw, deadlines in zip(keys, raws[: len(keys)], raws[len(keys) :], strict=True):
+            entry = _decode(raw, deadlines) if raw is not None else None
+            self.record(entry is not None)
+            if entry is not None:
+                found[key] = entry
+        return found
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        etag: str | None = None,
+        upstream: dict[str, str] | None = None,
+    ) -> CacheEntry:
+        now = time.time()
+        hard_ttl = self._ttl_seconds + self._stale_ttl_seconds
+        entry = CacheEntry(freeze(value), now + self._ttl_seconds, now + hard_ttl, etag, upstream)
+        pipe = self._client.pipeline(transaction=True)
+        pipe.setex(_value_key(key), hard_ttl, f"{_encode_meta(entry)}\n{json.dumps(value)}")
+        pipe.setex(_deadlines_key(key), hard_ttl, _encode_deadlines(entry))
+        pipe.execute()
+        return entry
+
+    def touch(self, key: str) -> tuple[float, float] | None:
+        now = time.time()
+        hard_ttl = self._ttl_seconds + self._stale_ttl_seconds
+        entry = CacheEntry(None, now + self._ttl_seconds, now + hard_ttl)
+        args = [_encode_deadlines(entry), hard_ttl]
+        if not self._touch(keys=[_value_key(key), _deadlines_key(key)], args=args):
+            return None
+        return entry.fresh_until, entry.expires_at
 
     def clear(self) -> None:
         self._client.flushdb()
 
+    async def _call(self, fn: Callable[..., R], *args: Any) -> R:
+        return await anyio.to_thread.run_sync(fn, *args)
+
+
+# A small in-process L1 in front of Redis (L2): repeated lookups skip the network round trip
+# and the JSON decode. L1 copies keep the L2 entry's soft and hard deadlines, which is what
+# staleness and Cache-Control are derived from, but are evicted after l1_ttl_seconds at most.
+class TieredCache:
+    def __init__(self, l1: TTLCache, l2: RedisCache, l1_ttl_seconds: int) -> None:
+        self._l1 = l1
+        self._l2 = l2
+        self._l1_ttl_seconds = l1_ttl_seconds
+
+    def get(self, key: str) -> Any | None:
+        entry = self.get_entry(key)
+        if entry is None or entry.is_stale(time.time()):
+            return None
+        return entry.value
+
+    def get_entry(self, key: str) -> CacheEntry | None:
+        entry = self._l1.get_entry(key)
+        if entry is not None:
+            return entry
+        entry = self._l2.get_entry(key)
+        if entry is not None:
+            self._promote(key, entry)
+        return entry
+
+    def get_entries(self, keys: list[str]) -> dict[str, CacheEntry]:
+        found = self._l1.get_entries(keys)
+        fetched = self._l2.get_entries([key for key in keys if key not in found])
+        for key, entry in fetched.items():
+            self._promote(key, entry)
+        return found | fetched
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        etag: str | None = None,
+        upstream: dict[str, str] | None = None,
+    ) -> None:
+        self._promote(key, self._l2.set(key, value, etag, upstream))
+
+    def touch(self, key: str) -> tuple[float, float] | None:
+        deadlines = self._l2.touch(key)
+        if deadlines is not None:
+            self._l1.restamp(key, *deadlines, time.time() + self._l1_ttl_seconds)
+        return deadlines
+
+    async def get_entry_async(self, key: str) -> CacheEntry | None:
+        entry = self._l1.get_entry(key)
+        if entry is not None:
+            return entry
+        entry = await self._l2.get_entry_async(key)
+        if entry is not None:
+            self._promote(key, entry)
+        return entry
+
+    async def get_entries_async(self, keys: list[str]) -> dict[str, CacheEntry]:
+        found = self._l1.get_entries(keys)
+        missing = [key for key in keys if key not in found]
+        fetched = await self._l2.get_entries_async(missing) if missing else {}
+        for key, entry in fetched.items():
+            self._promote(key, entry)
+        return found | fetched
+
+    async def set_async(
+        self,
+        key: str,
+        value: Any,
+        etag: str | None = None,
+        upstream: dict[str, str] | None = None,
+    ) -> None:
+        self._promote(key, await self._l2.set_async(key, value, etag, upstream))
+
+    async def touch_async(self, key: str) -> tuple[float, float] | None:
+        deadlines = await self._l2.touch_async(key)
+        if deadlines is not None:
+            self._l1.restamp(key, *deadlines, time.time() + self._l1_ttl_seconds)
+        return deadlines
+
+    def clear(self) -> None:
+        self._l1.clear()
+        self._l2.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {"l1": self._l1.stats(), "l2": self._l2.stats()}
+
+    def _promote(self, key: str, entry: CacheEntry) -> None:
+        self._l1.set_entry(key, entry, time.time() + self._l1_ttl_seconds)
+
+
+# Stored as a metadata line followed by the payload. The deadlines key, when present, overrides
+# the deadlines in the metadata line, which only record those of the original write.
+def _encode_meta(entry: CacheEntry) -> str:
+    return json.dumps(
+        {
+            "fresh_until": entry.fresh_until,
+            "expires_at": entry.expires_at,
+            "etag": entry.etag,
+            "upstream": entry.upstream,
+        }
+    )
+
+
+def _value_key(key: str) -> str:
+    return f"{_KEY_VERSION}:{key}"
+
+
+def _deadlines_key(key: str) -> str:
+    return f"{_KEY_VERSION}:{key}:deadlines"
+
+
+def _encode_deadlines(entry: CacheEntry) -> str:
+    return json.dumps([entry.fresh_until, entry.expires_at])
+
+
+# A value that does not decode (truncated, or written in another format) reads as a miss.
+def _decode(raw: str, deadlines: str | None = None) -> CacheEntry | None:
+    meta, _, body = raw.partition("\n")
+    try:
+        stored = json.loads(meta)
+        value = json.loads(body)
+        fresh_until, expires_at = (
+            json.loads(deadlines) if deadlines else (stored["fresh_until"], stored["expires_at"])
+        )
+    except (ValueError, KeyError, TypeError):
+        return None
+    return CacheEntry(
+        freeze(value),
+        fresh_until,
+        expires_at,
+        stored.get("etag"),
+        stored.get("upstream"),
+    )
+
 
 def build_cache(
-    ttl_seconds: int, max_entries: int, backend: str, redis_url: str | None
+    ttl_seconds: int,
+    max_entries: int,
+    backend: str,
+    redis_url: str | None,
+    stale_ttl_seconds: int = 0,
+    l1_ttl_seconds: int = 0,
+    l1_max_entries: int = 0,
 ) -> CacheBackend:
     if backend == "redis":
         if not redis_url:
             raise RuntimeError("REDIS_URL is required for redis cache backend")
-        return RedisCache(redis_url, ttl_seconds)
-    return TTLCache(ttl_seconds, max_entries)
+        redis_cache = RedisCache(redis_url, ttl_seconds, stale_ttl_seconds)
+        if l1_ttl_seconds <= 0 or l1_max_entries <= 0:
+            return redis_cache
+        return TieredCache(TTLCache(l1_ttl_seconds, l1_max_entries), redis_cache, l1_ttl_seconds)
+    return TTLCache(ttl_seconds, max_entries, stale_ttl_seconds)
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+import weakref
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+# One process-wide cap shared by every request: work waits on a per-event-loop semaphore of
+# `limit` slots. Results always come back in input order. Time spent queued for a slot is tracked apart from
+# time spent running, so saturation shows up as queue wait rather than as slow fetches.
+class BoundedExecutor:
+    def __init__(self, limit: int, name: str = "expand") -> None:
+        self.limit = max(1, limit)
+        self.name = name
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._tasks = 0
+        self._queued = 0
+        self._running = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    async def gather(self, func: Callable[[T], Awaitable[R]], items: Iterable[T]) -> list[R]:
+        return list(await asyncio.gather(*(self.call(func, item) for item in items)))
+
+    async def call(self, func: Callable[[T], Awaitable[R]], item: T) -> R:
+        semaphore = self._semaphore()
+        queued_at = self._enqueue()
+        async with semaphore:
+            started = self._start(queued_at)
+            try:
+                return await func(item)
+            finally:
+                self._finish(started)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            done = max(self._tasks, 1)
+            return {
+                "limit": self.limit,
+                "tasks": self._tasks,
+                "queued": self._queued,
+                "running": self._running,
+                "queue_wait_ms_avg": round(self._wait_seconds / done * 1000, 3),
+                "queue_wait_ms_max": round(self._max_wait_seconds * 1000, 3),
+                "run_ms_avg": round(self._run_seconds / done * 1000, 3),
+            }
+
+    def _enqueue(self) -> float:
+        with self._lock:
+            self._queued += 1
+        return time.perf_counter()
+
+    def _start(self, queued_at: float) -> float:
+        started = time.perf_counter()
+        waited = started - queued_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._tasks += 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        return started
+
+    def _finish(self, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._running -= 1
+            self._run_seconds += elapsed
+
+    # asyncio primitives belong to one event loop; each loop gets its own semaphore.
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+            return semaphore
+
+
+# One executor per name ("expand" for relation fetches, "upstream" for SWAPI list pages); the
+# limit only applies when the named executor is first created.
+_shared: dict[str, BoundedExecutor] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_executor(limit: int, name: str = "expand") -> BoundedExecutor:
+    with _shared_lock:
+        executor = _shared.get(name)
+        if executor is None:
+            executor = _shared[name] = BoundedExecutor(limit, name)
+        return executor
@@ -0,0 +1,31 @@
+import hashlib
+from typing import Any
+
+import orjson
+
+
+# Strong validators are short digests. A payload is digested once, from bytes already at hand
+# (the upstream body, a loaded snapshot), and a response's validator is combined from those
+# digests instead of being computed from the payloads they stand for.
+def digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def combine(*parts: str) -> str:
+    return digest("\0".join(parts).encode())
+
+
+# For cache entries written before validators were stored with them.
+def payload_etag(value: Any) -> str:
+    return digest(orjson.dumps(value))
+
+
+# If-None-Match holds "*" or a comma-separated list of entity tags; weak comparison applies,
+# so a W/ prefix sent back by an intermediary still matches.
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
@@ -1,5 +1,33 @@
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from typing import Any
+
+
 def parse_fields(value: str | None) -> list[str] | None:
     if not value:
         return None
     fields = [field.strip() for field in value.split(",") if field.strip()]
     return fields or None
+
+
+# A sparse fieldset, resolved once per distinct field list: `id` is always kept, duplicates are
+# dropped, and applying it is a single pass over the requested keys.
+class Projector:
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: Sequence[str]) -> None:
+        self.fields = tuple(dict.fromkeys([*fields, "id"]))
+
+    def __call__(self, item: Mapping[str, Any]) -> dict[str, Any]:
+        return {field: item[field] for field in self.fields if field in item}
+
+
+def compile_projector(fields: Sequence[str] | None) -> Projector | None:
+    if not fields:
+        return None
+    return _compiled(tuple(fields))
+
+
+@lru_cache(maxsize=256)
+def _compiled(fields: tuple[str, ...]) -> Projector:
+    return Projector(fields)
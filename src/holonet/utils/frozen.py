@@ -0,0 +1,27 @@
+from typing import Any
+
+
+# Cached SWAPI payloads are shared by every request that reads them, so they are stored
+# read-only: mutation raises instead of racing with other readers, and nobody needs to copy
+# defensively. Being a dict subclass, it serializes like the payload it replaces.
+class FrozenDict(dict):
+    __slots__ = ()
+
+    def _readonly(self, *_args: Any, **_kwargs: Any) -> None:
+        raise TypeError("cached payloads are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, FrozenDict):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list | tuple):
+        return tuple(freeze(item) for item in value)
+    return value
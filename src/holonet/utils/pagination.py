@@ -1,7 +1,13 @@
+import base64
+import binascii
+import json
 import math
+from typing import Any
 
+from holonet.errors import AppError
 
-def build_pagination(page: int, page_size: int, total_items: int) -> dict[str, int | bool]:
+
+def build_pagination(page: int, page_size: int, total_items: int) -> dict[str, Any]:
     total_pages = max(1, math.ceil(total_items / page_size)) if page_size > 0 else 1
     return {
         "page": page,
@@ -10,4 +16,41 @@ def build_pagination(page: int, page_size: int, total_items: int) -> dict[str, i
         "total_pages": total_pages,
         "has_next": page < total_pages,
         "has_prev": page > 1,
+        "next_cursor": None,
     }
+
+
+# SWAPI pages have a fixed size per resource; it is learnt from the first page seen with a
+# `next` link and then used to address pages by offset.
+class PageSizeHint:
+    def __init__(self) -> None:
+        self._sizes: dict[str, int] = {}
+
+    def get(self, resource: str) -> int | None:
+        return self._sizes.get(resource)
+
+    def learn(self, resource: str, payload: dict[str, Any]) -> int | None:
+        results = payload.get("results") or []
+        if payload.get("next") is not None and results:
+            self._sizes[resource] = len(results)
+        return self._sizes.get(resource)
+
+
+# Cursors are opaque to clients: base64url JSON holding the next offset plus the query scope it
+# belongs to, so a cursor replayed against a different query is rejected.
+def encode_cursor(offset: int, scope: list[Any]) -> str:
+    raw = json.dumps({"offset": offset, "scope": scope}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: list[Any]) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        offset = state["offset"]
+        valid = isinstance(offset, int) and offset >= 0 and state["scope"] == scope
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        valid = False
+    if not valid:
+        raise AppError("Invalid cursor", status_code=400, details={"cursor": cursor})
+    return offset
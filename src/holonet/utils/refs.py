@@ -0,0 +1,19 @@
+from typing import Any
+
+Ref = tuple[str, int]
+
+
+# "https://swapi.dev/api/people/1/" -> ("people", 1); anything else maps to None. Only ASCII
+# digits make an id: int() would also take "١" or " 1", which SWAPI never sends.
+def url_ref(url: Any) -> Ref | None:
+    if not isinstance(url, str):
+        return None
+    parts = [p for p in url.split("/") if p]
+    if len(parts) < 2 or not (parts[-1].isascii() and parts[-1].isdecimal()):
+        return None
+    return parts[-2], int(parts[-1])
+
+
+def url_id(url: Any) -> int | None:
+    ref = url_ref(url)
+    return ref[1] if ref is not None else None
@@ -0,0 +1,89 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+R = TypeVar("R")
+
+
+class _AsyncCall:
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.event = asyncio.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class _Counters:
+    def __init__(self) -> None:
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "timeouts": self.timeouts}
+
+
+# The first caller for a key runs `fn`; callers arriving while it is in flight wait for its
+# result instead of repeating the upstream call. A follower that waits longer than
+# `timeout_seconds` gives up on the leader and runs `fn` itself.
+class AsyncSingleFlight(_Counters):
+    def __init__(self, timeout_seconds: float) -> None:
+        super().__init__()
+        self._timeout_seconds = timeout_seconds
+        self._calls: dict[str, _AsyncCall] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[R]]) -> R:
+        loop = asyncio.get_running_loop()
+        call = self._calls.get(key)
+        if call is not None and call.loop is not loop:
+            # Entrypoints that run one event loop per invocation cannot share waiters across
+            # loops; fetch independently instead.
+            return await fn()
+
+        if call is None:
+            call = self._calls[key] = _AsyncCall(loop)
+            self.leaders += 1
+            return await self._lead(key, call, fn)
+
+        self.coalesced += 1
+        try:
+            await asyncio.wait_for(call.event.wait(), self._timeout_seconds)
+        except TimeoutError:
+            self.timeouts += 1
+            return await fn()
+        if isinstance(call.error, asyncio.CancelledError):
+            # The leader's request was cancelled, not failed; this caller still wants an answer.
+            return await fn()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def spawn(self, key: str, fn: Callable[[], Awaitable[Any]]) -> bool:
+        if key in self._calls:
+            return False
+        loop = asyncio.get_running_loop()
+        call = self._calls[key] = _AsyncCall(loop)
+        self.leaders += 1
+        task = loop.create_task(self._lead(key, call, fn))
+        self._tasks.add(task)
+        task.add_done_callback(self._reap)
+        return True
+
+    def _reap(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled():
+            # Waiters already received the error; mark it retrieved so asyncio does not warn.
+            task.exception()
+
+    async def _lead(self, key: str, call: _AsyncCall, fn: Callable[[], Awaitable[R]]) -> R:
+        try:
+            call.result = await fn()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            call.event.set()
@@ -1,25 +1,151 @@
+import heapq
+import re
+import threading
+from collections.abc import Sequence
+from datetime import datetime
 from typing import Any
 
+from holonet.utils.fields import compile_projector
+
+SortSpec = list[tuple[str, bool]]
+
+# SWAPI spells "no value" several ways; all of them sort after real values in either direction.
+_MISSING = {"", "unknown", "n/a", "none", "indefinite"}
+_NUMBER = re.compile(r"-?\d+(\.\d+)?")
+_ERA = re.compile(r"(\d+(\.\d+)?)(BBY|ABY)", re.IGNORECASE)
+_ORDER_CACHE_LIMIT = 64
+
+
+def parse_sort(sort: str | None, order: str) -> SortSpec:
+    if not sort:
+        return []
+    default_desc = order.lower() == "desc"
+    spec = []
+    for part in sort.split(","):
+        field = part.strip()
+        descending = default_desc
+        if field[:1] in ("-", "+"):
+            descending = field[0] == "-"
+            field = field[1:].strip()
+        if field:
+            spec.append((field, descending))
+    return spec
+
+
+# Numbers (including "1,358" and "19BBY"), then ISO dates, then case-insensitive text. None
+# means the value is missing.
+def sort_value(value: Any) -> tuple[int, Any] | None:
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int | float):
+        return (0, value)
+    text = str(value).strip()
+    if text.casefold() in _MISSING:
+        return None
+    number = text.replace(",", "")
+    if _NUMBER.fullmatch(number):
+        return (0, float(number))
+    era = _ERA.fullmatch(number)
+    if era:
+        years = float(era.group(1))
+        return (0, -years if era.group(3).upper() == "BBY" else years)
+    if text[:1].isdigit():
+        try:
+            return (1, datetime.fromisoformat(text).timestamp())
+        except ValueError:
+            pass
+    return (2, text.casefold())
+
+
+def sort_items(items: Sequence[dict], spec: SortSpec) -> list[dict]:
+    directions = [descending for _, descending in spec]
+    return sorted(
+        items,
+        key=lambda item: _SortKey([sort_value(item.get(f)) for f, _ in spec], directions),
+    )
+
+
+# The first `k` items of `sort_items(items, spec)`, without sorting the rest.
+def top_items(items: Sequence[dict], spec: SortSpec, k: int) -> list[dict]:
+    if k >= len(items):
+        return sort_items(items, spec)
+    directions = [descending for _, descending in spec]
+    return heapq.nsmallest(
+        k,
+        items,
+        key=lambda item: _SortKey([sort_value(item.get(f)) for f, _ in spec], directions),
+    )
+
 
 def safe_sort(items: list[dict], key: str, order: str) -> list[dict]:
-    reverse = order.lower() == "desc"
+    return sort_items(items, [(key, order.lower() == "desc")])
+
+
+# Compares field by field in each field's own direction, with missing values last either way.
+class _SortKey:
+    __slots__ = ("parts", "directions")
+
+    def __init__(self, parts: list[Any], directions: list[bool]) -> None:
+        self.parts = parts
+        self.directions = directions
+
+    def __lt__(self, other: "_SortKey") -> bool:
+        for mine, theirs, descending in zip(self.parts, other.parts, self.directions, strict=True):
+            if mine == theirs:
+                continue
+            if mine is None:
+                return False
+            if theirs is None:
+                return True
+            return mine > theirs if descending else mine < theirs
+        return False
+
+
+# Sort keys for a fixed item list, parsed once per field and reduced to integer ranks; the
+# orders built from them are cached per sort spec, so a repeated sort is a lookup.
+class SortIndex:
+    def __init__(self, items: Sequence[dict]) -> None:
+        self._items = items
+        self._lock = threading.Lock()
+        self._ranks: dict[str, list[int | None]] = {}
+        self._orders: dict[tuple[tuple[str, bool], ...], tuple[int, ...]] = {}
 
-    def _key(item: dict) -> Any:
-        value = item.get(key)
-        if value is None:
-            return "" if reverse else "~~~~"
-        return value
+    def order(self, spec: SortSpec) -> tuple[int, ...]:
+        cache_key = tuple(spec)
+        with self._lock:
+            cached = self._orders.get(cache_key)
+        if cached is not None:
+            return cached
+        ranks = [self._field_ranks(field) for field, _ in spec]
+        directions = [descending for _, descending in spec]
+        order = tuple(
+            sorted(
+                range(len(self._items)),
+                key=lambda i: _SortKey([field_ranks[i] for field_ranks in ranks], directions),
+            )
+        )
+        with self._lock:
+            if len(self._orders) >= _ORDER_CACHE_LIMIT:
+                self._orders.clear()
+            self._orders[cache_key] = order
+        return order
 
-    return sorted(items, key=_key, reverse=reverse)
+    def _field_ranks(self, field: str) -> list[int | None]:
+        with self._lock:
+            cached = self._ranks.get(field)
+        if cached is not None:
+            return cached
+        keys = [sort_value(item.get(field)) for item in self._items]
+        distinct = sorted({key for key in keys if key is not None})
+        rank_of = {key: rank for rank, key in enumerate(distinct)}
+        ranks = [None if key is None else rank_of[key] for key in keys]
+        with self._lock:
+            self._ranks[field] = ranks
+        return ranks
 
 
 def project_fields(items: list[dict], fields: list[str] | None) -> list[dict]:
-    if not fields:
+    project = compile_projector(fields)
+    if project is None:
         return items
-    selected = []
-    for item in items:
-        projected = {field: item.get(field) for field in fields if field in item}
-        if "id" in item and "id" not in projected:
-            projected["id"] = item["id"]
-        selected.append(projected)
-    return selected
+    return [project(item) for item in items]
@@ -0,0 +1,120 @@
+import asyncio
+
+from holonet.errors import AppError
+from holonet.services.batch_service import AsyncBatchService
+
+
+class FakeClient:
+    def __init__(self, cached=None):
+        self.cached = cached or {}
+        self.calls = []
+
+    async def cached_resources(self, refs):
+        return {ref: self.cached[ref] for ref in refs if ref in self.cached}
+
+    async def get_resource(self, resource, resource_id):
+        self.calls.append((resource, resource_id))
+        if resource_id == 404:
+            raise AppError("Resource not found", status_code=404)
+        return {"name": f"{resource}-{resource_id}", "url": f"/{resource}/{resource_id}/"}
+
+
+def test_batch_dedupes_uses_cache_and_reports_per_ref_errors():
+    client = FakeClient(cached={("people", 1): {"name": "Luke", "height": "172"}})
+
+    results = asyncio.run(
+        AsyncBatchService(client).lookup(
+            ["people:1", "planets:2", "people:1", "people:01", "people:404", "ships:1", "people:x"]
+        )
+    )
+
+    assert list(results) == [
+        "people:1",
+        "planets:2",
+        "people:01",
+        "people:404",
+        "ships:1",
+        "people:x",
+    ]
+    assert results["people:1"] == {"item": {"name": "Luke", "height": "172", "id": 1}}
+    assert results["people:01"] == results["people:1"]
+    assert results["planets:2"]["item"]["name"] == "planets-2"
+    assert results["people:404"]["error"]["status"] == 404
+    assert results["ships:1"]["error"] == {"message": "Invalid ref", "status": 400, "details": {}}
+    assert results["people:x"]["error"]["status"] == 400
+    assert sorted(client.calls) == [("people", 404), ("planets", 2)]
+
+
+def test_non_ascii_digits_are_invalid_refs():
+    client = FakeClient()
+
+    results = asyncio.run(AsyncBatchService(client).lookup(["people:\u00b2", "people:\u0661"]))
+
+    assert results["people:\u00b2"]["error"]["status"] == 400
+    assert results["people:\u0661"]["error"]["status"] == 400
+    assert client.calls == []
+
+
+def test_batch_rejects_empty_and_oversized_requests(monkeypatch):
+    from holonet.services import batch_service
+
+    monkeypatch.setattr(batch_service.settings, "batch_max_refs", 2)
+    for refs in ([" ", ""], ["people:1", "people:2", "people:3"]):
+        try:
+            asyncio.run(AsyncBatchService(FakeClient()).lookup(refs))
+        except AppError as exc:
+            assert exc.status_code == 400
+        else:
+            raise AssertionError("expected AppError")
+
+
+def test_async_batch_fetches_misses_concurrently_and_projects_fields():
+    in_flight = 0
+    peak = 0
+
+    class AsyncClient(FakeClient):
+        async def get_resource(self, resource, resource_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await FakeClient.get_resource(self, resource, resource_id)
+
+    refs = [f"people:{n}" for n in range(1, 6)]
+    results = asyncio.run(AsyncBatchService(AsyncClient()).lookup(refs, ["name"]))
+
+    assert results["people:3"] == {"item": {"name": "people-3", "id": 3}}
+    assert peak == 5
+
+
+def test_concurrent_batches_share_one_process_wide_cap(monkeypatch):
+    from holonet.services import batch_service
+    from holonet.utils.concurrency import BoundedExecutor
+
+    executor = BoundedExecutor(3)
+    monkeypatch.setattr(batch_service, "shared_executor", lambda limit: executor)
+    in_flight = 0
+    peak = 0
+
+    class AsyncClient(FakeClient):
+        async def get_resource(self, resource, resource_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await FakeClient.get_resource(self, resource, resource_id)
+
+    async def _run():
+        service = AsyncBatchService(AsyncClient())
+        return await asyncio.gather(
+            service.lookup([f"people:{n}" for n in range(1, 6)]),
+            service.lookup([f"planets:{n}" for n in range(1, 6)]),
+        )
+
+    people, planets = asyncio.run(_run())
+
+    assert len(people) == len(planets) == 5
+    assert peak == 3
+    assert executor.stats()["tasks"] == 10
@@ -3,23 +3,58 @@ import pytest
 from holonet.utils.cache import RedisCache
 
 
-def test_redis_cache_serialize(monkeypatch):
-    class FakeRedis:
-        def __init__(self):
-            self.store = {}
+class CountingRedis:
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.store.get(key)
+
+    def mget(self, keys):
+        self.gets += 1
+        return [self.store.get(key) for key in keys]
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    # Stands in for the touch script: restamp the deadlines key and the payload's TTL.
+    def register_script(self, script):
+        def run(keys, args):
+            if keys[0] not in self.store:
+                return 0
+            self.setex(keys[1], args[1], args[0])
+            self.ttls[keys[0]] = args[1]
+            return 1
+
+        return run
 
-        def get(self, key):
-            return self.store.get(key)
+    def flushdb(self):
+        self.store.clear()
 
-        def setex(self, key, ttl, value):
-            self.store[key] = value
 
-        def flushdb(self):
-            self.store.clear()
+class FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
 
+    def setex(self, key, ttl, value):
+        self._calls.append((key, ttl, value))
+
+    def execute(self):
+        return [self._redis.setex(*call) for call in self._calls]
+
+
+def test_redis_cache_serialize(monkeypatch):
     import redis
 
-    fake = FakeRedis()
+    fake = CountingRedis()
     monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fake)
 
     cache = RedisCache(redis_url="redis://localhost:6379/0", ttl_seconds=60)
@@ -46,3 +81,252 @@ def test_redis_cache_missing_package(monkeypatch):
 
     with pytest.raises(RuntimeError):
         RedisCache(redis_url="redis://localhost:6379/0", ttl_seconds=60)
+
+
+def test_redis_cache_soft_and_hard_ttl(monkeypatch):
+    import redis
+
+    import holonet.utils.cache as cache_mod
+
+    fake = CountingRedis()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fake)
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+
+    cache = RedisCache(redis_url="redis://localhost:6379/0", ttl_seconds=60, stale_ttl_seconds=30)
+    cache.set("k", {"v": 1})
+    assert fake.ttls["v2:k"] == fake.ttls["v2:k:deadlines"] == 90
+
+    now += 61.0
+    assert cache.get("k") is None
+    entry = cache.get_entry("k")
+    assert entry.value == {"v": 1}
+    assert entry.is_stale(now) is True
+
+
+def test_tiered_cache_serves_l1_and_promotes_from_l2(monkeypatch):
+    import redis
+
+    from holonet.utils.cache import TieredCache, build_cache
+
+    fake = CountingRedis()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fake)
+
+    cache = build_cache(
+        ttl_seconds=60,
+        max_entries=10,
+        backend="redis",
+        redis_url="redis://localhost:6379/0",
+        l1_ttl_seconds=5,
+        l1_max_entries=10,
+    )
+    assert isinstance(cache, TieredCache)
+
+    cache.set("k", {"v": 1}, "etag-1")
+    for _ in range(5):
+        assert cache.get("k") == {"v": 1}
+    assert fake.gets == 0
+
+    cache._l1.clear()
+    assert cache.get_entry("k").etag == "etag-1"
+    assert cache.get("k") == {"v": 1}
+    assert fake.gets == 1
+
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert stats["l1"]["hits"] == 6
+    assert stats["l1"]["misses"] == 2
+    assert stats["l2"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    cache.clear()
+    assert cache.get("k") is None
+
+
+def test_tiered_cache_l1_copy_respects_l2_deadlines(monkeypatch):
+    import redis
+
+    import holonet.utils.cache as cache_mod
+    from holonet.utils.cache import TieredCache, TTLCache
+
+    fake = CountingRedis()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fake)
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+
+    l2 = RedisCache(redis_url="redis://localhost:6379/0", ttl_seconds=10, stale_ttl_seconds=20)
+    cache = TieredCache(TTLCache(ttl_seconds=5, max_entries=10), l2, l1_ttl_seconds=5)
+    cache.set("k", {"v": 1})
+
+    now += 12.0
+    entry = cache.get_entry("k")
+    assert entry.is_stale(now) is True
+    assert cache._l1.get_entry("k").is_stale(now) is True
+    assert cache.get("k") is None
+
+
+def test_build_cache_redis_without_l1_returns_redis_cache(monkeypatch):
+    import redis
+
+    from holonet.utils.cache import build_cache
+
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: CountingRedis())
+
+    cache = build_cache(
+        ttl_seconds=60, max_entries=10, backend="redis", redis_url="redis://x", l1_ttl_seconds=0
+    )
+    assert isinstance(cache, RedisCache)
+
+
+def test_tiered_cache_bulk_read_uses_one_l2_round_trip(monkeypatch):
+    import redis
+
+    from holonet.utils.cache import TieredCache, TTLCache
+
+    fake = CountingRedis()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fake)
+    l2 = RedisCache(redis_url="redis://localhost:6379/0", ttl_seconds=60)
+    cache = TieredCache(TTLCache(ttl_seconds=5, max_entries=10), l2, l1_ttl_seconds=5)
+    for key in ("a", "b", "c"):
+        cache.set(key, {"v": key})
+    cache._l1.clear()
+    cache.get("a")
+    fake.gets = 0
+
+    entries = cache.get_entries(["a", "b", "c", "missing"])
+
+    assert {key: entry.value for key, entry in entries.items()} == {
+        "a": {"v": "a"},
+        "b": {"v": "b"},
+        "c": {"v": "c"},
+    }
+    assert fake.gets == 1
+    assert cache._l1.get("c") == {"v": "c"}
+
+
+def test_redis_touch_restamps_deadlines_without_rewriting_the_payload(monkeypatch):
+    import json
+
+    import redis
+
+    import holonet.utils.cache as cache_mod
+    from holonet.utils.cache import TieredCache, TTLCache
+
+    fake = CountingRedis()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fake)
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+
+    l2 = RedisCache(redis_url="redis://localhost:6379/0", ttl_seconds=60, stale_ttl_seconds=30)
+    cache = TieredCache(TTLCache(ttl_seconds=5, max_entries=10), l2, l1_ttl_seconds=5)
+    cache.set("k", {"v": 1}, "etag-1", {"last_modified": "Tue, 01 Oct 2024 00:00:00 GMT"})
+    payload = fake.store["v2:k"]
+
+    now += 70.0
+    fake.gets = 0
+    with monkeypatch.context() as patched:
+        patched.setattr(cache_mod, "freeze", lambda _value: pytest.fail("payload decoded"))
+        assert cache.touch("k") == (1130.0, 1160.0)
+    assert fake.gets == 0
+    assert fake.store["v2:k"] is payload
+    assert fake.ttls["v2:k"] == 90
+    assert json.loads(fake.store["v2:k:deadlines"]) == [1130.0, 1160.0]
+
+    entry = l2.get_entry("k")
+    assert (entry.value, entry.fresh_until, entry.etag) == ({"v": 1}, 1130.0, "etag-1")
+    assert entry.upstream == {"last_modified": "Tue, 01 Oct 2024 00:00:00 GMT"}
+
+    assert l2.touch("missing") is None
+    assert "v2:missing:deadlines" not in fake.store
+
+
+def test_redis_cache_ignores_other_value_formats(monkeypatch):
+    import json
+
+    import redis
+
+    fake = CountingRedis()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fake)
+    cache = RedisCache(redis_url="redis://localhost:6379/0", ttl_seconds=60)
+
+    # What instances running the previous release write: the bare payload, unversioned key.
+    fake.store["people"] = json.dumps({"name": "Luke"})
+    assert cache.get_entry("people") is None
+
+    for raw in (json.dumps({"name": "Luke"}), "not json", '{"fresh_until": 1}\n{"v"'):
+        fake.store["v2:bad"] = raw
+        assert cache.get_entry("bad") is None
+    assert cache.stats()["hits"] == 0
+
+    cache.set("people", {"name": "Luke"})
+    assert fake.store["people"] == json.dumps({"name": "Luke"})
+    assert cache.get("people") == {"name": "Luke"}
+
+
+def test_tiered_cache_l1_copy_reports_l2_deadlines_but_evicts_early(monkeypatch):
+    import redis
+
+    import holonet.utils.cache as cache_mod
+    from holonet.utils.cache import TieredCache, TTLCache
+
+    fake = CountingRedis()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fake)
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+
+    l2 = RedisCache(redis_url="redis://localhost:6379/0", ttl_seconds=180, stale_ttl_seconds=600)
+    cache = TieredCache(TTLCache(ttl_seconds=5, max_entries=10), l2, l1_ttl_seconds=5)
+    cache.set("k", {"v": 1})
+
+    now += 1.0
+    fake.gets = 0
+    entry = cache.get_entry("k")
+    assert (entry.fresh_until, entry.expires_at) == (1180.0, 1780.0)
+    assert fake.gets == 0
+
+    now += 5.0
+    assert cache._l1.get_entry("k") is None
+    assert cache.get_entry("k").fresh_until == 1180.0
+    assert fake.gets == 1
+
+    now += 200.0
+    assert cache.touch("k") == (1386.0, 1986.0)
+    assert cache._l1.get_entry("k").fresh_until == 1386.0
+    now += 6.0
+    assert cache._l1.get_entry("k") is None
+
+
+def test_async_access_moves_redis_calls_off_the_event_loop(monkeypatch):
+    import asyncio
+    import threading
+
+    import redis
+
+    from holonet.utils.cache import TieredCache, TTLCache
+
+    threads = []
+
+    class ThreadRecordingRedis(CountingRedis):
+        def mget(self, keys):
+            threads.append(threading.get_ident())
+            return super().mget(keys)
+
+    fake = ThreadRecordingRedis()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fake)
+    l2 = RedisCache(redis_url="redis://localhost:6379/0", ttl_seconds=60)
+    cache = TieredCache(TTLCache(ttl_seconds=5, max_entries=10), l2, l1_ttl_seconds=5)
+
+    async def _run():
+        await cache.set_async("k", {"v": 1}, "etag-1")
+        cache._l1.clear()
+        promoted = await cache.get_entry_async("k")
+        # The promoted L1 copy answers without another L2 round trip.
+        again = await cache.get_entries_async(["k"])
+        deadlines = await cache.touch_async("k")
+        return threading.get_ident(), promoted, again, deadlines
+
+    loop_thread, promoted, again, deadlines = asyncio.run(_run())
+    assert promoted.etag == "etag-1"
+    assert again["k"].value == {"v": 1}
+    assert deadlines is not None
+    assert len(threads) == 1
+    assert threads[0] != loop_thread
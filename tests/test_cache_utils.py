@@ -44,12 +44,21 @@ def test_build_cache_redis(monkeypatch):
         def __init__(self):
             self.store = {}
 
-        def get(self, key):
-            return self.store.get(key)
+        def mget(self, keys):
+            return [self.store.get(key) for key in keys]
 
         def setex(self, key, ttl, value):
             self.store[key] = value
 
+        def pipeline(self, transaction=True):
+            return self
+
+        def execute(self):
+            return []
+
+        def register_script(self, script):
+            return lambda keys, args: 0
+
         def flushdb(self):
             self.store.clear()
 
@@ -64,3 +73,88 @@ def test_build_cache_redis(monkeypatch):
     cache.set("a", 1)
     assert cache.get("a") == 1
     cache.clear()
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_sweeps_expired_entries_on_write(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+
+    cache = TTLCache(ttl_seconds=1, max_entries=100)
+    for i in range(10):
+        cache.set(f"k{i}", i)
+    now += 2.0
+    cache.set("fresh", 1)
+    assert len(cache) == 1
+    assert cache.get("fresh") == 1
+
+
+def test_ttl_cache_overwrites_keep_heap_bounded():
+    cache = TTLCache(ttl_seconds=60, max_entries=4)
+    for i in range(1000):
+        cache.set(f"k{i % 8}", i)
+    assert len(cache) == 4
+    assert len(cache._expiry) <= 2 * len(cache) + TTLCache._SWEEP_BUDGET
+    assert cache.get("k7") == 999
+
+
+def test_ttl_cache_serves_stale_entries_until_hard_ttl(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+
+    cache = TTLCache(ttl_seconds=10, max_entries=10, stale_ttl_seconds=5)
+    cache.set("k", {"v": 1})
+    assert cache.get_entry("k").is_stale(now) is False
+
+    now += 12.0
+    assert cache.get("k") is None
+    entry = cache.get_entry("k")
+    assert entry.value == {"v": 1}
+    assert entry.is_stale(now) is True
+
+    now += 4.0
+    assert cache.get_entry("k") is None
+
+
+def test_ttl_cache_touch_restarts_ttls_and_keeps_the_payload(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+
+    cache = TTLCache(ttl_seconds=10, max_entries=10, stale_ttl_seconds=5)
+    cache.set("k", {"v": 1}, "etag-1", {"etag": '"up"'})
+    payload = cache.get_entry("k").value
+
+    now += 12.0
+    assert cache.touch("k") == (1022.0, 1027.0)
+    entry = cache.get_entry("k")
+    assert entry.value is payload
+    assert entry.is_stale(now) is False
+    assert (entry.etag, entry.upstream) == ("etag-1", {"etag": '"up"'})
+    assert cache.touch("missing") is None
+
+
+def test_ttl_cache_stores_read_only_payloads():
+    import pickle
+
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+    cache.set("k", {"name": "Luke", "films": [{"title": "A New Hope"}]})
+    payload = cache.get("k")
+
+    assert payload == {"name": "Luke", "films": ({"title": "A New Hope"},)}
+    assert cache.get("k") is payload
+    with pytest.raises(TypeError):
+        payload["name"] = "Vader"
+    with pytest.raises(TypeError):
+        payload["films"][0].pop("title")
+    assert {**payload, "id": 1}["id"] == 1
+    assert pickle.loads(pickle.dumps(payload)) == payload
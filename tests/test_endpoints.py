@@ -4,7 +4,7 @@ from holonet.errors import AppError
 
 
 def test_search_endpoint(client, monkeypatch):
-    def fake_search(self, resource, query, page):
+    async def fake_search(self, resource, query, page):
         return {
             "count": 1,
             "results": [{"name": "Tatooine", "url": "https://swapi.dev/api/planets/1/"}],
@@ -12,7 +12,7 @@ def test_search_endpoint(client, monkeypatch):
             "_cache": {"hit": False, "ttl": 180},
         }
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "search", fake_search)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
 
     resp = client.get("/v1/search?resource=planets&q=tat&page=1&page_size=10")
     assert resp.status_code == 200
@@ -22,7 +22,7 @@ def test_search_endpoint(client, monkeypatch):
 
 
 def test_search_aliases_and_reverse(client, monkeypatch):
-    def fake_search(self, resource, query, page):
+    async def fake_search(self, resource, query, page):
         return {
             "count": 2,
             "results": [
@@ -33,7 +33,7 @@ def test_search_aliases_and_reverse(client, monkeypatch):
             "_cache": {"hit": False, "ttl": 180},
         }
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "search", fake_search)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
 
     resp = client.get("/v1/search?resource=people&search=luke&order_by=name&reverse=true")
     assert resp.status_code == 200
@@ -50,37 +50,107 @@ def test_search_rejects_page_size_over_max(client):
 
 
 def test_get_film(client, monkeypatch):
-    def fake_get(self, resource, resource_id):
+    async def fake_get(self, resource, resource_id):
         return {
             "title": "A New Hope",
             "url": "https://swapi.dev/api/films/1/",
             "_cache": {"hit": True},
         }
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "get_resource", fake_get)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
 
     resp = client.get("/v1/films/1")
     assert resp.status_code == 200
     payload = resp.json()
     assert payload["item"]["title"] == "A New Hope"
 
+    sparse = client.get("/v1/films/1?fields=title").json()
+    assert sparse["item"] == {"title": "A New Hope", "id": 1}
+
+
+def test_conditional_get_returns_304_without_rendering(client, monkeypatch):
+    from holonet import responses
+
+    async def fake_get(self, resource, resource_id):
+        return {"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"}
+
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
+
+    first = client.get("/v1/films/1")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert client.get("/v1/films/1").headers["etag"] == etag
+    assert client.get("/v1/films/1?fields=title").headers["etag"] != etag
+
+    def no_render(self, content):
+        raise AssertionError("a 304 must not serialize the envelope")
+
+    monkeypatch.setattr(responses.FastJSONResponse, "render", no_render)
+    cached = client.get("/v1/films/1", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert cached.headers["cache-control"] == first.headers["cache-control"]
+    assert client.get("/v1/films/1", headers={"If-None-Match": etag[2:]}).status_code == 304
+
+
+def test_cache_control_and_surrogate_keys(client, monkeypatch):
+    from holonet import responses
+
+    async def fake_get(self, resource, resource_id):
+        self._tag(resource, f"{resource}:{resource_id}")
+        return {"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"}
+
+    async def fake_search(self, resource_name, query, page):
+        return {
+            "count": 1,
+            "results": [{"name": "Tatooine", "url": "https://swapi.dev/api/planets/1/"}],
+            "next": None,
+        }
+
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
+
+    item = client.get("/v1/films/1")
+    assert item.headers["cache-control"] == "max-age=180, stale-while-revalidate=600"
+    assert item.headers["vary"] == "X-API-Key"
+    assert item.headers["surrogate-key"] == "films films:1"
+    assert item.headers["cache-tag"] == "films,films:1"
+
+    listed = client.get("/planets")
+    assert listed.headers["cache-control"].startswith("public, max-age=")
+    assert listed.headers["surrogate-key"] == "planets planets:1"
+    assert listed.headers["vary"] == "Accept"
+
+    monkeypatch.setattr(responses, "MAX_SURROGATE_KEYS", 1)
+    assert client.get("/v1/films/1").headers["surrogate-key"] == "films"
+
 
 def test_graph_endpoint(client, monkeypatch):
-    def fake_get(self, resource, resource_id):
+    async def fake_get(self, resource, resource_id):
         if resource == "people":
             return {"name": "Luke", "films": ["https://swapi.dev/api/films/1/"]}
         return {"title": "A New Hope", "characters": []}
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "get_resource", fake_get)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
 
     resp = client.get("/v1/graph?start_resource=people&start_id=1&depth=1")
     assert resp.status_code == 200
     payload = resp.json()
     assert payload["graph"]["nodes"]
 
+    assert resp.headers["surrogate-key"] == "films films:1 people people:1"
+
+    cached = client.get("/v1/graph?start_resource=people&start_id=1&depth=1")
+    again = cached.json()
+    assert again["graph"] == payload["graph"]
+    assert again["cache"]["hit"] is True
+    assert cached.headers["etag"] == resp.headers["etag"]
+    assert cached.headers["cache-control"].endswith("stale-while-revalidate=0")
+
 
 def test_planets_map_endpoint(client, monkeypatch):
-    def fake_search(self, resource, query, page):
+    async def fake_search(self, resource, query, page):
         return {
             "results": [
                 {
@@ -94,7 +164,7 @@ def test_planets_map_endpoint(client, monkeypatch):
             "next": None,
         }
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "search", fake_search)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
 
     resp = client.get("/v1/planets/map?page_size=1")
     assert resp.status_code == 200
@@ -103,14 +173,12 @@ def test_planets_map_endpoint(client, monkeypatch):
 
 
 def test_expand_urls_handles_error(client, monkeypatch):
-    def fake_get(self, resource, resource_id):
+    async def fake_get(self, resource, resource_id):
+        if resource == "people":
+            raise AppError("SWAPI unavailable", status_code=502)
         return {"title": "A New Hope", "characters": ["https://swapi.dev/api/people/1/"]}
 
-    def fake_by_url(self, url):
-        raise AppError("SWAPI unavailable", status_code=502)
-
-    monkeypatch.setattr(swapi_client.SwapiClient, "get_resource", fake_get)
-    monkeypatch.setattr(swapi_client.SwapiClient, "get_by_url", fake_by_url)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
 
     resp = client.get("/v1/films/1/characters")
     assert resp.status_code == 200
@@ -119,30 +187,29 @@ def test_expand_urls_handles_error(client, monkeypatch):
 
 
 def test_people_films_expanded(client, monkeypatch):
-    def fake_get(self, resource, resource_id):
-        return {"name": "Luke", "films": ["https://swapi.dev/api/films/1/"]}
-
-    def fake_by_url(self, url):
-        return {"title": "A New Hope", "url": url, "_cache": {"hit": False}}
+    async def fake_get(self, resource, resource_id):
+        if resource == "people":
+            return {"name": "Luke", "films": ["https://swapi.dev/api/films/1/"]}
+        return {"title": "A New Hope", "url": f"https://swapi.dev/api/films/{resource_id}/"}
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "get_resource", fake_get)
-    monkeypatch.setattr(swapi_client.SwapiClient, "get_by_url", fake_by_url)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
 
     resp = client.get("/v1/people/1/films")
     assert resp.status_code == 200
     payload = resp.json()
     assert payload["items"][0]["title"] == "A New Hope"
+    assert payload["person"] == {"id": 1, "name": "Luke"}
 
 
 def test_people_planets_starships_endpoints(client, monkeypatch):
-    def fake_get(self, resource, resource_id):
+    async def fake_get(self, resource, resource_id):
         return {
             "name": f"{resource}-{resource_id}",
             "url": f"https://swapi.dev/api/{resource}/{resource_id}/",
             "_cache": {"hit": False},
         }
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "get_resource", fake_get)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
 
     resp = client.get("/v1/people/1")
     assert resp.status_code == 200
@@ -158,16 +225,81 @@ def test_people_planets_starships_endpoints(client, monkeypatch):
 
 
 def test_film_characters_expanded_success(client, monkeypatch):
-    def fake_get(self, resource, resource_id):
-        return {"title": "A New Hope", "characters": ["https://swapi.dev/api/people/1/"]}
-
-    def fake_by_url(self, url):
-        return {"name": "Luke", "url": url, "_cache": {"hit": False}}
+    async def fake_get(self, resource, resource_id):
+        if resource == "films":
+            return {"title": "A New Hope", "characters": ["https://swapi.dev/api/people/1/"]}
+        return {"name": "Luke", "url": f"https://swapi.dev/api/people/{resource_id}/"}
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "get_resource", fake_get)
-    monkeypatch.setattr(swapi_client.SwapiClient, "get_by_url", fake_by_url)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
 
     resp = client.get("/v1/films/1/characters")
     assert resp.status_code == 200
     payload = resp.json()
     assert payload["items"][0]["name"] == "Luke"
+    assert payload["film"] == {"id": 1, "title": "A New Hope"}
+
+
+def test_film_characters_paged_and_sorted(client, monkeypatch):
+    async def fake_get(self, resource, resource_id):
+        if resource == "films":
+            return {
+                "title": "A New Hope",
+                "characters": [f"https://swapi.dev/api/people/{n}/" for n in range(1, 26)],
+            }
+        return {
+            "name": f"P{resource_id:02d}",
+            "url": f"https://swapi.dev/api/people/{resource_id}/",
+        }
+
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
+
+    resp = client.get("/v1/films/1/characters?page=2&page_size=3&sort=name&order=desc")
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert len(payload["items"]) == 3
+    assert [item["name"] for item in payload["items"]] == ["P22", "P21", "P20"]
+    assert payload["pagination"]["total_pages"] == 9
+
+
+def test_batch_endpoint_get_and_post(client, monkeypatch):
+    async def fake_get(self, resource, resource_id):
+        if resource_id == 99:
+            raise AppError("Resource not found", status_code=404)
+        return {"name": f"{resource}-{resource_id}", "url": f"https://swapi.dev/api/{resource}/1/"}
+
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
+
+    resp = client.get("/v1/batch?refs=people:1,planets:2,people:99&fields=name")
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert results["people:1"] == {"item": {"name": "people-1", "id": 1}}
+    assert results["people:99"]["error"]["status"] == 404
+
+    invalid = client.get("/v1/batch?refs=people:\u00b2")
+    assert invalid.status_code == 200
+    assert invalid.json()["results"]["people:\u00b2"]["error"]["status"] == 400
+
+    posted = client.post("/v1/batch", json={"refs": ["planets:2"]})
+    assert posted.json()["results"]["planets:2"]["item"]["name"] == "planets-2"
+
+
+def test_generic_relation_endpoint(client, monkeypatch):
+    async def fake_get(self, resource, resource_id):
+        if resource == "planets":
+            return {
+                "name": "Tatooine",
+                "residents": [f"https://swapi.dev/api/people/{n}/" for n in (1, 2, 4)],
+            }
+        return {"name": f"P{resource_id}", "url": f"https://swapi.dev/api/people/{resource_id}/"}
+
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
+
+    resp = client.get("/v1/planets/1/residents?page=2&page_size=2&fields=name")
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["items"] == [{"name": "P4", "id": 4}]
+    assert payload["parent"]["label"] == "Tatooine"
+    assert payload["pagination"]["total_pages"] == 2
+
+    assert client.get("/v1/planets/1/pilots").status_code == 404
+    assert client.get("/v1/droids/1/films").status_code == 422
@@ -125,3 +125,26 @@ def test_function_entrypoint_receive_consumes_body(monkeypatch):
     resp = entry.app(BodyRequest("/v1/meta"))
     assert resp.status_code == 200
     assert captured["body"] == b"payload"
+
+
+def test_function_entrypoint_serves_swapi_routes_over_sync_pool(monkeypatch):
+    import httpx
+
+    from holonet.clients.transport import build_bridged_async_client
+
+    root = Path(__file__).resolve().parents[1]
+    entry = _load_module(root / "function_entrypoint.py", "holonet_function_entry_swapi")
+
+    def handler(request):
+        return httpx.Response(200, json={"name": "Luke", "url": str(request.url)})
+
+    state = entry.fastapi_app.state
+    sync_client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(state, "http_client", sync_client)
+    monkeypatch.setattr(state, "async_http_client", build_bridged_async_client(sync_client))
+    state.cache.clear()
+
+    for _ in range(2):
+        resp = entry.app(FakeRequest("/v1/people/1"))
+        assert resp.status_code == 200
+        assert _parse_response(resp)["item"]["name"] == "Luke"
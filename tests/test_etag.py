@@ -0,0 +1,17 @@
+from holonet.utils.etag import combine, digest, etag_matches, payload_etag
+
+
+def test_digest_and_combine_are_stable():
+    assert digest(b'{"name":"Luke"}') == payload_etag({"name": "Luke"})
+    assert combine("a", "b") == combine("a", "b")
+    assert combine("a", "b") != combine("ab")
+    assert len(digest(b"")) == 32
+
+
+def test_etag_matches_lists_wildcards_and_weak_tags():
+    assert etag_matches('"x"', '"x"')
+    assert etag_matches('"y", "x"', '"x"')
+    assert etag_matches('W/"x"', '"x"')
+    assert etag_matches("*", '"x"')
+    assert not etag_matches('"y"', '"x"')
+    assert not etag_matches(None, '"x"')
@@ -1,37 +1,155 @@
+import asyncio
+
 from holonet.errors import AppError
-from holonet.services.expand_service import ExpandService
+from holonet.services.expand_service import AsyncExpandService
+from holonet.utils.concurrency import BoundedExecutor
 
 
 class FakeClient:
-    def get_by_url(self, url):
+    async def get_by_url(self, url):
         return {"name": "Luke", "url": url}
 
 
 def test_expand_service_success():
-    service = ExpandService(FakeClient())
-    items = service.expand_urls(["https://swapi.dev/api/people/1/"])
+    service = AsyncExpandService(FakeClient())
+    items = asyncio.run(service.expand_urls(["https://swapi.dev/api/people/1/"]))
     assert items[0]["name"] == "Luke"
     assert items[0]["id"] == 1
 
+    projected = asyncio.run(service.expand_urls(["https://swapi.dev/api/people/1/"], ["name"]))
+    assert projected == [{"name": "Luke", "id": 1}]
+
 
 def test_expand_service_empty():
-    service = ExpandService(FakeClient())
-    assert service.expand_urls([]) == []
+    service = AsyncExpandService(FakeClient())
+    assert asyncio.run(service.expand_urls([])) == []
 
 
 def test_expand_service_handles_error():
     class ErrorClient:
-        def get_by_url(self, url):
+        async def get_by_url(self, url):
             raise AppError("boom", status_code=502)
 
-    service = ExpandService(ErrorClient())
-    assert service.expand_urls(["https://swapi.dev/api/people/1/"]) == []
+    service = AsyncExpandService(ErrorClient())
+    assert asyncio.run(service.expand_urls(["https://swapi.dev/api/people/1/"])) == []
+
+
+def test_async_expand_service_keeps_input_order_and_skips_errors():
+    class AsyncClient:
+        async def get_by_url(self, url):
+            if url.endswith("/2/"):
+                raise AppError("boom", status_code=502)
+            return {"name": url, "url": url}
+
+    urls = [
+        "https://swapi.dev/api/people/3/",
+        "https://swapi.dev/api/people/2/",
+        "https://swapi.dev/api/people/1/",
+    ]
+    items = asyncio.run(AsyncExpandService(AsyncClient()).expand_urls(urls))
+    assert [item["id"] for item in items] == [3, 1]
+    assert asyncio.run(AsyncExpandService(AsyncClient()).expand_urls([])) == []
+
+
+def test_expand_service_returns_input_order_under_a_shared_cap():
+    executor = BoundedExecutor(2)
+    in_flight = 0
+    peak = 0
+
+    class SlowClient:
+        async def get_by_url(self, url):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 * (5 - int(url.rstrip("/").rsplit("/", 1)[-1])))
+            in_flight -= 1
+            return {"name": url, "url": url}
+
+    urls = [f"https://swapi.dev/api/people/{n}/" for n in range(1, 5)]
+
+    async def _run():
+        services = [AsyncExpandService(SlowClient(), executor) for _ in range(3)]
+        return await asyncio.gather(*(service.expand_urls(urls) for service in services))
+
+    results = asyncio.run(_run())
+
+    assert [[item["id"] for item in items] for items in results] == [[1, 2, 3, 4]] * 3
+    assert peak == 2
+    stats = executor.stats()
+    assert stats["tasks"] == 12
+    assert stats["queued"] == stats["running"] == 0
+    assert stats["queue_wait_ms_max"] > 0
+
+
+def test_async_expand_cap_is_shared_across_calls():
+    executor = BoundedExecutor(3)
+    in_flight = 0
+    peak = 0
+
+    class AsyncClient:
+        async def get_by_url(self, url):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"name": url, "url": url}
+
+    urls = [f"https://swapi.dev/api/people/{n}/" for n in range(1, 6)]
+
+    async def _run():
+        services = [AsyncExpandService(AsyncClient(), executor) for _ in range(2)]
+        return await asyncio.gather(*(service.expand_urls(urls) for service in services))
+
+    first, second = asyncio.run(_run())
+    assert [item["id"] for item in first] == [item["id"] for item in second] == [1, 2, 3, 4, 5]
+    assert peak == 3
+    # A fresh event loop gets its own semaphore from the same executor.
+    assert len(asyncio.run(AsyncExpandService(AsyncClient(), executor).expand_urls(urls))) == 5
+
+
+def test_expand_join_resolves_each_shared_ref_once():
+    class JoinClient:
+        def __init__(self):
+            self.fetched = []
+
+        async def cached_resources(self, refs):
+            return {ref: {"title": "A New Hope"} for ref in refs if ref == ("films", 1)}
+
+        async def get_resource(self, resource, resource_id):
+            self.fetched.append((resource, resource_id))
+            if resource_id == 9:
+                raise AppError("Resource not found", status_code=404)
+            return {"name": f"S{resource_id}", "mass": "1"}
+
+    base = "https://swapi.dev/api"
+    items = [
+        {"name": "Luke", "films": [f"{base}/films/1/"], "species": [f"{base}/species/1/"]},
+        {"name": "Leia", "films": [f"{base}/films/1/"], "species": [f"{base}/species/9/"]},
+    ]
+    client = JoinClient()
+    joined, meta = asyncio.run(AsyncExpandService(client).join(items, ["films", "species"]))
+
+    assert client.fetched == [("species", 1), ("species", 9)]
+    assert meta == {"relations": ["films", "species"], "refs": 3}
+    assert joined[0]["films"] == [{"id": 1, "title": "A New Hope", "url": None}]
+    assert joined[0]["species"] == [{"id": 1, "name": "S1", "url": None}]
+    assert joined[1]["species"] == [f"{base}/species/9/"]
+    assert items[0]["films"] == [f"{base}/films/1/"]
+
 
+def test_parse_expand_and_with_relations():
+    from holonet.services.expand_service import parse_expand, with_relations
 
-def test_expand_extract_id_cases():
-    from holonet.services.expand_service import _extract_id
+    assert parse_expand("people", None) == []
+    assert parse_expand("people", "homeworld, species,homeworld") == ["homeworld", "species"]
+    try:
+        parse_expand("planets", "pilots")
+    except AppError as exc:
+        assert exc.status_code == 400
+        assert exc.details["allowed"] == ["residents", "films"]
+    else:
+        raise AssertionError("expected AppError")
 
-    assert _extract_id(None) is None
-    assert _extract_id("") is None
-    assert _extract_id("///") is None
-    assert _extract_id("https://swapi.dev/api/people/abc/") is None
+    assert with_relations(None, ["homeworld"]) is None
+    assert with_relations(["name", "homeworld"], ["homeworld"]) == ["name", "homeworld"]
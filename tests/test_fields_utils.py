@@ -1,7 +1,15 @@
-from holonet.utils.fields import parse_fields
+from holonet.utils.fields import compile_projector, parse_fields
 
 
 def test_parse_fields():
     assert parse_fields("name,id, ,created") == ["name", "id", "created"]
     assert parse_fields("") is None
     assert parse_fields(None) is None
+
+
+def test_compiled_projector_is_shared_and_keeps_id():
+    project = compile_projector(["name", "name", "height"])
+    assert project is compile_projector(["name", "name", "height"])
+    assert project({"name": "Luke", "mass": "77", "id": 1}) == {"name": "Luke", "id": 1}
+    assert compile_projector(None) is None
+    assert compile_projector([]) is None
@@ -1,8 +1,10 @@
-from holonet.services.graph_service import GraphService
+import asyncio
+
+from holonet.services.graph_service import AsyncGraphService
 
 
 class FakeClient:
-    def get_resource(self, resource, resource_id):
+    async def get_resource(self, resource, resource_id):
         if resource == "people":
             return {
                 "name": "Luke",
@@ -28,8 +30,8 @@ class FakeClient:
 
 
 def test_build_graph():
-    service = GraphService(FakeClient())
-    graph = service.build_graph("people", 1, depth=2)
+    service = AsyncGraphService(FakeClient())
+    graph = asyncio.run(service.build_graph("people", 1, depth=2))
 
     assert graph["nodes"]
     assert graph["edges"]
@@ -37,33 +39,33 @@ def test_build_graph():
     assert "people:1" in node_ids
     assert "films:1" in node_ids
     assert "planets:1" in node_ids
-    unknown = FakeClient().get_resource("starships", 9)
+    unknown = asyncio.run(FakeClient().get_resource("starships", 9))
     assert unknown["url"].endswith("/starships/9/")
 
 
 def test_build_graph_invalid_url():
     class BadClient:
-        def get_resource(self, resource, resource_id):
+        async def get_resource(self, resource, resource_id):
             return {"name": "X", "films": ["bad-url"]}
 
-    service = GraphService(BadClient())
-    graph = service.build_graph("people", 1, depth=1)
+    service = AsyncGraphService(BadClient())
+    graph = asyncio.run(service.build_graph("people", 1, depth=1))
     assert graph["nodes"]
 
 
 def test_graph_parse_non_int():
     class ClientNonInt:
-        def get_resource(self, resource, resource_id):
+        async def get_resource(self, resource, resource_id):
             return {"name": "X", "films": ["https://swapi.dev/api/films/abc/"]}
 
-    service = GraphService(ClientNonInt())
-    graph = service.build_graph("people", 1, depth=1)
+    service = AsyncGraphService(ClientNonInt())
+    graph = asyncio.run(service.build_graph("people", 1, depth=1))
     assert graph["nodes"]
 
 
 def test_graph_skips_visited_nodes():
     class DupClient:
-        def get_resource(self, resource, resource_id):
+        async def get_resource(self, resource, resource_id):
             if resource == "people":
                 return {
                     "name": "Luke",
@@ -77,9 +79,51 @@ def test_graph_skips_visited_nodes():
                 return {"title": "A New Hope", "url": "https://swapi.dev/api/films/1/"}
             return {"name": "unknown", "url": f"https://swapi.dev/api/{resource}/{resource_id}/"}
 
-    service = GraphService(DupClient())
-    graph = service.build_graph("people", 1, depth=2)
+    service = AsyncGraphService(DupClient())
+    graph = asyncio.run(service.build_graph("people", 1, depth=2))
     film_nodes = [node for node in graph["nodes"] if node["id"] == "films:1"]
     assert len(film_nodes) == 1
-    unknown = DupClient().get_resource("species", 3)
+    unknown = asyncio.run(DupClient().get_resource("species", 3))
     assert unknown["url"].endswith("/species/3/")
+
+
+def test_async_build_graph():
+    graph = asyncio.run(AsyncGraphService(FakeClient()).build_graph("people", 1, depth=1))
+    node_ids = {node["id"] for node in graph["nodes"]}
+    assert {"people:1", "films:1", "planets:1"} <= node_ids
+    assert {"from": "people:1", "to": "planets:1", "type": "homeworld"} in graph["edges"]
+
+
+def test_async_graph_fetches_each_level_concurrently_within_node_budget(monkeypatch):
+    from holonet.services import graph_service
+
+    monkeypatch.setattr(graph_service.settings, "graph_max_depth", 2)
+    monkeypatch.setattr(graph_service.settings, "graph_max_nodes", 6)
+    calls = []
+    in_flight = 0
+    peak = 0
+
+    class FilmClient:
+        async def get_resource(self, resource, resource_id):
+            nonlocal in_flight, peak
+            calls.append((resource, resource_id))
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if resource == "films":
+                urls = [f"https://swapi.dev/api/people/{n}/" for n in (1, 2, 2, 3, 4)]
+                return {"title": "A New Hope", "characters": urls}
+            return {
+                "name": f"P{resource_id}",
+                "films": ["https://swapi.dev/api/films/1/"],
+                "starships": [f"https://swapi.dev/api/starships/{resource_id}/"],
+            }
+
+    graph = asyncio.run(AsyncGraphService(FilmClient()).build_graph("films", 1, depth=2))
+
+    assert len(graph["nodes"]) == 6
+    assert len(calls) == len(set(calls)) == 6
+    assert calls[:5] == [("films", 1), ("people", 1), ("people", 2), ("people", 3), ("people", 4)]
+    assert peak == 4
+    assert {"from": "people:1", "to": "starships:1", "type": "starships"} in graph["edges"]
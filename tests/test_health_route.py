@@ -27,3 +27,11 @@ def test_meta_route(client):
     assert payload["source"]["name"] == "holonet"
     assert payload["cache"]["hit"] is False
     assert payload["correlation_id"]
+
+
+def test_stats_route_reports_cache_hit_ratios(client):
+    resp = client.get("/v1/stats")
+    assert resp.status_code == 200
+    assert set(resp.json()["cache_backend"]) == {"hits", "misses", "hit_ratio"}
+    assert {"queue_wait_ms_avg", "run_ms_avg"} <= set(resp.json()["expand"])
+    assert resp.json()["upstream"]["limit"] >= 1
@@ -27,12 +27,12 @@ def test_auth_guard_enforced(monkeypatch):
     resp = client.get("/v1/search?resource=people")
     assert resp.status_code == 401
 
-    def fake_search(self, resource, query, page):
+    async def fake_search(self, resource, query, page):
         return {"count": 0, "results": [], "next": None, "_cache": {"hit": False, "ttl": 180}}
 
     import holonet.clients.swapi_client as swapi_client
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "search", fake_search)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
 
     resp = client.get("/v1/search?resource=people", headers={"x-api-key": "secret"})
     assert resp.status_code == 200
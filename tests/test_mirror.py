@@ -0,0 +1,105 @@
+import asyncio
+
+import httpx
+import pytest
+
+from holonet.clients.mirror import SwapiMirror
+from holonet.clients.swapi_client import AsyncSwapiClient
+from holonet.errors import AppError
+from holonet.services.mirror_service import MirrorService
+
+BASE = "https://swapi.dev/api"
+
+
+def _people(count):
+    return [{"name": f"Person {i}", "url": f"{BASE}/people/{i}/"} for i in range(1, count + 1)]
+
+
+def test_mirror_lookups_and_search_pages():
+    mirror = SwapiMirror()
+    mirror.load("people", _people(23))
+    mirror.load(
+        "starships", [{"name": "Falcon", "model": "YT-1300", "url": f"{BASE}/starships/10/"}]
+    )
+
+    assert mirror.get("people", 7)["name"] == "Person 7"
+    assert mirror.get("people", 99) is None
+    assert mirror.get("planets", 1) is None
+    assert mirror.get_by_url(f"{BASE}/people/3/")["name"] == "Person 3"
+    assert mirror.get_by_url(f"{BASE}/people/") is None
+    assert mirror.get_by_url(f"{BASE}/people/\u00b2/") is None
+
+    first = mirror.search("people", None, 1)
+    last = mirror.search("people", None, 3)
+    assert first["count"] == 23
+    assert first["next"] == f"{BASE}/people/?page=2"
+    assert first["previous"] is None
+    assert [item["name"] for item in last["results"]] == ["Person 21", "Person 22", "Person 23"]
+    assert last["next"] is None
+    assert mirror.search("people", None, 4) is None
+    assert mirror.search("planets", None, 1) is None
+
+    matches = mirror.search("people", "person 2", 1)
+    assert matches["count"] == 5
+    assert mirror.search("starships", "yt-13", 1)["count"] == 1
+    assert mirror.search("people", "nobody", 1) == {
+        "count": 0,
+        "next": None,
+        "previous": None,
+        "results": [],
+    }
+    assert mirror.stats()["people"]["items"] == 23
+
+
+def test_client_answers_from_mirror_and_falls_back_upstream():
+    mirror = SwapiMirror()
+    mirror.load("people", _people(2))
+    client = AsyncSwapiClient(mirror=mirror)
+    calls = []
+
+    async def fake_get(url, params=None):
+        calls.append(url)
+        return httpx.Response(200, json={"name": "Tatooine", "url": url})
+
+    client._client.get = fake_get  # type: ignore
+
+    assert asyncio.run(client.get_resource("people", 1))["name"] == "Person 1"
+    assert asyncio.run(client.search("people", "person", 1))["count"] == 2
+    assert calls == []
+    assert client.cache_meta()["hit"] is True
+
+    assert asyncio.run(client.get_by_url(f"{BASE}/planets/1/"))["name"] == "Tatooine"
+    assert calls == [f"{BASE}/planets/1/"]
+    assert client.cache_meta()["hit"] is False
+
+
+def test_mirror_service_refresh_loads_complete_resources_only():
+    class FakeClient:
+        async def search(self, resource, query, page):
+            if resource == "films":
+                raise AppError("SWAPI unavailable", status_code=502)
+            if resource == "people":
+                # Upstream claims more records than it returns: never load a partial copy.
+                return {"count": 30, "next": None, "results": _people(10)}
+            return {"count": 1, "next": None, "results": [{"url": f"{BASE}/{resource}/1/"}]}
+
+    mirror = SwapiMirror()
+    asyncio.run(MirrorService(FakeClient(), mirror).refresh())
+
+    assert set(mirror.stats()) == {"planets", "species", "starships", "vehicles"}
+    assert mirror.get("planets", 1) is not None
+
+
+def test_async_client_uses_mirror():
+    mirror = SwapiMirror()
+    mirror.load("people", _people(1))
+    client = AsyncSwapiClient(mirror=mirror)
+
+    async def boom(*_args, **_kwargs):
+        raise AssertionError("should not go upstream")
+
+    client._client.get = boom  # type: ignore
+    item = asyncio.run(client.get_by_url(f"{BASE}/people/1/"))
+    assert item["name"] == "Person 1"
+    with pytest.raises(TypeError):
+        item["name"] = "Vader"
@@ -0,0 +1,192 @@
+import asyncio
+
+from holonet.services import paging
+from holonet.services.paging import (
+    fetch_pages_async,
+    iter_pages_async,
+    plan_last_page,
+)
+
+
+def _page(page, count=25, per_page=10, total_pages=3):
+    start = (page - 1) * per_page
+    size = min(per_page, count - start)
+    return {
+        "count": count,
+        "results": [{"name": f"item-{start + i}"} for i in range(size)],
+        "next": f"page{page + 1}" if page < total_pages else None,
+    }
+
+
+def test_plan_last_page_cases():
+    assert plan_last_page(_page(1), max_pages=20, wanted_items=None) == 3
+    assert plan_last_page(_page(1), max_pages=2, wanted_items=None) == 2
+    assert plan_last_page(_page(1), max_pages=20, wanted_items=11) == 2
+    assert plan_last_page({"results": [{}], "next": "x"}, max_pages=20, wanted_items=None) == 1
+    assert plan_last_page({"count": 5, "results": [], "next": "x"}, 20, None) == 1
+    assert plan_last_page(_page(3), max_pages=20, wanted_items=None) == 1
+
+
+def test_fetch_pages_async_fans_out_and_keeps_order():
+    started = []
+    release = None
+
+    class SlowClient:
+        async def search(self, resource, query, page):
+            started.append(page)
+            if page > 1:
+                await release.wait()
+                # Later pages finish first; the merge must still follow page order.
+                await asyncio.sleep(0.01 * (4 - page))
+            return _page(page)
+
+    async def _run():
+        nonlocal release
+        release = asyncio.Event()
+        task = asyncio.create_task(fetch_pages_async(SlowClient(), "people", None, max_pages=20))
+        while len(started) < 3:
+            await asyncio.sleep(0)
+        release.set()
+        return await task
+
+    payloads = asyncio.run(_run())
+    assert sorted(started) == [1, 2, 3]
+    names = [item["name"] for payload in payloads for item in payload["results"]]
+    assert names == [f"item-{i}" for i in range(25)]
+
+
+def test_fetch_pages_follows_next_without_count():
+    class NoCountClient:
+        def __init__(self):
+            self.calls = []
+
+        async def search(self, resource, query, page):
+            self.calls.append(page)
+            payload = _page(page)
+            payload.pop("count")
+            return payload
+
+    client = NoCountClient()
+    payloads = asyncio.run(fetch_pages_async(client, "people", None, max_pages=20))
+    assert client.calls == [1, 2, 3]
+    assert len(payloads) == 3
+
+    client = NoCountClient()
+    asyncio.run(fetch_pages_async(client, "people", None, max_pages=20, wanted_items=10))
+    assert client.calls == [1]
+
+
+def test_fetch_pages_stops_at_max_pages():
+    class Client:
+        async def search(self, resource, query, page):
+            return _page(page, count=45, total_pages=5)
+
+    payloads = asyncio.run(fetch_pages_async(Client(), "people", None, max_pages=4))
+    assert len(payloads) == 4
+    assert payloads[3]["results"][0]["name"] == "item-30"
+
+
+def test_fetch_window_addresses_pages_directly():
+    from holonet.services.paging import fetch_window_async, window_pages
+    from holonet.utils.pagination import PageSizeHint
+
+    class Client:
+        def __init__(self):
+            self.calls = []
+
+        async def search(self, resource, query, page):
+            self.calls.append(page)
+            return _page(page, count=95, total_pages=10)
+
+    hints = PageSizeHint()
+    client = Client()
+    offset, payloads = asyncio.run(fetch_window_async(client, "people", None, 40, 50, 20, hints))
+    assert client.calls[0] == 1
+    assert sorted(client.calls[1:]) == [5]
+    assert offset == 40
+    assert hints.get("people") == 10
+
+    client = Client()
+    offset, payloads = asyncio.run(fetch_window_async(client, "people", None, 35, 55, 20, hints))
+    assert sorted(client.calls) == [4, 5, 6]
+    assert offset == 30
+    assert payloads[0]["results"][0]["name"] == "item-30"
+
+    assert window_pages(0, 10, 10, 20) == (1, 1)
+    assert window_pages(90, 100, 10, 20, head=_page(1, count=95, total_pages=10)) == (10, 10)
+    assert window_pages(200, 210, 10, 20, head=_page(1, count=95, total_pages=10)) == (21, 10)
+
+
+def test_fetch_window_async_past_the_end_falls_back_to_first_page():
+    from holonet.errors import AppError
+    from holonet.services.paging import fetch_window_async
+    from holonet.utils.pagination import PageSizeHint
+
+    calls = []
+
+    class Client:
+        async def search(self, resource, query, page):
+            calls.append(page)
+            if page > 3:
+                raise AppError("Resource not found", status_code=404)
+            return _page(page)
+
+    hints = PageSizeHint()
+    hints.learn("people", _page(1))
+    offset, payloads = asyncio.run(fetch_window_async(Client(), "people", None, 60, 70, 20, hints))
+    assert calls == [7, 1]
+    assert offset == 0
+    assert payloads[0]["count"] == 25
+
+
+def test_iter_pages_async_yields_in_order_within_a_bounded_window(monkeypatch):
+    monkeypatch.setattr(paging.settings, "max_upstream_concurrency", 2)
+    in_flight = 0
+    peak = 0
+
+    class SlowClient:
+        async def search(self, resource, query, page):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01 * (7 - page))
+            in_flight -= 1
+            return _page(page, count=65, total_pages=7)
+
+    async def _run():
+        return [payload async for payload in iter_pages_async(SlowClient(), "people", None, 20)]
+
+    payloads = asyncio.run(_run())
+    names = [item["name"] for payload in payloads for item in payload["results"]]
+    assert names == [f"item-{i}" for i in range(65)]
+    assert peak == 2
+
+
+def test_concurrent_fan_outs_share_one_upstream_cap(monkeypatch):
+    from holonet.utils.concurrency import BoundedExecutor
+
+    executor = BoundedExecutor(2, "upstream")
+    monkeypatch.setattr(paging, "shared_executor", lambda limit, name: executor)
+    in_flight = 0
+    peak = 0
+
+    class SlowClient:
+        async def search(self, resource, query, page):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _page(page, count=65, total_pages=7)
+
+    async def _run():
+        client = SlowClient()
+        return await asyncio.gather(
+            fetch_pages_async(client, "people", None, 20),
+            fetch_pages_async(client, "planets", None, 20),
+        )
+
+    people, planets = asyncio.run(_run())
+    assert len(people) == len(planets) == 7
+    assert peak == 2
+    assert executor.stats()["tasks"] == 12
@@ -1,8 +1,10 @@
-from holonet.services.planets_map_service import PlanetsMapService
+import asyncio
+
+from holonet.services.planets_map_service import AsyncPlanetsMapService
 
 
 class FakeClient:
-    def search(self, resource, query, page):
+    async def search(self, resource, query, page):
         if page == 1:
             return {
                 "results": [
@@ -45,8 +47,8 @@ class FakeClient:
 
 
 def test_planets_map_categories():
-    service = PlanetsMapService(FakeClient())
-    items = service.planets_map(page_size=10)
+    service = AsyncPlanetsMapService(FakeClient())
+    items = asyncio.run(service.planets_map(page_size=10))
     assert len(items) == 4
     categories = {item["name"]: item["category"] for item in items}
     assert categories["Tatooine"] == "arid"
@@ -55,12 +57,21 @@ def test_planets_map_categories():
     assert categories["Dagobah"] == "frontier"
 
 
+def test_planets_map_projects_fields():
+    service = AsyncPlanetsMapService(FakeClient())
+    items = asyncio.run(service.planets_map(page_size=2, fields=["name", "category"]))
+    assert items == [
+        {"name": "Tatooine", "category": "arid", "id": 1},
+        {"name": "Hoth", "category": "unknown", "id": 4},
+    ]
+
+
 def test_planets_map_fake_client_page_two_empty():
-    assert FakeClient().search("planets", None, 2) == {"results": [], "next": None}
+    assert asyncio.run(FakeClient().search("planets", None, 2)) == {"results": [], "next": None}
 
 
 class PagedClient:
-    def search(self, resource, query, page):
+    async def search(self, resource, query, page):
         if page == 1:
             return {
                 "results": [
@@ -91,27 +102,18 @@ class PagedClient:
 
 
 def test_planets_map_paged_client_page_three_empty():
-    assert PagedClient().search("planets", None, 3) == {"results": [], "next": None}
+    assert asyncio.run(PagedClient().search("planets", None, 3)) == {"results": [], "next": None}
 
 
 def test_planets_map_multiple_pages_and_categories():
-    service = PlanetsMapService(PagedClient())
-    items = service.planets_map(page_size=2)
+    service = AsyncPlanetsMapService(PagedClient())
+    items = asyncio.run(service.planets_map(page_size=2))
+    assert [item["name"] for item in items] == ["Ice", "Weird"]
     categories = {item["name"]: item["category"] for item in items}
     assert categories["Ice"] == "ice"
     assert categories["Weird"] == "unknown"
 
 
-def test_map_extract_id_cases():
-    from holonet.services.planets_map_service import _extract_id
-
-    assert _extract_id(None) is None
-    assert _extract_id("") is None
-    assert _extract_id("/planets/") is None
-    assert _extract_id("///") is None
-    assert _extract_id("https://swapi.dev/api/planets/abc/") is None
-
-
 def test_map_categorize_invalid_population():
     from holonet.services.planets_map_service import _categorize
 
@@ -120,7 +122,7 @@ def test_map_categorize_invalid_population():
 
 def test_planets_map_breaks_on_page_size():
     class BigPageClient:
-        def search(self, resource, query, page):
+        async def search(self, resource, query, page):
             return {
                 "results": [
                     {
@@ -148,6 +150,6 @@ def test_planets_map_breaks_on_page_size():
                 "next": "page2",
             }
 
-    service = PlanetsMapService(BigPageClient())
-    items = service.planets_map(page_size=2)
+    service = AsyncPlanetsMapService(BigPageClient())
+    items = asyncio.run(service.planets_map(page_size=2))
     assert len(items) == 2
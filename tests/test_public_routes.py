@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from holonet.clients import swapi_client
@@ -15,7 +17,7 @@ from holonet.clients import swapi_client
     ],
 )
 def test_public_endpoints_return_items(client, monkeypatch, path, resource):
-    def fake_search(self, resource_name, query, page):
+    async def fake_search(self, resource_name, query, page):
         assert resource_name == resource
         return {
             "count": 1,
@@ -29,7 +31,7 @@ def test_public_endpoints_return_items(client, monkeypatch, path, resource):
             "_cache": {"hit": False, "ttl": 180},
         }
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "search", fake_search)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
 
     resp = client.get(path)
     assert resp.status_code == 200
@@ -42,7 +44,7 @@ def test_public_endpoints_return_items(client, monkeypatch, path, resource):
 def test_public_aliases_and_reverse_order(client, monkeypatch):
     calls = []
 
-    def fake_search(self, resource_name, query, page):
+    async def fake_search(self, resource_name, query, page):
         calls.append({"resource": resource_name, "query": query, "page": page})
         return {
             "count": 2,
@@ -54,7 +56,7 @@ def test_public_aliases_and_reverse_order(client, monkeypatch):
             "_cache": {"hit": False, "ttl": 180},
         }
 
-    monkeypatch.setattr(swapi_client.SwapiClient, "search", fake_search)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
 
     resp = client.get("/planets?search=tatooine&order_by=name&reverse=true&all=false")
     assert resp.status_code == 200
@@ -66,3 +68,121 @@ def test_public_aliases_and_reverse_order(client, monkeypatch):
 def test_public_rejects_page_size_over_max(client):
     resp = client.get("/planets?page_size=9999")
     assert resp.status_code == 400
+
+
+def test_public_cursor_continues_after_previous_page(client, monkeypatch):
+    async def fake_search(self, resource_name, query, page):
+        start = (page - 1) * 10
+        return {
+            "count": 12,
+            "results": [
+                {"name": f"P{n}", "url": f"https://swapi.dev/api/planets/{n}/"}
+                for n in range(start + 1, min(start + 10, 12) + 1)
+            ],
+            "next": "https://swapi.dev/api/planets/?page=2" if page == 1 else None,
+        }
+
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
+
+    first = client.get("/planets?all=false&page_size=5").json()
+    assert [item["name"] for item in first["items"]] == ["P1", "P2", "P3", "P4", "P5"]
+    cursor = first["pagination"]["next_cursor"]
+
+    second = client.get(f"/planets?all=false&page_size=5&cursor={cursor}").json()
+    assert [item["name"] for item in second["items"]] == ["P6", "P7", "P8", "P9", "P10"]
+    assert second["pagination"]["page"] == 2
+
+    assert client.get(f"/films?all=false&page_size=5&cursor={cursor}").status_code == 400
+
+
+def test_public_all_streams_ndjson(client, monkeypatch):
+    async def fake_search(self, resource_name, query, page):
+        return {
+            "count": 3,
+            "results": [
+                {"name": f"P{n}", "url": f"https://swapi.dev/api/planets/{n}/"}
+                for n in ((1, 2) if page == 1 else (3,))
+            ],
+            "next": "https://swapi.dev/api/planets/?page=2" if page == 1 else None,
+        }
+
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
+
+    for resp in (
+        client.get("/planets?stream=true&fields=name"),
+        client.get("/planets", headers={"Accept": "application/x-ndjson"}),
+    ):
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        assert resp.headers["vary"] == "Accept"
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [line["name"] for line in lines[:3]] == ["P1", "P2", "P3"]
+        assert lines[3]["meta"]["pagination"]["total_items"] == 3
+        assert lines[3]["meta"]["correlation_id"]
+
+    bad = client.get("/planets?stream=true&sort=nope")
+    assert bad.status_code == 400
+    assert bad.json()["error"]["message"] == "Invalid sort field"
+
+
+def test_public_expand_joins_deduplicated_homeworlds(client, monkeypatch):
+    fetched = []
+
+    async def fake_search(self, resource_name, query, page):
+        return {
+            "count": 3,
+            "results": [
+                {"name": name, "homeworld": f"https://swapi.dev/api/planets/{world}/"}
+                for name, world in (("Luke", 1), ("Owen", 1), ("Leia", 2))
+            ],
+            "next": None,
+        }
+
+    async def fake_get_resource(self, resource, resource_id):
+        fetched.append((resource, resource_id))
+        return {
+            "name": f"World {resource_id}",
+            "url": f"https://swapi.dev/api/planets/{resource_id}/",
+        }
+
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get_resource)
+
+    payload = client.get("/characters?expand=homeworld&fields=name").json()
+    assert payload["items"][1] == {
+        "name": "Owen",
+        "homeworld": {"id": 1, "name": "World 1", "url": "https://swapi.dev/api/planets/1/"},
+        "id": None,
+    }
+    assert sorted(fetched) == [("planets", 1), ("planets", 2)]
+    assert payload["expand"]["relations"] == ["homeworld"]
+    assert payload["expand"]["refs"] == 2
+    assert payload["expand"]["upstream_calls"] == 0
+
+    streamed = client.get("/characters?expand=homeworld&stream=true").text.splitlines()
+    assert json.loads(streamed[0])["homeworld"]["name"] == "World 1"
+    assert json.loads(streamed[-1])["meta"]["expand"]["refs"] == 2
+
+    bad = client.get("/characters?expand=pilots")
+    assert bad.status_code == 400
+    assert bad.json()["error"]["details"]["expand"] == ["pilots"]
+
+
+def test_public_fast_response_keeps_envelope_shape_and_schema(client, monkeypatch):
+    from holonet.schemas.common import SearchEnvelope
+
+    async def fake_search(self, resource_name, query, page):
+        return {
+            "count": 1,
+            "results": [{"name": "Tatooine", "url": "https://swapi.dev/api/planets/1/"}],
+            "next": None,
+        }
+
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "search", fake_search)
+
+    payload = client.get("/planets").json()
+    assert SearchEnvelope.model_validate(payload).model_dump(mode="json") == payload
+
+    schema = client.get("/openapi.json").json()["paths"]["/planets"]["get"]
+    body = schema["responses"]["200"]["content"]["application/json"]["schema"]
+    assert body == {"$ref": "#/components/schemas/SearchEnvelope"}
@@ -0,0 +1,19 @@
+from holonet.utils.refs import url_id, url_ref
+
+
+def test_url_ref_splits_resource_and_id():
+    assert url_ref("https://swapi.dev/api/people/1/") == ("people", 1)
+    assert url_ref("https://swapi.dev/api/planets/12") == ("planets", 12)
+
+
+def test_url_id_invalid_cases():
+    assert url_id(None) is None
+    assert url_id("") is None
+    assert url_id("///") is None
+    assert url_id("/planets/") is None
+    assert url_id("https://swapi.dev/api/people/abc/") is None
+
+
+def test_non_ascii_digits_are_not_ids():
+    assert url_ref("https://swapi.dev/api/people/\u00b2/") is None
+    assert url_ref("https://swapi.dev/api/people/\u0661/") is None
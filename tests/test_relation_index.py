@@ -0,0 +1,176 @@
+import asyncio
+
+from holonet.services import graph_service
+from holonet.services.graph_cache import GraphCache
+from holonet.services.graph_service import RELATIONS, AsyncGraphService
+from holonet.services.relation_index import RelationIndex
+
+BASE = "https://swapi.dev/api"
+
+DATASET = {
+    "films": [
+        {
+            "title": "A New Hope",
+            "url": f"{BASE}/films/1/",
+            "characters": (f"{BASE}/people/1/", f"{BASE}/people/2/"),
+            "planets": (f"{BASE}/planets/1/",),
+        }
+    ],
+    "people": [
+        {
+            "name": "Luke",
+            "url": f"{BASE}/people/1/",
+            "films": (f"{BASE}/films/1/",),
+            "homeworld": f"{BASE}/planets/1/",
+            "starships": (f"{BASE}/starships/12/",),
+        },
+        {
+            "name": "Leia",
+            "url": f"{BASE}/people/2/",
+            "films": (f"{BASE}/films/1/",),
+            "homeworld": f"{BASE}/planets/2/",
+        },
+    ],
+    "planets": [
+        {"name": "Tatooine", "url": f"{BASE}/planets/1/", "residents": (f"{BASE}/people/1/",)},
+        {"name": "Alderaan", "url": f"{BASE}/planets/2/", "residents": (f"{BASE}/people/2/",)},
+    ],
+    "starships": [{"name": "X-wing", "url": f"{BASE}/starships/12/", "pilots": ()}],
+}
+
+
+class DatasetClient:
+    def __init__(self):
+        self.calls = []
+
+    async def get_resource(self, resource, resource_id):
+        self.calls.append((resource, resource_id))
+        for item in DATASET[resource]:
+            if item["url"].endswith(f"/{resource}/{resource_id}/"):
+                return item
+        raise AssertionError(f"unknown {resource}/{resource_id}")
+
+    def validator(self):
+        return "dataset-v1"
+
+
+def _index(resources=DATASET):
+    index = RelationIndex(RELATIONS)
+    for resource, items in resources.items():
+        index.update(resource, items)
+    return index
+
+
+def test_indexed_graph_matches_live_walk_without_upstream_calls(monkeypatch):
+    monkeypatch.setattr(graph_service.settings, "graph_max_depth", 3)
+    monkeypatch.setattr(graph_service.settings, "graph_indexed_max_depth", 3)
+    live = asyncio.run(AsyncGraphService(DatasetClient()).build_graph("films", 1, depth=3))
+
+    client = DatasetClient()
+    indexed = asyncio.run(AsyncGraphService(client, _index()).build_graph("films", 1, depth=3))
+
+    assert client.calls == []
+    assert indexed["nodes"] == live["nodes"]
+    assert indexed["edges"] == live["edges"]
+    assert _index().stats() == {"nodes": 6, "edges": 10}
+
+
+def test_indexed_graph_fetches_only_unindexed_leaves(monkeypatch):
+    monkeypatch.setattr(graph_service.settings, "graph_indexed_max_depth", 2)
+    partial = {key: value for key, value in DATASET.items() if key != "starships"}
+    client = DatasetClient()
+
+    graph = asyncio.run(AsyncGraphService(client, _index(partial)).build_graph("films", 1, depth=2))
+
+    assert client.calls == [("starships", 12)]
+    assert {"id": "starships:12", "resource": "starships", "label": "X-wing"}.items() <= next(
+        node for node in graph["nodes"] if node["id"] == "starships:12"
+    ).items()
+
+    # An unindexed node that would need expanding falls back to the live walk.
+    assert _index(partial).walk("films:1", 3, 250) is None
+
+
+def test_relation_index_update_replaces_a_resource():
+    index = _index()
+    index.update("planets", [{"name": "Tatooine", "url": f"{BASE}/planets/1/"}])
+
+    visited, edges = index.walk("planets:1", 1, 250)
+    assert visited == [("planets:1", {"name": "Tatooine", "url": f"{BASE}/planets/1/"})]
+    assert edges == []
+    assert index.walk("planets:2", 1, 250) is None
+
+
+def test_async_indexed_graph_honours_node_budget(monkeypatch):
+    monkeypatch.setattr(graph_service.settings, "graph_max_nodes", 3)
+    graph = asyncio.run(AsyncGraphService(DatasetClient(), _index()).build_graph("films", 1, 3))
+    assert [node["id"] for node in graph["nodes"]] == ["films:1", "people:1", "people:2"]
+
+
+def _cache():
+    return GraphCache(ttl_seconds=60, max_entries=64)
+
+
+def test_repeated_graph_is_served_from_cache(monkeypatch):
+    monkeypatch.setattr(graph_service.settings, "graph_max_depth", 2)
+    cache = _cache()
+    client = DatasetClient()
+    first = AsyncGraphService(client, cache=cache)
+    graph = asyncio.run(first.build_graph("people", 1, depth=2))
+
+    client.calls.clear()
+    second = AsyncGraphService(client, cache=cache)
+    assert _plain(asyncio.run(second.build_graph("people", 1, depth=2))) == graph
+    assert client.calls == []
+    assert second.cache_meta()["hit"] is True
+    assert second.validator() == first.validator() == "dataset-v1"
+
+
+def test_deeper_graph_is_composed_from_cached_neighbourhoods(monkeypatch):
+    monkeypatch.setattr(graph_service.settings, "graph_max_depth", 3)
+    live = asyncio.run(AsyncGraphService(DatasetClient()).build_graph("films", 1, depth=3))
+
+    cache = _cache()
+    asyncio.run(AsyncGraphService(DatasetClient(), cache=cache).build_graph("films", 1, depth=1))
+    for resource, resource_id in (("people", 1), ("people", 2), ("planets", 1)):
+        asyncio.run(
+            AsyncGraphService(DatasetClient(), cache=cache).build_graph(
+                resource, resource_id, depth=2
+            )
+        )
+
+    client = DatasetClient()
+    service = AsyncGraphService(client, cache=cache)
+    composed = asyncio.run(service.build_graph("films", 1, depth=3))
+
+    assert client.calls == []
+    assert service.cache_meta()["hit"] is True
+    assert _plain(composed) == live
+    assert service.validator() != "dataset-v1"
+
+
+def test_storing_a_graph_caches_its_frontier_neighbourhoods(monkeypatch):
+    monkeypatch.setattr(graph_service.settings, "graph_max_depth", 3)
+    cache = _cache()
+    asyncio.run(AsyncGraphService(DatasetClient(), cache=cache).build_graph("films", 1, depth=3))
+
+    live = asyncio.run(AsyncGraphService(DatasetClient()).build_graph("people", 2, depth=2))
+    client = DatasetClient()
+    service = AsyncGraphService(client, cache=cache)
+    assert _plain(asyncio.run(service.build_graph("people", 2, depth=2))) == live
+    assert client.calls == []
+
+
+def test_truncated_graph_is_not_composed_from(monkeypatch):
+    monkeypatch.setattr(graph_service.settings, "graph_max_depth", 3)
+    monkeypatch.setattr(graph_service.settings, "graph_max_nodes", 3)
+    cache = _cache()
+    asyncio.run(AsyncGraphService(DatasetClient(), cache=cache).build_graph("films", 1, depth=3))
+
+    client = DatasetClient()
+    asyncio.run(AsyncGraphService(client, cache=cache).build_graph("people", 1, depth=2))
+    assert client.calls
+
+
+def _plain(graph):
+    return {"nodes": list(graph["nodes"]), "edges": list(graph["edges"])}
@@ -0,0 +1,93 @@
+import asyncio
+
+from holonet.errors import AppError
+from holonet.schemas.resources import RelationQuery
+from holonet.services.relation_service import AsyncRelationService
+
+BASE = "https://swapi.dev/api"
+NAMES = {1: "Luke", 2: "C-3PO", 3: "R2-D2", 4: "Vader", 5: "Leia"}
+
+
+class FakeClient:
+    def __init__(self, cached=()):
+        self.cached = set(cached)
+        self.bulk = []
+        self.calls = []
+
+    async def cached_resources(self, refs):
+        self.bulk.append(list(refs))
+        return {ref: _person(ref[1]) for ref in refs if ref in self.cached}
+
+    async def get_resource(self, resource, resource_id):
+        if resource == "films":
+            return {
+                "title": "A New Hope",
+                "characters": [f"{BASE}/people/{n}/" for n in NAMES],
+                "url": f"{BASE}/films/1/",
+            }
+        self.calls.append((resource, resource_id))
+        return _person(resource_id)
+
+
+def _person(n):
+    return {"name": NAMES[n], "height": str(100 + n), "url": f"{BASE}/people/{n}/"}
+
+
+def _query(**kwargs):
+    return RelationQuery(resource="films", resource_id=1, relation="characters", **kwargs)
+
+
+def test_related_expands_only_the_requested_page_after_bulk_cache_lookup():
+    client = FakeClient(cached=[("people", 3)])
+
+    parent, items, pagination = asyncio.run(
+        AsyncRelationService(client).related(_query(page=2, page_size=2, fields=["name"]))
+    )
+
+    assert parent == {"resource": "films", "id": 1, "label": "A New Hope", "relation": "characters"}
+    assert items == [{"name": "R2-D2", "id": 3}, {"name": "Vader", "id": 4}]
+    assert client.bulk == [[("people", 3), ("people", 4)]]
+    assert client.calls == [("people", 4)]
+    assert pagination["total_items"] == 5
+    assert pagination["has_next"] is True
+
+
+def test_related_sort_spans_every_ref():
+    client = FakeClient()
+    _, items, _ = asyncio.run(
+        AsyncRelationService(client).related(_query(page=1, page_size=2, sort="-height"))
+    )
+
+    assert [item["name"] for item in items] == ["Leia", "Vader"]
+    assert len(client.calls) == 5
+
+
+def test_related_rejects_unknown_relation_bad_sort_and_out_of_range_page():
+    cases = [
+        (RelationQuery(resource="films", resource_id=1, relation="pilots"), 404),
+        (_query(sort="bogus"), 400),
+        (_query(page=9), 404),
+    ]
+    for query, status in cases:
+        try:
+            asyncio.run(AsyncRelationService(FakeClient()).related(query))
+        except AppError as exc:
+            assert exc.status_code == status
+        else:
+            raise AssertionError("expected AppError")
+
+
+def test_async_related_pages_single_valued_relation():
+    class AsyncClient(FakeClient):
+        async def get_resource(self, resource, resource_id):
+            if resource == "people":
+                return {"name": "Luke", "homeworld": f"{BASE}/planets/1/"}
+            self.calls.append((resource, resource_id))
+            return {"name": "Tatooine", "url": f"{BASE}/planets/1/"}
+
+    query = RelationQuery(resource="people", resource_id=1, relation="homeworld")
+    parent, items, pagination = asyncio.run(AsyncRelationService(AsyncClient()).related(query))
+
+    assert parent["label"] == "Luke"
+    assert items == [{"name": "Tatooine", "url": f"{BASE}/planets/1/", "id": 1}]
+    assert pagination["total_items"] == 1
@@ -1,12 +1,15 @@
+import asyncio
+
 from holonet.schemas.search import SearchQuery
-from holonet.services.search_service import SearchService
+from holonet.services import search_service
+from holonet.services.search_service import AsyncSearchService
 
 
 class FakeClient:
     def __init__(self):
         self.calls = []
 
-    def search(self, resource, query, page):
+    async def search(self, resource, query, page):
         self.calls.append(page)
         if page == 1:
             return {
@@ -30,7 +33,7 @@ class FakeClient:
 
 def test_search_pagination_sort_fields():
     client = FakeClient()
-    service = SearchService(client)
+    service = AsyncSearchService(client)
 
     query = SearchQuery(
         resource="people",
@@ -41,20 +44,44 @@ def test_search_pagination_sort_fields():
         order="asc",
         fields=["name", "id"],
     )
-    items, pagination, _cache = service.search(query)
+    items, pagination = asyncio.run(service.search(query))
 
-    assert [item["name"] for item in items] == ["Leia", "Luke"]
+    # Sorting spans every upstream page, not just the slice for the requested page.
+    assert [item["name"] for item in items] == ["Anakin", "Leia"]
+    assert client.calls == [1, 2]
     assert pagination["total_items"] == 3
     assert "id" in items[0]
     assert set(items[0].keys()) == {"name", "id"}
 
 
+def test_search_all_retains_only_projected_and_sort_fields(monkeypatch):
+    class WideClient(FakeClient):
+        async def search(self, resource, query, page):
+            payload = await super().search(resource, query, page)
+            results = [{**item, "height": "1", "films": ["x"] * 50} for item in payload["results"]]
+            return {**payload, "results": results}
+
+    retained = []
+    original = search_service._SearchState.absorb
+
+    def spy(self, payload):
+        original(self, payload)
+        retained.extend(self.aggregated)
+
+    monkeypatch.setattr(search_service._SearchState, "absorb", spy)
+    query = SearchQuery(resource="people", q="", sort="height", fields=["name"])
+    items, _ = asyncio.run(AsyncSearchService(WideClient()).search_all(query))
+
+    assert {key for item in retained for key in item} == {"name", "height", "id"}
+    assert items[0] == {"name": "Leia", "id": 5}
+
+
 def test_search_fetches_next_page_when_needed():
     client = FakeClient()
-    service = SearchService(client)
+    service = AsyncSearchService(client)
 
     query = SearchQuery(resource="people", q="", page=1, page_size=3)
-    items, pagination, _cache = service.search(query)
+    items, pagination = asyncio.run(service.search(query))
 
     assert client.calls == [1, 2]
     assert [item["name"] for item in items] == ["Leia", "Luke", "Anakin"]
@@ -63,60 +90,50 @@ def test_search_fetches_next_page_when_needed():
 
 def test_search_invalid_sort_field():
     client = FakeClient()
-    service = SearchService(client)
+    service = AsyncSearchService(client)
 
     query = SearchQuery(
         resource="people", q="", page=1, page_size=2, sort="unknown_field", order="asc"
     )
     try:
-        service.search(query)
+        asyncio.run(service.search(query))
     except Exception as exc:
         assert getattr(exc, "status_code", None) == 400
 
 
 class EmptyClient:
-    def search(self, resource, query, page):
+    async def search(self, resource, query, page):
         return {"count": 1, "results": [], "next": None, "_cache": {"hit": False, "ttl": 180}}
 
 
 def test_search_page_out_of_range():
-    service = SearchService(EmptyClient())
+    service = AsyncSearchService(EmptyClient())
     query = SearchQuery(resource="people", page=2, page_size=1)
     try:
-        service.search(query)
+        asyncio.run(service.search(query))
     except Exception as exc:
         assert getattr(exc, "status_code", None) == 404
 
 
 class NoResultsClient:
-    def search(self, resource, query, page):
+    async def search(self, resource, query, page):
         return {"count": 0, "results": [], "next": None, "_cache": {"hit": False, "ttl": 180}}
 
 
 def test_search_no_results():
-    service = SearchService(NoResultsClient())
+    service = AsyncSearchService(NoResultsClient())
     query = SearchQuery(resource="people", page=1, page_size=1)
-    items, pagination, _cache = service.search(query)
+    items, pagination = asyncio.run(service.search(query))
     assert items == []
     assert pagination["total_items"] == 0
 
 
-def test_search_extract_id_cases():
-    from holonet.services.search_service import _extract_id
-
-    assert _extract_id(None) is None
-    assert _extract_id("") is None
-    assert _extract_id("/people/") is None
-    assert _extract_id("///") is None
-    assert _extract_id("https://swapi.dev/api/people/abc/") is None
-
-
 def test_search_all_paginates_and_sorts():
     class PagedClient:
         def __init__(self):
             self.pages = []
 
-        def search(self, resource, query, page):
+        async def search(self, resource, query, page):
             self.pages.append(page)
             if page == 1:
                 return {
@@ -137,7 +154,7 @@ def test_search_all_paginates_and_sorts():
                 "_cache": {"hit": False, "ttl": 180},
             }
 
-    service = SearchService(PagedClient())
+    service = AsyncSearchService(PagedClient())
     query = SearchQuery(
         resource="people",
         q="",
@@ -147,7 +164,7 @@ def test_search_all_paginates_and_sorts():
         order="asc",
         fields=["name", "id"],
     )
-    items, pagination, _cache = service.search_all(query)
+    items, pagination = asyncio.run(service.search_all(query))
 
     assert [item["name"] for item in items] == ["A", "B", "C"]
     assert pagination["total_items"] == 3
@@ -156,7 +173,7 @@ def test_search_all_paginates_and_sorts():
 
 def test_search_all_invalid_sort_field():
     class SinglePageClient:
-        def search(self, resource, query, page):
+        async def search(self, resource, query, page):
             return {
                 "count": 1,
                 "results": [{"name": "Luke", "url": "https://swapi.dev/api/people/1/"}],
@@ -164,7 +181,7 @@ def test_search_all_invalid_sort_field():
                 "_cache": {"hit": False, "ttl": 180},
             }
 
-    service = SearchService(SinglePageClient())
+    service = AsyncSearchService(SinglePageClient())
     query = SearchQuery(
         resource="people",
         q="",
@@ -175,6 +192,141 @@ def test_search_all_invalid_sort_field():
         fields=["name"],
     )
     try:
-        service.search_all(query)
+        asyncio.run(service.search_all(query))
     except Exception as exc:
         assert getattr(exc, "status_code", None) == 400
+
+
+def test_async_search_and_search_all():
+    client = FakeClient()
+    service = AsyncSearchService(client)
+
+    query = SearchQuery(resource="people", q="", page=1, page_size=2, sort="name", order="desc")
+    items, pagination = asyncio.run(service.search(query))
+    assert [item["name"] for item in items] == ["Luke", "Leia"]
+    assert pagination["total_items"] == 3
+    assert client.calls == [1, 2]
+
+    client.calls.clear()
+    items, _ = asyncio.run(service.search(query.model_copy(update={"sort": None})))
+    assert [item["name"] for item in items] == ["Leia", "Luke"]
+    assert client.calls == [1]
+
+    items, pagination = asyncio.run(service.search_all(query))
+    assert [item["name"] for item in items] == ["Luke", "Leia", "Anakin"]
+    assert pagination["total_items"] == 3
+
+
+def test_search_sorted_page_uses_top_k_selection(monkeypatch):
+    import holonet.utils.sorting as sorting_mod
+
+    class BigClient:
+        async def search(self, resource, query, page):
+            start = (page - 1) * 10
+            return {
+                "count": 30,
+                "results": [
+                    {"name": f"P{n}", "height": str((n * 37) % 101)}
+                    for n in range(start, start + 10)
+                ],
+                "next": None if page == 3 else f"page{page + 1}",
+            }
+
+    def no_full_sort(*_args):
+        raise AssertionError("page 2 should not sort every item")
+
+    monkeypatch.setattr(sorting_mod, "sort_items", no_full_sort)
+    query = SearchQuery(resource="people", page=2, page_size=5, sort="-height")
+    items, _ = asyncio.run(AsyncSearchService(BigClient()).search(query))
+
+    heights = sorted(((n * 37) % 101 for n in range(30)), reverse=True)
+    assert [int(item["height"]) for item in items] == heights[5:10]
+
+
+def test_search_from_mirror_sorts_whole_resource_without_upstream():
+    from holonet.clients.mirror import SwapiMirror
+
+    mirror = SwapiMirror()
+    mirror.load(
+        "people",
+        [
+            {"name": f"P{i}", "height": str(h), "url": f"https://swapi.dev/api/people/{i}/"}
+            for i, h in enumerate([150, 96, 202, 172, 66], start=1)
+        ],
+    )
+
+    class NoUpstream:
+        async def search(self, *_args):
+            raise AssertionError("should not go upstream")
+
+    service = AsyncSearchService(NoUpstream(), mirror)
+    query = SearchQuery(resource="people", page=1, page_size=2, sort="-height")
+    items, pagination = asyncio.run(service.search(query))
+    assert [item["name"] for item in items] == ["P3", "P4"]
+    assert items[0]["id"] == 3
+    assert pagination["total_items"] == 5
+
+    items, _ = asyncio.run(service.search_all(SearchQuery(resource="people", q="p", sort="height")))
+    assert [item["height"] for item in items] == ["66", "96", "150", "172", "202"]
+
+    try:
+        asyncio.run(service.search(SearchQuery(resource="people", sort="name,-bogus")))
+    except Exception as exc:
+        assert getattr(exc, "status_code", None) == 400
+    else:
+        raise AssertionError("expected invalid sort field")
+
+
+def test_search_cursor_continues_scan():
+    class Client:
+        def __init__(self):
+            self.calls = []
+
+        async def search(self, resource, query, page):
+            self.calls.append(page)
+            start = (page - 1) * 10
+            return {
+                "count": 25,
+                "results": [
+                    {"name": f"P{n}", "url": f"https://swapi.dev/api/people/{n}/"}
+                    for n in range(start, min(start + 10, 25))
+                ],
+                "next": None if page == 3 else f"page{page + 1}",
+            }
+
+    client = Client()
+    service = AsyncSearchService(client)
+    items, pagination = asyncio.run(
+        service.search(SearchQuery(resource="people", page=1, page_size=8))
+    )
+    assert [item["name"] for item in items][-1] == "P7"
+    cursor = pagination["next_cursor"]
+
+    client.calls.clear()
+    items, pagination = asyncio.run(
+        service.search(SearchQuery(resource="people", page_size=8, cursor=cursor))
+    )
+    assert [item["name"] for item in items] == [f"P{n}" for n in range(8, 16)]
+    assert sorted(client.calls) == [1, 2]
+    assert pagination["page"] == 2
+
+    items, pagination = asyncio.run(
+        service.search(
+            SearchQuery(resource="people", page_size=8, cursor=pagination["next_cursor"])
+        )
+    )
+    items, pagination = asyncio.run(
+        service.search(
+            SearchQuery(resource="people", page_size=8, cursor=pagination["next_cursor"])
+        )
+    )
+    assert [item["name"] for item in items] == ["P24"]
+    assert pagination["next_cursor"] is None
+
+    for bad in ("garbage!", cursor):
+        try:
+            asyncio.run(service.search(SearchQuery(resource="planets", page_size=8, cursor=bad)))
+        except Exception as exc:
+            assert getattr(exc, "status_code", None) == 400
+        else:
+            raise AssertionError("expected invalid cursor")
@@ -0,0 +1,101 @@
+import asyncio
+
+import httpx
+
+from holonet.clients.swapi_client import AsyncSwapiClient
+from holonet.utils.cache import TTLCache
+from holonet.utils.singleflight import AsyncSingleFlight
+
+
+def test_async_singleflight_propagates_leader_error():
+    flights = AsyncSingleFlight(timeout_seconds=5)
+
+    async def slow_fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def unused():
+        raise AssertionError("follower should wait for the leader")
+
+    async def _run():
+        leader = asyncio.create_task(flights.do("k", slow_fail))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("k", unused))
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    errors = asyncio.run(_run())
+    assert [type(error) for error in errors] == [ValueError, ValueError]
+    assert flights.stats() == {"leaders": 1, "coalesced": 1, "timeouts": 0}
+
+
+def test_async_singleflight_coalesces_and_recovers_from_cancel():
+    flights = AsyncSingleFlight(timeout_seconds=5)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def _run():
+        results = await asyncio.gather(*(flights.do("k", fetch) for _ in range(10)))
+        leader = asyncio.create_task(flights.do("c", fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("c", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return results, await follower
+
+    results, recovered = asyncio.run(_run())
+    assert results == [1] * 10
+    assert recovered == 3
+    assert flights.stats()["coalesced"] == 10
+
+
+def test_async_singleflight_timeout_falls_back():
+    flights = AsyncSingleFlight(timeout_seconds=0.01)
+
+    async def slow():
+        await asyncio.sleep(0.2)
+        return "leader"
+
+    async def own():
+        return "own"
+
+    async def _run():
+        leader = asyncio.create_task(flights.do("k", slow))
+        await asyncio.sleep(0)
+        follower = await flights.do("k", own)
+        return follower, await leader
+
+    assert asyncio.run(_run()) == ("own", "leader")
+    assert flights.timeouts == 1
+
+
+def test_async_client_coalesces_identical_misses():
+    calls = []
+
+    async def handler(request):
+        calls.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"name": "Luke", "url": str(request.url)})
+
+    flights = AsyncSingleFlight(timeout_seconds=5)
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = AsyncSwapiClient(TTLCache(60, 10), http_client=http_client, flights=flights)
+
+    async def _run():
+        return await asyncio.gather(*(client.get_resource("people", 1) for _ in range(20)))
+
+    results = asyncio.run(_run())
+    assert len(calls) == 1
+    assert all(item["name"] == "Luke" for item in results)
+    assert flights.stats()["coalesced"] == 19
+
+
+def test_stats_route_reports_singleflight_counters(client):
+    resp = client.get("/v1/stats")
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert set(payload["singleflight"]) == {"leaders", "coalesced", "timeouts"}
+    assert payload["correlation_id"]
@@ -12,3 +12,53 @@ def test_project_fields_keeps_id():
     projected = project_fields(items, ["name"])
     assert projected[0]["name"] == "Luke"
     assert projected[0]["id"] == 1
+
+
+def test_sort_value_parses_numbers_dates_and_unknowns():
+    from holonet.utils.sorting import sort_value
+
+    assert sort_value("96") < sort_value("172")
+    assert sort_value("1,358") == (0, 1358.0)
+    assert sort_value("19BBY") < sort_value("4ABY")
+    assert sort_value("1977-05-25") < sort_value("1980-05-17")
+    assert sort_value("unknown") is None
+    assert sort_value("n/a") is None
+    assert sort_value("Luke") == (2, "luke")
+
+
+def test_sort_items_multi_key_with_missing_last():
+    from holonet.utils.sorting import parse_sort, sort_items
+
+    items = [
+        {"name": "B", "height": "96"},
+        {"name": "A", "height": "unknown"},
+        {"name": "A", "height": "172"},
+        {"name": "A", "height": "96"},
+    ]
+    spec = parse_sort("name,-height", "asc")
+    assert spec == [("name", False), ("height", True)]
+    ordered = sort_items(items, spec)
+    assert [(i["name"], i["height"]) for i in ordered] == [
+        ("A", "172"),
+        ("A", "96"),
+        ("A", "unknown"),
+        ("B", "96"),
+    ]
+    assert parse_sort("height", "desc") == [("height", True)]
+    assert parse_sort("+height", "desc") == [("height", False)]
+
+
+def test_sort_index_matches_sort_items_and_caches_orders():
+    from holonet.utils.sorting import SortIndex, sort_items
+
+    items = [
+        {"name": "Luke", "mass": "77"},
+        {"name": "Jabba", "mass": "1,358"},
+        {"name": "R2", "mass": "32"},
+        {"name": "Ghost", "mass": "unknown"},
+        {"name": "Leia", "mass": "49"},
+    ]
+    index = SortIndex(items)
+    for spec in ([("mass", False)], [("mass", True)], [("name", True), ("mass", False)]):
+        assert [items[i] for i in index.order(spec)] == sort_items(items, spec)
+    assert index.order([("mass", True)]) is index.order([("mass", True)])
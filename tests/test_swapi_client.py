@@ -1,9 +1,14 @@
+import asyncio
+from types import SimpleNamespace
+
 import httpx
 import pytest
 
-from holonet.clients.swapi_client import SwapiClient
+from holonet.clients import swapi_client
+from holonet.clients.swapi_client import AsyncSwapiClient
 from holonet.errors import AppError
 from holonet.utils.cache import TTLCache
+from holonet.utils.etag import digest
 
 
 def _response(status_code=200, json_body=None):
@@ -13,70 +18,282 @@ def _response(status_code=200, json_body=None):
 
 def test_swapi_client_cache_hit():
     cache = TTLCache(ttl_seconds=60, max_entries=10)
-    client = SwapiClient(cache)
+    client = AsyncSwapiClient(cache)
 
-    def fake_get(url, params=None):
+    async def fake_get(url, params=None):
         return _response(200, {"name": "Luke", "url": url})
 
     client._client.get = fake_get  # type: ignore
 
-    first = client.get_resource("people", 1)
-    second = client.get_resource("people", 1)
+    first = asyncio.run(client.get_resource("people", 1))
+    second = asyncio.run(client.get_resource("people", 1))
 
     assert first["name"] == "Luke"
-    assert second["_cache"]["hit"] is True
+    assert second is first
+    assert "_cache" not in second
+    assert client.cache_meta() == {"hit": False, "ttl": 180, "stale": False}
+    assert client.upstream_calls == 1
+    with pytest.raises(TypeError):
+        second["name"] = "Vader"
+
+    replay = AsyncSwapiClient(cache)
+    asyncio.run(replay.get_resource("people", 1))
+    assert replay.cache_meta() == {"hit": True, "ttl": 180, "stale": False}
+    assert replay.upstream_calls == 0
+    # The validator is digested once from the body, stored with the entry and reused on hits.
+    entry = cache.get_entry("https://swapi.dev/api/people/1/")
+    assert entry.etag == digest(_response(200, {"name": "Luke", "url": entry.value["url"]}).content)
+    assert replay.validator() == client.validator()
+    assert AsyncSwapiClient(cache).validator() != client.validator()
 
+    bulk = AsyncSwapiClient(cache)
+    found = asyncio.run(bulk.cached_resources([("people", 1), ("people", 2)]))
+    assert found == {("people", 1): first}
+    assert bulk.cache_meta()["hit"] is True
 
-def test_swapi_client_404():
-    client = SwapiClient()
 
-    def fake_get(url, params=None):
-        return _response(404, {"detail": "Not found"})
+def test_swapi_client_500():
+    client = AsyncSwapiClient()
+
+    async def fake_get(url, params=None):
+        return _response(500, {"detail": "err"})
 
     client._client.get = fake_get  # type: ignore
 
     with pytest.raises(AppError) as exc:
-        client.get_resource("people", 999)
-    assert exc.value.status_code == 404
+        asyncio.run(client.get_resource("people", 2))
+    assert exc.value.status_code == 502
 
 
-def test_swapi_client_500():
-    client = SwapiClient()
+def test_swapi_client_get_by_url_and_search():
+    client = AsyncSwapiClient()
 
-    def fake_get(url, params=None):
-        return _response(500, {"detail": "err"})
+    async def fake_get(url, params=None):
+        if url.endswith("/people/10/"):
+            return _response(200, {"name": "Obi", "url": url})
+        return _response(200, {"count": 0, "results": [], "next": None})
 
     client._client.get = fake_get  # type: ignore
 
-    with pytest.raises(AppError) as exc:
-        client.get_resource("people", 2)
-    assert exc.value.status_code == 502
+    data = asyncio.run(client.get_by_url("https://swapi.dev/api/people/10/"))
+    assert data["name"] == "Obi"
+    payload = asyncio.run(client.search("people", "obi", 1))
+    assert payload["count"] == 0
+
 
+def test_async_swapi_client_cache_hit_and_404():
+    cache = TTLCache(ttl_seconds=60, max_entries=10)
+    client = AsyncSwapiClient(cache)
 
-def test_swapi_client_request_exception(monkeypatch):
-    client = SwapiClient()
+    async def fake_get(url, params=None):
+        if url.endswith("/people/999/"):
+            return _response(404, {"detail": "Not found"})
+        return _response(200, {"name": "Luke", "url": url})
 
-    def boom(*_args, **_kwargs):
+    client._client.get = fake_get  # type: ignore
+
+    async def _run():
+        first = await client.get_resource("people", 1)
+        second = await client.get_resource("people", 1)
+        with pytest.raises(AppError) as exc:
+            await client.get_resource("people", 999)
+        return first, second, exc.value
+
+    first, second, error = asyncio.run(_run())
+    assert first["name"] == "Luke"
+    assert second is first
+    assert client.cache_meta()["hit"] is False
+    assert error.status_code == 404
+
+
+def test_async_swapi_client_retries_with_async_backoff(monkeypatch):
+    client = AsyncSwapiClient()
+    attempts = []
+    sleeps = []
+
+    async def flaky_get(url, params=None):
+        attempts.append(url)
+        if len(attempts) == 1:
+            raise httpx.RequestError("fail")
+        return _response(200, {"count": 0, "results": [], "next": None})
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    client._client.get = flaky_get  # type: ignore
+    monkeypatch.setattr(swapi_client.asyncio, "sleep", fake_sleep)
+
+    payload = asyncio.run(client.search("people", "luke", 1))
+    assert payload["count"] == 0
+    assert len(attempts) == 2
+    assert len(sleeps) == 1
+
+
+def test_async_swapi_client_unavailable(monkeypatch):
+    client = AsyncSwapiClient()
+
+    async def boom(*_args, **_kwargs):
         raise httpx.RequestError("fail")
 
-    monkeypatch.setattr(client._client, "get", boom)
+    async def fake_sleep(_delay):
+        return None
+
+    client._client.get = boom  # type: ignore
+    monkeypatch.setattr(swapi_client.asyncio, "sleep", fake_sleep)
 
     with pytest.raises(AppError) as exc:
-        client.get_resource("people", 3)
+        asyncio.run(client.get_by_url("https://swapi.dev/api/people/3/"))
     assert exc.value.status_code == 502
 
 
-def test_swapi_client_get_by_url_and_search():
-    client = SwapiClient()
+def test_background_refresh_is_not_counted_against_the_request(monkeypatch):
+    import holonet.utils.cache as cache_mod
+    from holonet.utils.singleflight import AsyncSingleFlight
 
-    def fake_get(url, params=None):
-        if url.endswith("/people/10/"):
-            return _response(200, {"name": "Obi", "url": url})
-        return _response(200, {"count": 0, "results": [], "next": None})
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+    monkeypatch.setattr(swapi_client.time, "time", lambda: now)
 
-    client._client.get = fake_get  # type: ignore
+    cache = TTLCache(ttl_seconds=10, max_entries=10, stale_ttl_seconds=60)
+    flights = AsyncSingleFlight(timeout_seconds=5)
+    versions = iter(["v1", "v2"])
 
-    data = client.get_by_url("https://swapi.dev/api/people/10/")
-    assert data["name"] == "Obi"
-    payload = client.search("people", "obi", 1)
-    assert payload["count"] == 0
+    async def fake_get(url, params=None):
+        return _response(200, {"name": next(versions), "url": url})
+
+    client = AsyncSwapiClient(cache, http_client=SimpleNamespace(get=fake_get), flights=flights)
+
+    async def _run():
+        nonlocal now
+        await AsyncSwapiClient(cache, http_client=SimpleNamespace(get=fake_get)).get_resource(
+            "people", 1
+        )
+        now += 20.0
+        served = await client.get_resource("people", 1)
+        while flights._calls:
+            await asyncio.sleep(0)
+        return served
+
+    assert asyncio.run(_run())["name"] == "v1"
+
+    assert cache.get_entry("https://swapi.dev/api/people/1/").value["name"] == "v2"
+    assert client.cache_meta() == {"hit": True, "ttl": 180, "stale": True}
+    assert client.upstream_calls == 0
+
+
+def test_swapi_client_freshness_and_surrogate_keys(monkeypatch):
+    import holonet.utils.cache as cache_mod
+
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+    monkeypatch.setattr(swapi_client.time, "time", lambda: now)
+    monkeypatch.setattr(swapi_client.settings, "cache_ttl_seconds", 10)
+    monkeypatch.setattr(swapi_client.settings, "cache_stale_ttl_seconds", 60)
+
+    cache = TTLCache(ttl_seconds=10, max_entries=10, stale_ttl_seconds=60)
+
+    async def fake_get(url, params=None):
+        if params:
+            return _response(200, {"results": [{"url": "https://swapi.dev/api/people/2/"}]})
+        return _response(200, {"name": "Luke", "url": url})
+
+    client = AsyncSwapiClient(cache, http_client=SimpleNamespace(get=fake_get))
+    asyncio.run(client.get_resource("people", 1))
+    assert client.freshness() == (10, 60)
+
+    now += 4.0
+    asyncio.run(client.search("people", None, 1))
+    assert client.freshness() == (6, 60)
+    assert client.surrogate_keys() == ["people", "people:1", "people:2"]
+
+    now += 10.0
+    replay = AsyncSwapiClient(cache, http_client=SimpleNamespace(get=fake_get))
+    asyncio.run(replay.get_resource("people", 1))
+    assert replay.freshness() == (0, 56)
+
+
+def test_swapi_client_revalidates_stale_entry_conditionally(monkeypatch):
+    import holonet.utils.cache as cache_mod
+
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+    monkeypatch.setattr(swapi_client.time, "time", lambda: now)
+
+    cache = TTLCache(ttl_seconds=10, max_entries=10, stale_ttl_seconds=60)
+    sent = []
+
+    class NotModified:
+        status_code = 304
+
+        def json(self):
+            raise AssertionError("a 304 has no body to parse")
+
+    async def fake_get(url, params=None, headers=None):
+        sent.append(headers)
+        if headers:
+            return NotModified()
+        request = httpx.Request("GET", url)
+        return httpx.Response(
+            200, json={"name": "Luke", "url": url}, headers={"ETag": '"v1"'}, request=request
+        )
+
+    def client():
+        return AsyncSwapiClient(cache, http_client=SimpleNamespace(get=fake_get))
+
+    first = asyncio.run(client().get_resource("people", 1))
+    url = "https://swapi.dev/api/people/1/"
+    assert cache.get_entry(url).upstream == {"etag": '"v1"'}
+    etag = cache.get_entry(url).etag
+
+    now += 20.0
+    monkeypatch.setattr(cache, "set", lambda *args: pytest.fail("a 304 must not rewrite"))
+    # A leader that finds the entry stale revalidates it instead of downloading it again.
+    revalidating = client()
+    payload, validator = asyncio.run(revalidating._fetch(url, None, url))
+    assert payload is first
+    assert validator == etag
+    assert sent == [None, {"If-None-Match": '"v1"'}]
+    assert revalidating.upstream_calls == 1
+
+    refreshed = cache.get_entry(url)
+    assert refreshed.value is first
+    assert refreshed.is_stale(now) is False
+    assert refreshed.fresh_until == now + 10
+
+
+def test_async_swapi_client_refreshes_stale_entry_in_background(monkeypatch):
+    import holonet.utils.cache as cache_mod
+    from holonet.utils.singleflight import AsyncSingleFlight
+
+    now = 1000.0
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now)
+    monkeypatch.setattr(swapi_client.time, "time", lambda: now)
+
+    cache = TTLCache(ttl_seconds=10, max_entries=10, stale_ttl_seconds=60)
+    flights = AsyncSingleFlight(timeout_seconds=5)
+    calls = []
+
+    async def fake_get(url, params=None):
+        calls.append(url)
+        return _response(200, {"name": f"v{len(calls)}", "url": url})
+
+    async def request():
+        client = AsyncSwapiClient(cache, http_client=SimpleNamespace(get=fake_get), flights=flights)
+        return await client.get_resource("people", 1), client.cache_meta()
+
+    async def _run():
+        nonlocal now
+        await request()
+        now += 20.0
+        stale = await request()
+        again = await request()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        return stale, again, await request()
+
+    (_, stale_meta), (_, again_meta), (fresh, fresh_meta) = asyncio.run(_run())
+    assert stale_meta["stale"] is True
+    assert again_meta["stale"] is True
+    assert fresh["name"] == "v2"
+    assert fresh_meta == {"hit": True, "ttl": 180, "stale": False}
+    assert len(calls) == 2
@@ -0,0 +1,218 @@
+import asyncio
+import socket
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import holonet.clients.transport as transport_mod
+from holonet.clients.transport import (
+    CachingAsyncBackend,
+    CachingSyncBackend,
+    DNSCache,
+    SyncBridgeTransport,
+    build_async_http_client,
+    build_http_client,
+)
+
+
+def test_build_http_client_applies_pool_limits(monkeypatch):
+    monkeypatch.setattr(transport_mod.settings, "http_max_connections", 7)
+    monkeypatch.setattr(transport_mod.settings, "http_max_keepalive_connections", 3)
+    monkeypatch.setattr(transport_mod.settings, "http_keepalive_expiry_seconds", 12.0)
+
+    client = build_http_client()
+    pool = client._transport._pool
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+    assert pool._keepalive_expiry == 12.0
+    assert isinstance(pool._network_backend, CachingSyncBackend)
+    client.close()
+
+
+def test_build_http_client_without_dns_cache(monkeypatch):
+    monkeypatch.setattr(transport_mod.settings, "http_dns_cache_ttl_seconds", 0)
+    client = build_http_client()
+    assert not isinstance(client._transport._pool._network_backend, CachingSyncBackend)
+    client.close()
+
+
+def test_build_http_client_http2_requires_h2(monkeypatch):
+    import builtins
+
+    original_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name == "h2":
+            raise ImportError("no")
+        return original_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(transport_mod.settings, "http2_enabled", True)
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+
+    with pytest.raises(RuntimeError):
+        build_http_client()
+
+
+def test_dns_cache_resolves_once(monkeypatch):
+    calls = []
+
+    def fake_getaddrinfo(host, port, type=0):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port))]
+
+    monkeypatch.setattr(transport_mod.socket, "getaddrinfo", fake_getaddrinfo)
+
+    cache = DNSCache(ttl_seconds=60)
+    assert cache.resolve("swapi.dev", 443) == ["10.0.0.1"]
+    assert cache.resolve("swapi.dev", 443) == ["10.0.0.1"]
+    assert calls == ["swapi.dev"]
+
+
+def test_dns_cache_keeps_every_address_in_order(monkeypatch):
+    def fake_getaddrinfo(host, port, type=0):
+        return [
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("2001:db8::1", port, 0, 0)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port)),
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("2001:db8::1", port, 0, 0)),
+        ]
+
+    monkeypatch.setattr(transport_mod.socket, "getaddrinfo", fake_getaddrinfo)
+
+    assert DNSCache(ttl_seconds=60).resolve("swapi.dev", 443) == ["2001:db8::1", "10.0.0.1"]
+
+
+def test_caching_backend_falls_through_to_the_next_address(monkeypatch):
+    import httpcore
+
+    attempts = []
+
+    def fake_connect(self, host, port, timeout=None, local_address=None, socket_options=None):
+        attempts.append(host)
+        if host == "2001:db8::1":
+            raise httpcore.ConnectError("unreachable")
+        return host
+
+    monkeypatch.setattr(httpcore.SyncBackend, "connect_tcp", fake_connect)
+    cache = DNSCache(ttl_seconds=60)
+    monkeypatch.setattr(cache, "resolve", lambda host, port: ["2001:db8::1", "10.0.0.1"])
+
+    assert CachingSyncBackend(cache).connect_tcp("swapi.dev", 443) == "10.0.0.1"
+    assert attempts == ["2001:db8::1", "10.0.0.1"]
+
+    monkeypatch.setattr(cache, "resolve", lambda host, port: ["2001:db8::1"])
+    with pytest.raises(httpcore.ConnectError):
+        CachingSyncBackend(cache).connect_tcp("swapi.dev", 443)
+
+
+def test_build_http_client_keeps_default_backend_without_private_pool(monkeypatch):
+    class Transport(httpx.HTTPTransport):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            del self._pool
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(transport_mod.httpx, "HTTPTransport", Transport)
+
+    client = build_http_client()
+    assert not hasattr(client._transport, "_pool")
+    client.close()
+
+
+def test_dns_cache_falls_back_to_host_on_error(monkeypatch):
+    def boom(*_args, **_kwargs):
+        raise OSError("dns down")
+
+    monkeypatch.setattr(transport_mod.socket, "getaddrinfo", boom)
+
+    assert DNSCache(ttl_seconds=60).resolve("swapi.dev", 443) == ["swapi.dev"]
+
+
+def test_app_shares_http_clients_and_closes_on_shutdown(monkeypatch):
+    import holonet.main as main_mod
+    from holonet.clients import swapi_client
+
+    app = main_mod.create_app()
+    seen = []
+    original_init = swapi_client.AsyncSwapiClient.__init__
+
+    def spy_init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        seen.append(self._client)
+
+    async def fake_get(self, resource, resource_id):
+        return {"name": "Luke", "url": "https://swapi.dev/api/people/1/"}
+
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "__init__", spy_init)
+    monkeypatch.setattr(swapi_client.AsyncSwapiClient, "get_resource", fake_get)
+
+    bridged = app.state.async_http_client
+    assert isinstance(bridged._transport, SyncBridgeTransport)
+
+    with TestClient(app) as client:
+        client.get("/v1/people/1")
+        client.get("/v1/people/1")
+        native = app.state.async_http_client
+        sync_client = app.state.http_client
+        assert not isinstance(native._transport, SyncBridgeTransport)
+        assert seen == [native, native]
+    assert native.is_closed
+    assert sync_client.is_closed
+    assert isinstance(app.state.async_http_client._transport, SyncBridgeTransport)
+
+    with TestClient(app):
+        assert not app.state.http_client.is_closed
+
+
+def test_sync_bridge_transport_relays_raw_response():
+    import gzip
+
+    body = gzip.compress(b'{"name": "Luke"}')
+
+    def handler(request):
+        assert request.headers["x-test"] == "1"
+        return httpx.Response(200, headers={"content-encoding": "gzip"}, content=body)
+
+    sync_client = httpx.Client(transport=httpx.MockTransport(handler))
+    async_client = httpx.AsyncClient(transport=SyncBridgeTransport(sync_client))
+
+    async def _run():
+        response = await async_client.get(
+            "https://swapi.dev/api/people/1/", headers={"x-test": "1"}
+        )
+        await async_client.aclose()
+        return response
+
+    response = asyncio.run(_run())
+    assert response.status_code == 200
+    assert response.json() == {"name": "Luke"}
+
+
+def test_build_async_http_client_applies_pool_limits(monkeypatch):
+    monkeypatch.setattr(transport_mod.settings, "http_max_connections", 5)
+
+    client = build_async_http_client()
+    pool = client._transport._pool
+    assert pool._max_connections == 5
+    assert isinstance(pool._network_backend, CachingAsyncBackend)
+    asyncio.run(client.aclose())
+
+
+def test_dns_cache_resolve_async(monkeypatch):
+    calls = []
+
+    async def fake_getaddrinfo(host, port, type=0):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.2", port))]
+
+    monkeypatch.setattr(transport_mod.anyio, "getaddrinfo", fake_getaddrinfo)
+
+    cache = DNSCache(ttl_seconds=60)
+
+    async def _run():
+        return [await cache.resolve_async("swapi.dev", 443) for _ in range(2)]
+
+    assert asyncio.run(_run()) == [["10.0.0.2"], ["10.0.0.2"]]
+    assert calls == ["swapi.dev"]